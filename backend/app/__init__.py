@@ -0,0 +1,6 @@
+# backend/app/__init__.py
+
+from dotenv import load_dotenv
+
+# Load .env once, before any app module reads os.getenv at import time
+load_dotenv()
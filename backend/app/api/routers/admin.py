@@ -1,10 +1,25 @@
 # backend/app/api/routers/admin.py
 
-from fastapi import APIRouter, HTTPException, status, Body, Depends, Request
+import hmac
+
+from fastapi import APIRouter, HTTPException, status, Body, Depends, Header, Request
+from fastapi.responses import PlainTextResponse
 from app.models.webhook_security import WebhookSecurity
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 from app.utils.user_utils import get_current_user_id
+from app.services.ai_telemetry import ai_telemetry
+from app.utils.db_monitoring import SlowQuery, pool_stats, slow_query_listener
+from app.utils.loop_monitor import LoopStall, loop_monitor
+from app.utils.memory_diagnostics import (
+    AllocationDiff,
+    ObjectCount,
+    SnapshotInfo,
+    TracingStatus,
+    memory_diagnostics,
+)
+from app.utils.profiler import ProfileSummary, profile_store
+from app.middleware import PROFILER_TOKEN
 
 router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
 
@@ -18,6 +33,28 @@ async def admin_required(request: Request):
     return True
 
 
+def diagnostics_token_required(x_admin_token: str = Header("")):
+    """
+    Process-wide diagnostics (tracemalloc, heap walks, profiles and stall
+    stacks, slow queries, per-user AI usage) need the PROFILER_TOKEN admin
+    token in X-Admin-Token, since admin_required does not check anything
+    yet; without a token configured they are disabled.
+    """
+    if not PROFILER_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Diagnostics are disabled; set PROFILER_TOKEN.",
+        )
+    if not hmac.compare_digest(x_admin_token.encode(), PROFILER_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token."
+        )
+
+
+# Diagnostics endpoints: admin token required on top of admin_required
+DIAGNOSTICS_DEPENDENCIES = [Depends(diagnostics_token_required)]
+
+
 class WebhookSecurityUpdate(BaseModel):
     api_key: Optional[str] = None
     allowed_ips: Optional[List[str]] = None
@@ -60,3 +97,158 @@ async def update_webhook_security_config(
         setattr(config, key, value)
     await config.save()
     return config
+
+
+@router.get("/db/pool")
+async def get_db_pool_stats(request: Request, admin: bool = Depends(admin_required)):
+    """Connection pool configuration, occupancy and checkout-wait latency."""
+    client = getattr(request.app.state, "motor_client", None)
+    return pool_stats(client)
+
+
+@router.get(
+    "/db/slow-queries",
+    response_model=List[SlowQuery],
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+async def get_slow_queries(admin: bool = Depends(admin_required)):
+    """
+    Recent MongoDB commands at or above SLOW_QUERY_THRESHOLD_MS, newest
+    first, with query shapes (values redacted) and sampled plan checks.
+    """
+    return slow_query_listener.entries()
+
+
+@router.get(
+    "/loop/stalls",
+    response_model=List[LoopStall],
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+async def get_loop_stalls(admin: bool = Depends(admin_required)):
+    """
+    Recent event loop stalls longer than LOOP_LAG_THRESHOLD_MS, newest
+    first, each with the loop thread's stack at the time it was blocked.
+    """
+    return loop_monitor.stalls()
+
+
+@router.get("/ai/usage", dependencies=DIAGNOSTICS_DEPENDENCIES)
+async def get_ai_usage(
+    user_id: Optional[str] = None,
+    limit: int = 20,
+    admin: bool = Depends(admin_required),
+):
+    """
+    AI calls, latency, tokens, errors, fallbacks and cache hits per feature,
+    globally and for one user (user_id) or the heaviest token users.
+    """
+    return ai_telemetry.snapshot(user_id=user_id, limit=limit)
+
+
+@router.get(
+    "/memory/tracemalloc",
+    response_model=TracingStatus,
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+async def get_tracemalloc_status(admin: bool = Depends(admin_required)):
+    return memory_diagnostics.status()
+
+
+@router.post(
+    "/memory/tracemalloc/start",
+    response_model=TracingStatus,
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+async def start_tracemalloc(frames: int = 1, admin: bool = Depends(admin_required)):
+    """Start tracing allocations, keeping frames stack frames per allocation."""
+    return memory_diagnostics.start(frames=max(1, frames))
+
+
+@router.post(
+    "/memory/tracemalloc/stop",
+    response_model=TracingStatus,
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+async def stop_tracemalloc(admin: bool = Depends(admin_required)):
+    """Stop tracing and drop all snapshots."""
+    return memory_diagnostics.stop()
+
+
+@router.post(
+    "/memory/snapshots",
+    response_model=SnapshotInfo,
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+def take_memory_snapshot(admin: bool = Depends(admin_required)):
+    try:
+        return memory_diagnostics.take_snapshot()
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get(
+    "/memory/snapshots",
+    response_model=List[SnapshotInfo],
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+async def list_memory_snapshots(admin: bool = Depends(admin_required)):
+    return memory_diagnostics.snapshots()
+
+
+@router.get(
+    "/memory/diff",
+    response_model=List[AllocationDiff],
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+def get_memory_diff(
+    from_id: str,
+    to_id: str,
+    group_by: Literal["lineno", "filename"] = "lineno",
+    limit: int = 20,
+    admin: bool = Depends(admin_required),
+):
+    """Top allocation growth by file and line between two snapshots."""
+    diff = memory_diagnostics.diff(from_id, to_id, group_by=group_by, limit=limit)
+    if diff is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found."
+        )
+    return diff
+
+
+@router.get(
+    "/memory/objects",
+    response_model=List[ObjectCount],
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+def get_object_counts(limit: int = 50, admin: bool = Depends(admin_required)):
+    """Live instances of the app's own classes, most numerous first."""
+    return memory_diagnostics.object_counts(limit=limit)
+
+
+@router.get(
+    "/profiles",
+    response_model=List[ProfileSummary],
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+async def list_request_profiles(admin: bool = Depends(admin_required)):
+    """Recently captured request profiles, newest first."""
+    return profile_store.list()
+
+
+@router.get(
+    "/profiles/{request_id}",
+    response_class=PlainTextResponse,
+    dependencies=DIAGNOSTICS_DEPENDENCIES,
+)
+async def get_request_profile(request_id: str, admin: bool = Depends(admin_required)):
+    """
+    One request's profile as collapsed stacks ("frame;frame;... count"),
+    ready for flamegraph.pl or speedscope.
+    """
+    profile = profile_store.get(request_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found."
+        )
+    return profile.collapsed
@@ -1,26 +1,49 @@
 # backend/app/api/routers/email.py
 import app.services.context_classifier as context_classifier
-from app.services.email_task_mapper import map_email_to_task
+from app.services.email_task_mapper import map_email_to_task, stage_seconds
 import logging
-from mailslurp_client import Configuration, InboxControllerApi
 
-from fastapi import APIRouter, Body, Request, HTTPException, status, Depends, Query
+from fastapi import (
+    APIRouter,
+    Body,
+    Request,
+    Response,
+    HTTPException,
+    status,
+    Depends,
+    Query,
+)
 from typing import List, Optional
+from pydantic import BaseModel, Field
 from app.models.email_message import EmailMessage
-from app.models.assistant_task import AssistantTask
+from app.models.list_items import SpamEmailListItem
 
 # from app.services.context_classifier import classify_context
 from beanie import PydanticObjectId
+from bson.errors import InvalidId
 from app.services.webhook_security import validate_api_key, is_ip_allowed
 from app.services.duplicate_detection import is_duplicate_email
+from app.services.spam_quarantine import (
+    clear_spam_flags,
+    get_spam_count,
+    spam_list_filter,
+    update_spam_flags,
+)
+from app.services.spam_reprocessing import (
+    ReprocessJob,
+    reprocess_email,
+    spam_reprocessor,
+)
 from app.utils.logging import log_security_event, track_and_alert_failed_attempt
-from app.middleware import limiter, RATE_LIMIT
+from app.middleware import limiter, mark_api_key_validated, WEBHOOK_RATE_LIMITS
 from app.config import get_settings
 from app.utils.user_utils import get_current_user_id
-from app.utils.email_utils import (
-    parse_forwarded_metadata,
-    parse_forwarded_body,
-)
+from app.utils.consistency import INTERACTIVE_READ, find_with_profile
+from app.utils.metrics import metrics
+from app.services.task_events import publish_task_event
+from app.utils.email_features import build_email_features, content_signature
+from app.utils.forwarded import parse_forwarded_chain
+from app.utils.html_text import message_text
 from app.utils.email_retrieval_utils import (
     get_emails_from_inbox,
     get_emails_from_email_address,
@@ -30,9 +53,38 @@ from httpx import AsyncClient
 
 router = APIRouter(prefix="/api/v1/email", tags=["email"])
 
+emails_duplicate = metrics.counter(
+    "emails_duplicate_total",
+    "Webhook emails rejected as duplicates (409)",
+)
+
+# Spam quarantine page sizes
+SPAM_PAGE_SIZE = 50
+SPAM_PAGE_SIZE_MAX = 200
+
+# Upper bound on emails rescued by one bulk "not spam" request
+NOT_SPAM_BULK_LIMIT = 500
+
 logger = logging.getLogger(__name__)
 
 
+class NotSpamBulkRequest(BaseModel):
+    email_ids: List[str] = Field(
+        ..., min_length=1, description="Spam emails to move back to the inbox"
+    )
+
+
+class NotSpamBulkError(BaseModel):
+    email_id: str
+    error: str
+
+
+class NotSpamBulkResult(BaseModel):
+    updated: int
+    job_id: Optional[str] = None
+    errors: List[NotSpamBulkError] = Field(default_factory=list)
+
+
 @router.post("/")
 async def create_email_task(
     request: Request,
@@ -47,20 +99,26 @@ async def create_email_task(
 
     # Create and save the email, then map to a task
     email = EmailMessage(subject=subject, sender=sender, body=body, user_id=user_id)
-    await email.insert()
+    with stage_seconds.time(stage="email_insert"):
+        await email.insert()
     logger.debug("✅ Email created and saved")
 
     # Use centralized mapping logic (includes defaults, classification, summary)
     task = await map_email_to_task(email, actions)
     logger.debug("🔄 Mapping email to task")
-    await task.insert()
+    if task is None:
+        # Spam: quarantined by the mapper, no task created
+        return {"email_id": str(email.id), "task_id": None}
+    with stage_seconds.time(stage="task_insert"):
+        await task.insert()
+    publish_task_event("created", task)
     logger.debug("✅ Task created and saved")
     return {"email_id": str(email.id), "task_id": str(task.id)}
 
 
 ## connect MailSlurp webhook (NEW_MAIL) to this endpoint
 @router.post("/incoming")
-@limiter.limit(RATE_LIMIT)
+@limiter.limit(WEBHOOK_RATE_LIMITS)
 async def incoming_email_webhook(
     request: Request,
     sender: str = Body(..., embed=True),
@@ -78,7 +136,6 @@ async def incoming_email_webhook(
         status="attempt",
         details="Incoming webhook access attempt",
     )
-    print(f"API Key: {api_key}, Client IP: {client_ip}")
 
     if not api_key or not client_ip:
         log_security_event(
@@ -88,13 +145,16 @@ async def incoming_email_webhook(
             details="Missing API key or client IP",
         )
         if client_ip:
-            track_and_alert_failed_attempt(client_ip, "missing_api_key_or_ip")
+            await track_and_alert_failed_attempt(client_ip, "missing_api_key_or_ip")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Missing API key or client IP.",
         )
 
-    if not await validate_api_key(api_key):
+    api_key_valid = await validate_api_key(api_key)
+    # Refresh the key's rate-limit bucket choice for every worker
+    mark_api_key_validated(api_key, api_key_valid)
+    if not api_key_valid:
         log_security_event(
             event="api_key_validation",
             ip_address=client_ip,
@@ -102,7 +162,7 @@ async def incoming_email_webhook(
             details="Invalid API key",
         )
         if client_ip:
-            track_and_alert_failed_attempt(client_ip, "invalid_api_key")
+            await track_and_alert_failed_attempt(client_ip, "invalid_api_key")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key."
         )
@@ -121,7 +181,7 @@ async def incoming_email_webhook(
             details="IP address not allowed",
         )
         if client_ip:
-            track_and_alert_failed_attempt(client_ip, "ip_not_allowed")
+            await track_and_alert_failed_attempt(client_ip, "ip_not_allowed")
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="IP address not allowed."
         )
@@ -136,57 +196,170 @@ async def incoming_email_webhook(
     # Get the current user ID - for webhooks, can be passed as a query param
     user_id = await get_current_user_id(request)
 
-    # Create the email object and check for duplicates
+    # Create the email object
     email = EmailMessage(subject=subject, sender=sender, body=body, user_id=user_id)
-    # Skip or flag duplicates
-    if await is_duplicate_email(email):
-        logger.info(f"Duplicate email detected: message_id={email.message_id}")
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT, detail="Duplicate email."
-        )
 
-    # Check to see if the email was forwarded
-    # if so, then parse the email with the appropriate utilities
-    if "Fwd:" in subject or "Fw:" in subject:
+    # Parse the forward chain once; the features below carry it on
+    with stage_seconds.time(stage="forward_parsing"):
+        forwarded = parse_forwarded_chain(email.body)
+
+    # Duplicates are matched on the email as received, so the signature is
+    # taken before a forward is unwrapped below
+    received_hash = content_signature(email.sender, email.subject, email.body)
+
+    # If the email was forwarded, save the original email and not the
+    # forwarded one
+    if ("Fwd:" in subject or "Fw:" in subject) and forwarded.is_forward:
         logger.debug("Email is a forwarded email")
-        # Check if the email is a forwarded email
-        # Parse the forwarded metadata and body content
-        # to save the original email and not the forwarded one
-        # Parse forwarded metadata and email body content so we save the original email and not the forwarded one
+        email.sender = forwarded.sender or email.sender
+        email.subject = forwarded.subject or email.subject
+        email.body = forwarded.content
 
-        # Parse forwarded metadata and email body content so we save the original email and not the forwarded one
-        forwarded_sender, forwarded_subject = parse_forwarded_metadata(email.body)
-        email.sender = forwarded_sender
-        email.subject = forwarded_subject
+    # Everything the later stages derive from the text, computed once from
+    # the email as it is stored
+    with stage_seconds.time(stage="features"):
+        features = build_email_features(email, forwarded, received_hash)
+    email.normalized_body = features.normalized_body
+    email.normalized_length = features.normalized_length
 
-        # Parse forwarded email body to remove unwanted content
-        forwarded_body = parse_forwarded_body(email.body)
-        email.body = forwarded_body
+    # Skip or flag duplicates
+    with stage_seconds.time(stage="duplicate_check"):
+        is_duplicate = await is_duplicate_email(email, features)
+    if is_duplicate:
+        emails_duplicate.inc()
+        logger.info("Duplicate email detected: message_id=%s", email.message_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Duplicate email."
+        )
 
     # Save unique email
-    await email.insert()
+    with stage_seconds.time(stage="email_insert"):
+        await email.insert()
     logger.debug("✅ Webhook email created and saved")
 
     # Use centralized mapping logic (includes defaults, classification, summary)
-    task = await map_email_to_task(email, actions)
+    task = await map_email_to_task(email, actions, features=features)
     logger.debug("🔄 Mapping webhook email to task")
-    await task.insert()
+    if task is None:
+        # Spam: quarantined by the mapper, no task created
+        return {"email_id": str(email.id), "task_id": None}
+    with stage_seconds.time(stage="task_insert"):
+        await task.insert()
+    publish_task_event("created", task)
     logger.debug("✅ Webhook task created and saved")
     return {"email_id": str(email.id), "task_id": str(task.id)}
 
 
-@router.get("/spam")
-async def get_spam_emails(request: Request):
-    """Fetch all emails flagged as spam."""
+@router.get("/spam", response_model=List[SpamEmailListItem])
+async def get_spam_emails(
+    request: Request,
+    response: Response,
+    limit: int = Query(SPAM_PAGE_SIZE, ge=1, le=SPAM_PAGE_SIZE_MAX),
+    before: Optional[str] = Query(
+        None, description="Cursor from X-Next-Cursor: return emails older than this id"
+    ),
+):
+    """
+    Fetch a page of emails flagged as spam, newest first.
+    When more emails remain, the X-Next-Cursor header holds the cursor
+    for the next page.
+    """
     user_id = await get_current_user_id(request)
 
-    spam_emails = await EmailMessage.find(
-        {"$and": [{"is_spam": True}, {"is_archived": False}, {"user_id": user_id}]}
-    ).to_list()
+    query = spam_list_filter(user_id)
+    if before:
+        try:
+            query["_id"] = {"$lt": PydanticObjectId(before)}
+        except (InvalidId, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    spam_emails = await find_with_profile(
+        EmailMessage.find(query)
+        .sort("-_id")
+        .limit(limit + 1)
+        .project(SpamEmailListItem),
+        INTERACTIVE_READ,
+    )
+
+    if len(spam_emails) > limit:
+        spam_emails = spam_emails[:limit]
+        response.headers["X-Next-Cursor"] = spam_emails[-1].id
 
     return spam_emails
 
 
+@router.get("/spam/count")
+async def get_spam_email_count(request: Request):
+    """Number of spam emails awaiting review, for the UI badge."""
+    user_id = await get_current_user_id(request)
+    return {"count": await get_spam_count(user_id)}
+
+
+@router.patch("/not-spam", response_model=NotSpamBulkResult, status_code=202)
+async def bulk_mark_emails_as_not_spam(payload: NotSpamBulkRequest, request: Request):
+    """
+    Mark many spam emails as not spam.
+    Flags are flipped with a single update_many; full AI processing runs in
+    the background with bounded concurrency. Poll
+    GET /email/reprocess/{job_id} for progress.
+    """
+    user_id = await get_current_user_id(request)
+    if len(payload.email_ids) > NOT_SPAM_BULK_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many email ids. Maximum is {NOT_SPAM_BULK_LIMIT}",
+        )
+
+    errors: List[NotSpamBulkError] = []
+    requested = {}
+    for email_id in payload.email_ids:
+        try:
+            requested[PydanticObjectId(email_id)] = email_id
+        except (InvalidId, TypeError):
+            errors.append(NotSpamBulkError(email_id=email_id, error="Invalid email id"))
+
+    # Resolve the quarantined ids first so the rest can be reported per id
+    # and only rescued emails are queued for reprocessing.
+    quarantined = [
+        doc["_id"]
+        for doc in await EmailMessage.get_pymongo_collection()
+        .find(
+            {"_id": {"$in": list(requested)}, **spam_list_filter(user_id)},
+            {"_id": 1},
+        )
+        .to_list(None)
+    ]
+    found = set(quarantined)
+    errors.extend(
+        NotSpamBulkError(email_id=email_id, error="Email not found in spam")
+        for oid, email_id in requested.items()
+        if oid not in found
+    )
+    if not quarantined:
+        return NotSpamBulkResult(updated=0, errors=errors)
+
+    updated = await clear_spam_flags(user_id, quarantined)
+    job = await spam_reprocessor.start(user_id, quarantined)
+    logger.info(
+        "✅ Marked %d emails as not spam; reprocessing in job %s", updated, job.id
+    )
+    return NotSpamBulkResult(updated=updated, job_id=job.id, errors=errors)
+
+
+@router.get("/reprocess/{job_id}", response_model=ReprocessJob)
+async def get_reprocess_status(job_id: str, request: Request):
+    """
+    Progress of a bulk "not spam" reprocessing job. Jobs run on the worker
+    that accepted them; their progress is stored in MongoDB, so any worker
+    can answer this poll.
+    """
+    user_id = await get_current_user_id(request)
+    job = await spam_reprocessor.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Reprocess job not found")
+    return job
+
+
 @router.patch("/{email_id}/not-spam")
 async def mark_email_as_not_spam(email_id: str, request: Request):
     """Mark a specific email as not spam and ensure it gets full AI processing."""
@@ -198,46 +371,23 @@ async def mark_email_as_not_spam(email_id: str, request: Request):
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
 
-    # Update email status
-    email.is_spam = False
-    await email.save()
-
-    # Check for existing task
-    existing_task = await AssistantTask.find_one({"email_id": str(email.id)})
+    # Update email status and the user's spam counter
+    await update_spam_flags(email, is_spam=False)
 
     # Process the email with AI, ensuring full processing
-    new_task = await map_email_to_task(
-        email, skipSpamCheck=True, forceFullProcessing=True
-    )
+    task, created = await reprocess_email(email)
 
-    if not new_task:
+    if not task:
         return {
             "message": "Email marked as not spam, but task creation failed",
             "email_id": email_id,
         }
 
-    if existing_task:
-        # Update existing task with new AI-processed data
-        existing_task.subject = new_task.subject  # Use new AI-summarized subject
-        existing_task.context = new_task.context  # Update context classification
-        existing_task.description = new_task.description  # Update with AI summary
-        existing_task.priority = new_task.priority  # Recalculate priority
-        existing_task.actions = new_task.actions  # Update suggested actions
-
-        await existing_task.save()
-        return {
-            "message": "Email marked as not spam and task updated with AI processing",
-            "email_id": email_id,
-            "task_id": str(existing_task.id),
-        }
+    if created:
+        message = "Email marked as not spam and task created"
     else:
-        # No existing task, just insert the new one
-        await new_task.insert()
-        return {
-            "message": "Email marked as not spam and task created",
-            "email_id": email_id,
-            "task_id": str(new_task.id),
-        }
+        message = "Email marked as not spam and task updated with AI processing"
+    return {"message": message, "email_id": email_id, "task_id": str(task.id)}
 
 
 @router.patch("/{email_id}/archive")
@@ -250,8 +400,7 @@ async def archive_email(email_id: str, request: Request):
     )
     if not email:
         raise HTTPException(status_code=404, detail="Email not found")
-    email.is_archived = True
-    await email.save()
+    await update_spam_flags(email, is_archived=True)
     return {"message": "Email archived", "email_id": email_id}
 
 
@@ -267,7 +416,7 @@ async def get_new_email(request: Request):
     try:
         emails = await get_emails_from_inbox(emailId)
     except Exception as e:
-        logger.error(f"Error fetching emails: {e}")
+        logger.error("Error fetching emails: %s", e)
         raise HTTPException(status_code=500, detail="Error fetching emails")
 
     return emails
@@ -296,8 +445,10 @@ async def get_email_by_address(address: str, request: Request):
 
     api_key = get_settings().emergency_webhook_api_key
 
-    #   request.app.state.limited.enabled = False
-    print("Checking emails... with api_key: " + api_key)
+    # Only this request's direct webhook calls skip rate limiting; the
+    # loopback POST below is exempt via RATE_LIMIT_TRUSTED_NETWORKS
+    request.state.rate_limit_exempt = True
+    logger.debug("Checking emails for %s", address)
 
     try:
         # TO DO: Use native MailSlurp API to get emails
@@ -311,37 +462,18 @@ async def get_email_by_address(address: str, request: Request):
             for uid in uids:
                 raw = client.fetch(uid, ["RFC822"])[uid][b"RFC822"]
                 msg = message_from_bytes(raw)
-                print("Subject: " + msg.get("Subject"))
-                print("From: " + msg.get("From"))
-                print("To: " + msg.get("To"))
+                logger.debug(
+                    "IMAP message: subject=%s from=%s to=%s",
+                    msg.get("Subject"),
+                    msg.get("From"),
+                    msg.get("To"),
+                )
                 # call the /incoming API endpoint to process the email
                 # override the rate limit for this endpoint
 
-                # 1. Pick out the plain‑text part:
-                body = None
-                if msg.is_multipart():
-                    for part in msg.walk():
-                        # skip attachments
-                        content_dispo = part.get("Content-Disposition", "")
-                        if (
-                            part.get_content_type() == "text/plain"
-                            and "attachment" not in content_dispo
-                        ):
-                            payload = part.get_payload(decode=True)  # bytes
-                            charset = part.get_content_charset() or "utf-8"
-                            body = payload.decode(charset, errors="replace")
-                            break
-                else:
-                    # not multipart — the payload *is* the body
-                    payload = msg.get_payload(decode=True)
-                    charset = msg.get_content_charset() or "utf-8"
-                    body = payload.decode(charset, errors="replace")
-
-                if body is None:
-                    # fallback if you really need something
-                    body = msg.get_payload()  # might be a str or list
-
-                print("Body: " + body)
+                # Plain text part, else the HTML part as text
+                body = message_text(msg)
+                logger.debug("IMAP message body: %s chars", len(body))
 
                 # Now pass `body` safely to your webhook:
                 async with AsyncClient() as api_client:
@@ -358,7 +490,9 @@ async def get_email_by_address(address: str, request: Request):
                         },
                     )
                     if response.status_code != 200:
-                        logger.error(f"Error sending email to webhook: {response.text}")
+                        logger.error(
+                            "Error sending email to webhook: %s", response.text
+                        )
 
                 await incoming_email_webhook(
                     request=request,
@@ -373,11 +507,10 @@ async def get_email_by_address(address: str, request: Request):
 
         return {"message": "Success"}
     except Exception as e:
-        logger.error(f"Error fetching email: {e}")
+        logger.error("Error fetching email: %s", e)
         raise HTTPException(status_code=500, detail="Error fetching email")
     finally:
-        #        request.app.state.limited.enabled = True
-        print("Done")
+        logger.debug("Done checking emails for %s", address)
 
 
 # ===================END TEMPORARY IMAP FUNCTIONALITY====================
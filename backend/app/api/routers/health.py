@@ -0,0 +1,30 @@
+# backend/app/api/routers/health.py
+
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.services.health import health_monitor
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/healthz")
+async def liveness():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readiness():
+    """
+    Readiness from the cached dependency report (refreshed in the
+    background): 503 until the first probe, while MongoDB is unreachable,
+    or if the report has gone stale.
+    """
+    ready, report = health_monitor.readiness()
+    return JSONResponse(
+        report,
+        status_code=(
+            status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+    )
@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field, ValidationError
 from beanie import PydanticObjectId
 from beanie.operators import Eq
 from app.utils.user_utils import get_current_user_id
+from app.services.user_settings_cache import user_settings_cache
 
 router = APIRouter(prefix="/api/v1/settings", tags=["settings"])
 
@@ -26,6 +27,7 @@ async def get_email_settings(request: Request):
         # Sensible defaults for first-time users
         settings = UserSettings(user_id=user_id)
         await settings.insert()
+    user_settings_cache.set(settings)
     return settings
 
 
@@ -48,6 +50,8 @@ async def update_email_settings(
         for key, value in update_data.items():
             setattr(settings, key, value)
         await settings.save()
+        # Write through so the next ingestion uses the new settings
+        user_settings_cache.set(settings)
         return settings
     except ValidationError as ve:
         raise HTTPException(status_code=422, detail=f"Invalid payload: {ve.errors()}")
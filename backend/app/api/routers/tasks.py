@@ -1,19 +1,40 @@
 # backend/app/api/routers/tasks.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from app.models.assistant_task import AssistantTask
+from app.models.email_message import EmailMessage
+from app.models.list_items import TaskListItem
 from beanie import PydanticObjectId
 from beanie.operators import Eq
-from pydantic import BaseModel, Field
+from bson.errors import InvalidId
+from pydantic import BaseModel, Field, model_validator
 import app.services.context_classifier as context_classifier
 import logging
 from app.utils.user_utils import get_current_user_id
+from app.services.task_events import (
+    publish_task_event,
+    publish_task_events,
+    task_event_broker,
+)
+from app.config import get_settings
+from app.utils.consistency import (
+    CRITICAL_WRITE,
+    INTERACTIVE_READ,
+    find_with_profile,
+    profiled_collection,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/tasks", tags=["tasks"])
 
+VALID_TASK_STATUSES = ["pending", "in_progress", "done", "archived"]
+
+# Upper bound on tasks touched by one bulk request
+BULK_UPDATE_LIMIT = 1000
+
 
 class TaskUpdate(BaseModel):
     status: str = Field(
@@ -26,7 +47,47 @@ class TaskUpdate(BaseModel):
     )
 
 
-@router.get("/", response_model=List[AssistantTask])
+class TaskBulkFilter(BaseModel):
+    status: Optional[str] = Field(None, description="Only tasks with this status")
+    context: Optional[str] = Field(None, description="Only tasks with this context")
+
+
+class TaskBulkUpdate(BaseModel):
+    task_ids: Optional[List[str]] = Field(
+        None, description="Tasks to update (mutually exclusive with filter)"
+    )
+    filter: Optional[TaskBulkFilter] = Field(
+        None, description="Select tasks to update by field values"
+    )
+    update: TaskUpdate
+
+    @model_validator(mode="after")
+    def require_one_selector(self) -> "TaskBulkUpdate":
+        if (self.task_ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of task_ids or filter")
+        return self
+
+
+class TaskBulkError(BaseModel):
+    task_id: str
+    error: str
+
+
+class TaskBulkResult(BaseModel):
+    matched: int
+    modified: int
+    truncated: bool = Field(
+        False,
+        description=(
+            f"True when the filter matched more than {BULK_UPDATE_LIMIT} tasks "
+            "and only the first ones were updated; repeat the request to "
+            "continue"
+        ),
+    )
+    errors: List[TaskBulkError] = Field(default_factory=list)
+
+
+@router.get("/", response_model=List[TaskListItem])
 async def get_tasks(
     request: Request, status: str = "active", spam: Optional[bool] = Query(None)
 ):
@@ -49,28 +110,149 @@ async def get_tasks(
     if spam is not None:
         filters.append(Eq("email.is_spam", spam))
 
-    # filters.append(AssistantTask.user_id == user_id)
-
-    query = AssistantTask.find(*filters, fetch_links=["email"])
+    # Single aggregation: $lookup the email, then project only list fields
+    query = AssistantTask.find(*filters, fetch_links=True).project(TaskListItem)
 
-    tasks = await query.to_list()
+    tasks = await find_with_profile(query, INTERACTIVE_READ)
 
     for t in tasks:
-        await t.fetch_all_links()
-        await t.fetch_link(AssistantTask.email)
-
         if not t.context:
+            # Legacy tasks without a context: load the full email only for these
+            email = await EmailMessage.get(t.email_id) if t.email_id else None
             t.context = await context_classifier.classify_context(
-                t.subject or t.email.subject, t.email.body
+                t.subject or (email.subject if email else ""),
+                email.body if email else "",
             )
 
     return tasks
 
 
+@router.get("/stream")
+async def stream_tasks(
+    request: Request,
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    since: Optional[int] = Query(
+        None, description="Resume after this event id (for clients without headers)"
+    ),
+):
+    """
+    Server-sent event stream of task created/updated/archived events for the
+    current user. Reconnecting clients resume from the Last-Event-ID header.
+    """
+    user_id = await get_current_user_id(request)
+    resume_from = last_event_id if last_event_id is not None else since
+    logger.debug("📡 Opening task stream for %s from event %s", user_id, resume_from)
+
+    return StreamingResponse(
+        task_event_broker.stream(
+            user_id,
+            last_event_id=resume_from,
+            heartbeat_seconds=float(get_settings().task_stream_heartbeat_seconds),
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def bulk_update_tasks(payload: TaskBulkUpdate, request: Request):
+    """
+    Update many of the current user's tasks with a single update_many.
+    Tasks are selected by id list or by filter; ids that are malformed or
+    not owned by the user are reported in errors. A filter updates at most
+    BULK_UPDATE_LIMIT tasks per request and sets truncated when more
+    matched; a filter on status then continues with the rest when repeated.
+    """
+    update = payload.update
+    if update.status not in VALID_TASK_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid status. Must be one of: {', '.join(VALID_TASK_STATUSES)}",
+        )
+
+    user_id = await get_current_user_id(request)
+    errors: List[TaskBulkError] = []
+
+    query = {"user_id": user_id}
+    if payload.task_ids is not None:
+        if len(payload.task_ids) > BULK_UPDATE_LIMIT:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many task ids. Maximum is {BULK_UPDATE_LIMIT}",
+            )
+        requested = {}
+        for task_id in payload.task_ids:
+            try:
+                requested[PydanticObjectId(task_id)] = task_id
+            except (InvalidId, TypeError):
+                errors.append(TaskBulkError(task_id=task_id, error="Invalid task id"))
+        query["_id"] = {"$in": list(requested)}
+    else:
+        query.update(payload.filter.model_dump(exclude_none=True))
+
+    # Resolve the matching ids first so missing ones can be reported per id
+    # and change events can be published for exactly the updated tasks.
+    tasks_collection = profiled_collection(AssistantTask, CRITICAL_WRITE)
+    # One id past the limit tells whether the filter matched more
+    matched_ids = [
+        doc["_id"]
+        for doc in await tasks_collection.find(query, {"_id": 1})
+        .limit(BULK_UPDATE_LIMIT + 1)
+        .to_list(None)
+    ]
+    truncated = len(matched_ids) > BULK_UPDATE_LIMIT
+    if truncated:
+        matched_ids = matched_ids[:BULK_UPDATE_LIMIT]
+    if payload.task_ids is not None:
+        found = set(matched_ids)
+        errors.extend(
+            TaskBulkError(task_id=task_id, error="Task not found")
+            for oid, task_id in requested.items()
+            if oid not in found
+        )
+
+    if not matched_ids:
+        return TaskBulkResult(matched=0, modified=0, errors=errors)
+
+    changes = {"status": update.status}
+    if update.status == "done" and update.action_taken:
+        changes["action_taken"] = update.action_taken
+
+    try:
+        result = await tasks_collection.update_many(
+            {"_id": {"$in": matched_ids}, "user_id": user_id}, {"$set": changes}
+        )
+    except Exception as e:
+        logger.error("❌ Error bulk updating %s tasks: %s", len(matched_ids), e)
+        raise HTTPException(
+            status_code=500, detail="Internal server error while updating tasks"
+        )
+
+    publish_task_events(
+        "archived" if update.status == "archived" else "updated",
+        user_id,
+        [str(oid) for oid in matched_ids],
+        changes,
+    )
+    logger.info(
+        "✅ Bulk updated %d/%d tasks to status: %s%s",
+        result.modified_count,
+        len(matched_ids),
+        update.status,
+        " (truncated)" if truncated else "",
+    )
+    return TaskBulkResult(
+        matched=result.matched_count,
+        modified=result.modified_count,
+        truncated=truncated,
+        errors=errors,
+    )
+
+
 @router.patch("/{task_id}", response_model=AssistantTask)
 async def update_task(task_id: str, update: TaskUpdate, request: Request):
     try:
-        logger.debug(f"🔄 Updating task {task_id} to status: {update.status}")
+        logger.debug("🔄 Updating task %s to status: %s", task_id, update.status)
 
         # Get the current user ID
         user_id = await get_current_user_id(request)
@@ -81,16 +263,15 @@ async def update_task(task_id: str, update: TaskUpdate, request: Request):
         )
 
         if not task:
-            logger.error(f"❌ Task {task_id} not found for user {user_id}")
+            logger.error("❌ Task %s not found for user %s", task_id, user_id)
             raise HTTPException(status_code=404, detail="Task not found")
 
         # Validate status
-        valid_statuses = ["pending", "in_progress", "done", "archived"]
-        if update.status not in valid_statuses:
-            logger.error(f"❌ Invalid status {update.status} for task {task_id}")
+        if update.status not in VALID_TASK_STATUSES:
+            logger.error("❌ Invalid status %s for task %s", update.status, task_id)
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}",
+                detail=f"Invalid status. Must be one of: {', '.join(VALID_TASK_STATUSES)}",
             )
 
         # Update the task status and action_taken
@@ -98,15 +279,21 @@ async def update_task(task_id: str, update: TaskUpdate, request: Request):
         if update.status == "done" and update.action_taken:
             task.action_taken = update.action_taken
         await task.save()
+        publish_task_event(
+            "archived" if update.status == "archived" else "updated", task
+        )
 
         logger.info(
-            f"✅ Task {task_id} updated to status: {update.status} with action: {update.action_taken}"
+            "✅ Task %s updated to status: %s with action: %s",
+            task_id,
+            update.status,
+            update.action_taken,
         )
         return task
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error updating task {task_id}: {str(e)}")
+        logger.error("❌ Error updating task %s: %s", task_id, e)
         raise HTTPException(
             status_code=500, detail="Internal server error while updating task"
         )
@@ -4,12 +4,8 @@ from pydantic_settings import BaseSettings
 from functools import lru_cache
 from typing import Optional, List
 import os
-from dotenv import load_dotenv
 import sys
 
-# Load environment variables
-load_dotenv()
-
 
 class Settings(BaseSettings):
     """Application settings"""
@@ -18,6 +14,26 @@ class Settings(BaseSettings):
     mongodb_uri: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
     mongodb_db: str = os.getenv("MONGODB_DB", "email_assistant")
 
+    # MongoDB connection pool settings (one shared client per process)
+    mongodb_max_pool_size: int = os.getenv("MONGODB_MAX_POOL_SIZE", 100)
+    mongodb_min_pool_size: int = os.getenv("MONGODB_MIN_POOL_SIZE", 0)
+    mongodb_max_idle_time_ms: int = os.getenv("MONGODB_MAX_IDLE_TIME_MS", 60000)
+    mongodb_wait_queue_timeout_ms: int = os.getenv(
+        "MONGODB_WAIT_QUEUE_TIMEOUT_MS", 5000
+    )
+
+    # Slow-query recorder: commands at or above the threshold are kept in a
+    # ring buffer; a fraction of slow reads get an explain() plan check
+    slow_query_threshold_ms: float = os.getenv("SLOW_QUERY_THRESHOLD_MS", 100)
+    slow_query_log_size: int = os.getenv("SLOW_QUERY_LOG_SIZE", 200)
+    slow_query_explain_rate: float = os.getenv("SLOW_QUERY_EXPLAIN_RATE", 0)
+
+    # Replica set read staleness bounds for the consistency profiles
+    mongodb_max_staleness_seconds: int = os.getenv("MONGODB_MAX_STALENESS_SECONDS", 90)
+    mongodb_analytics_max_staleness_seconds: int = os.getenv(
+        "MONGODB_ANALYTICS_MAX_STALENESS_SECONDS", 300
+    )
+
     # Test database settings
     mongodb_test_uri: str = os.getenv("MONGODB_TEST_URI", "mongodb://localhost:27017")
     mongodb_test_db: str = os.getenv("MONGODB_TEST_DB", "email_assistant_test")
@@ -39,6 +55,32 @@ class Settings(BaseSettings):
     # new flag for AI action suggestions
     use_ai_actions: bool = False
 
+    # Task event stream (SSE) settings
+    task_stream_heartbeat_seconds: float = os.getenv(
+        "TASK_STREAM_HEARTBEAT_SECONDS", 15
+    )
+    task_events_change_streams: bool = (
+        os.getenv("TASK_EVENTS_CHANGE_STREAMS", "false").lower() == "true"
+    )
+
+    # Concurrent emails reprocessed after a bulk "not spam"
+    spam_reprocess_concurrency: int = os.getenv("SPAM_REPROCESS_CONCURRENCY", 4)
+
+    # Seconds a user's settings stay cached in-process before reloading
+    user_settings_cache_ttl_seconds: float = os.getenv(
+        "USER_SETTINGS_CACHE_TTL_SECONDS", 60
+    )
+
+    # Readiness probe: dependency checks run in the background at this interval
+    health_probe_interval_seconds: float = os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", 5)
+    health_db_timeout_seconds: float = os.getenv("HEALTH_DB_TIMEOUT_SECONDS", 2)
+
+    # Event loop lag monitor: heartbeat interval, and the lag at which the
+    # blocking stack is captured for /api/v1/admin/loop/stalls
+    loop_lag_interval_ms: float = os.getenv("LOOP_LAG_INTERVAL_MS", 250)
+    loop_lag_threshold_ms: float = os.getenv("LOOP_LAG_THRESHOLD_MS", 100)
+    loop_lag_log_size: int = os.getenv("LOOP_LAG_LOG_SIZE", 50)
+
     # CORS settings
     allow_origins: List[str] = [
         os.getenv("FRONTEND_ORIGIN"),
@@ -2,6 +2,27 @@
 from fastapi import Request, Depends
 from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorClient
 from app.config import get_settings, Settings
+from app.utils.db_monitoring import PoolMetricsListener
+
+
+def create_motor_client(settings: Settings, **overrides) -> AsyncIOMotorClient:
+    """
+    Create the process-wide MongoDB client.
+
+    The client owns the connection pool, so it should be created once (in the
+    app lifespan) and shared by every request rather than built per request.
+    """
+    options = dict(
+        maxPoolSize=int(settings.mongodb_max_pool_size),
+        minPoolSize=int(settings.mongodb_min_pool_size),
+        maxIdleTimeMS=int(settings.mongodb_max_idle_time_ms),
+        waitQueueTimeoutMS=int(settings.mongodb_wait_queue_timeout_ms),
+        event_listeners=[PoolMetricsListener()],
+    )
+    # Extra listeners are added to the pool listener rather than replacing it
+    options["event_listeners"] += overrides.pop("event_listeners", [])
+    options.update(overrides)
+    return AsyncIOMotorClient(settings.current_mongodb_uri, **options)
 
 
 async def get_db(
@@ -11,20 +32,18 @@ async def get_db(
     Get database instance based on the environment.
 
     If app.state.test_mode is True, return the test database
-    stored in app.state.test_db, otherwise return the production database.
+    stored in app.state.test_db, otherwise return the production database
+    from the shared, lifespan-managed client.
     """
     # Check if we're in test mode with a pre-configured test DB
     if hasattr(request.app.state, "test_mode") and request.app.state.test_mode:
         if hasattr(request.app.state, "test_db"):
             return request.app.state.test_db
 
-    # Use the appropriate database based on settings
-    client = AsyncIOMotorClient(settings.current_mongodb_uri)
-    db = client[settings.current_mongodb_db]
-
-    # Store client in app state to close it later
-    if not hasattr(request.app.state, "temp_clients"):
-        request.app.state.temp_clients = []
-    request.app.state.temp_clients.append(client)
+    # Reuse the lifespan client; only create one if the lifespan never ran
+    client = getattr(request.app.state, "motor_client", None)
+    if client is None:
+        client = create_motor_client(settings)
+        request.app.state.motor_client = client
 
-    return db
+    return client[settings.current_mongodb_db]
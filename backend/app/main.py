@@ -1,20 +1,41 @@
 # backend/app/main.py
 
-from fastapi import FastAPI, Body, Depends
+from fastapi import FastAPI, Body, Depends, Response
 from contextlib import asynccontextmanager
 from app.models.email_message import EmailMessage
 from app.models.assistant_task import AssistantTask
 from app.models.user_settings import UserSettings
 from app.models.webhook_security import WebhookSecurity
+from app.models.spam_counter import SpamCounter
+from app.models.reprocess_job import ReprocessJobRecord
 from beanie import init_beanie
 import motor.motor_asyncio
-from app.api.routers import email, tasks, settings, admin
-from app.middleware import setup_cors, limiter, RATE_LIMIT
+from app.api.routers import email, tasks, settings, admin, health
+from app.middleware import (
+    setup_cors,
+    limiter,
+    ApiKeyMiddleware,
+    RATE_LIMIT,
+    PROFILER_SAMPLE_RATE,
+    PROFILER_TOKEN,
+    ProfilerMiddleware,
+    RequestMetricsMiddleware,
+)
+from app.services.health import health_monitor
+from app.services.webhook_security import validate_api_key
+from app.services.task_events import watch_task_changes
+from app.services.spam_reprocessing import spam_reprocessor
 from app.config import get_settings, Settings
+from app.dependencies import create_motor_client
+from app.utils.db_monitoring import slow_query_listener
+from app.utils.log_pipeline import parse_sample_rates, setup_logging
+from app.utils.loop_monitor import loop_monitor
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 import uuid
 from beanie.exceptions import CollectionWasNotInitialized
 from typing import Optional
+import asyncio
 import logging
 import os
 from slowapi.middleware import SlowAPIMiddleware
@@ -23,43 +44,66 @@ from slowapi import _rate_limit_exceeded_handler
 
 # Configure logging manually
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
 
-
-logging.basicConfig(
+# Records go through a bounded queue written by a background thread
+setup_logging(
     level=LOG_LEVEL,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
+    log_format=LOG_FORMAT,
+    queue_size=LOG_QUEUE_SIZE,
+    sample_rates=parse_sample_rates(LOG_SAMPLE_RATES),
 )
 
 logger = logging.getLogger(__name__)
 logger.info("Logger initialized. Log level is %s", LOG_LEVEL)
 
 
+# Every Beanie document the app reads or writes
+DOCUMENT_MODELS = [
+    EmailMessage,
+    AssistantTask,
+    UserSettings,
+    WebhookSecurity,
+    SpamCounter,
+    ReprocessJobRecord,
+]
+
+
 async def init_db(settings: Settings = None):
     """Initialize database connection"""
     if settings is None:
         settings = get_settings()
 
-    logger.debug(f"🔑 Using MongoDB URI: {settings.current_mongodb_uri}")
+    logger.debug("🔑 Using MongoDB URI: %s", settings.current_mongodb_uri)
 
-    client = AsyncIOMotorClient(
-        settings.current_mongodb_uri,
+    slow_query_listener.configure(
+        threshold_ms=settings.slow_query_threshold_ms,
+        max_entries=settings.slow_query_log_size,
+        explain_rate=settings.slow_query_explain_rate,
+    )
+    client = create_motor_client(
+        settings,
         serverSelectionTimeoutMS=5000,
         socketTimeoutMS=5000,
         connectTimeoutMS=5000,
         tls=True,
+        event_listeners=[slow_query_listener],
     )
+    slow_query_listener.attach(client)
     await init_beanie(
         database=client[settings.current_mongodb_db],
-        document_models=[EmailMessage, AssistantTask, UserSettings, WebhookSecurity],
+        document_models=DOCUMENT_MODELS,
         allow_index_dropping=True,
     )
 
-    logger.debug(f"✅ Connecting to DB: {settings.current_mongodb_uri}")
-    logger.debug(f"🧠 Using database: {settings.current_mongodb_db}")
-    logger.debug(
-        f"Collections: {await client[settings.current_mongodb_db].list_collection_names()}"
-    )
+    logger.debug("✅ Connecting to DB: %s", settings.current_mongodb_uri)
+    logger.debug("🧠 Using database: %s", settings.current_mongodb_db)
+    # Listing collections is a server round trip: only pay for it when shown
+    if logger.isEnabledFor(logging.DEBUG):
+        collections = await client[settings.current_mongodb_db].list_collection_names()
+        logger.debug("Collections: %s", collections)
 
     logger.debug("✅ Successfully initialized Beanie")
 
@@ -77,9 +121,42 @@ async def lifespan(app: FastAPI):
     app.state.settings = settings
     logger.debug("🌟 Lifespan: DB client assigned to app.state")
 
+    # Optionally feed the task event stream from MongoDB change streams
+    task_watcher = None
+    if settings.task_events_change_streams:
+        task_watcher = asyncio.create_task(watch_task_changes())
+
+    # Dependency probes for /readyz, refreshed off the request path
+    health_monitor.start(
+        client,
+        interval=settings.health_probe_interval_seconds,
+        db_timeout=settings.health_db_timeout_seconds,
+    )
+
+    # Catch synchronous calls that block the event loop
+    loop_monitor.configure(
+        interval_ms=settings.loop_lag_interval_ms,
+        threshold_ms=settings.loop_lag_threshold_ms,
+        max_stalls=settings.loop_lag_log_size,
+    )
+    loop_monitor.start()
+
     # Database setup only in lifespan
     yield
 
+    await loop_monitor.stop()
+    await health_monitor.stop()
+
+    if task_watcher is not None:
+        task_watcher.cancel()
+        try:
+            await task_watcher
+        except asyncio.CancelledError:
+            pass
+
+    # Stop background "not spam" reprocessing before the DB goes away
+    await spam_reprocessor.shutdown()
+
     logger.debug("🌟 Lifespan: Shutting down DB")
     if client is not None:
         try:
@@ -88,26 +165,56 @@ async def lifespan(app: FastAPI):
             pass
 
 
-app = FastAPI(title="Email Assistant API", lifespan=lifespan)
+async def read_root():
+    return {"message": "Welcome to Email Assistant API"}
 
-# Configure rate limiting middleware
-app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-# Setup CORS middleware
-setup_cors(app)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint for the in-process metrics registry."""
+    return Response(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
 
-# Include routers
-app.include_router(email.router)  # router already has prefix in its definition
-app.include_router(tasks.router)  # router already has prefix in its definition
-app.include_router(settings.router)  # router already has prefix in its definition
-app.include_router(admin.router)  # admin endpoints for webhook security
 
+def create_app() -> FastAPI:
+    """
+    Build the API application. Optional integrations (OpenAI, MailSlurp,
+    IMAP) are imported on first use, so building an app only pays for the
+    routers and middleware.
+    """
+    app = FastAPI(title="Email Assistant API", lifespan=lifespan)
 
-@app.get("/")
-async def read_root():
-    return {"message": "Welcome to Email Assistant API"}
+    # Configure rate limiting middleware
+    app.state.limiter = limiter
+    app.add_middleware(SlowAPIMiddleware)
+    # Outside the limiter, so API keys are validated before a bucket is picked
+    app.add_middleware(ApiKeyMiddleware, validate=validate_api_key)
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    # Setup CORS middleware
+    setup_cors(app)
+
+    # Opt-in request profiling; not installed at all unless configured
+    if PROFILER_TOKEN or PROFILER_SAMPLE_RATE > 0:
+        app.add_middleware(ProfilerMiddleware)
+
+    # Outermost, so latency includes the other middleware
+    app.add_middleware(RequestMetricsMiddleware)
+
+    # Include routers
+    app.include_router(email.router)  # router already has prefix in its definition
+    app.include_router(tasks.router)  # router already has prefix in its definition
+    app.include_router(settings.router)  # router already has prefix in its definition
+    app.include_router(admin.router)  # admin endpoints for webhook security
+    app.include_router(health.router)  # /healthz and /readyz for the orchestrator
+
+    app.add_api_route("/", read_root, methods=["GET"])
+    app.add_api_route(
+        "/metrics", prometheus_metrics, methods=["GET"], include_in_schema=False
+    )
+
+    return app
+
+
+app = create_app()
 
 
 """
@@ -1,23 +1,174 @@
 # backend/app/middleware.py
 
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI
-from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+import hashlib
+import hmac
+import ipaddress
 import os
 import logging
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+from limits.storage import storage_from_string
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.errors import RateLimitExceeded
+from starlette.datastructures import Headers
 
-# Load environment variables
-load_dotenv()
+from app.utils.metrics import metrics
+from app.utils.profiler import Profile, SamplingProfiler, profile_store
 
 logger = logging.getLogger(__name__)
 
 # Rate limiter setup
+# memory:// counts per worker; point several workers at a local shared store
+# (e.g. redis://localhost:6379 or memcached://localhost:11211) to share counts
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+# Sustained limit per API key / user, plus a short-window burst limit
 RATE_LIMIT = os.getenv("WEBHOOK_RATE_LIMIT", "5/minute")
-limiter = Limiter(key_func=get_remote_address, default_limits=[RATE_LIMIT])
+BURST_RATE_LIMIT = os.getenv("WEBHOOK_BURST_LIMIT", "5/second")
+WEBHOOK_RATE_LIMITS = f"{BURST_RATE_LIMIT};{RATE_LIMIT}"
+# Internal ingestion sources (comma-separated IPs/CIDRs) that skip limiting
+RATE_LIMIT_TRUSTED_NETWORKS = [
+    ipaddress.ip_network(net.strip(), strict=False)
+    for net in os.getenv("RATE_LIMIT_TRUSTED_NETWORKS", "").split(",")
+    if net.strip()
+]
+
+# Per-request profiling: requests carrying X-Profile with this admin token,
+# plus a random fraction of all requests. Both off by default.
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", 0))
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", 5))
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", 30))
+PROFILER_MAX_CONCURRENT = int(os.getenv("PROFILER_MAX_CONCURRENT", 2))
+
+
+# How long a key's validation result is trusted for bucket selection;
+# the webhook itself still validates every request against the database
+RATE_LIMIT_KEY_TTL_SECONDS = int(os.getenv("RATE_LIMIT_KEY_TTL_SECONDS", 300))
+
+# Validation results live next to the counters, so with a shared
+# RATE_LIMIT_STORAGE_URI every worker sees a key validated by any of them
+_key_storage = storage_from_string(RATE_LIMIT_STORAGE_URI)
+
+
+def _hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+
+def _validated_slot(hashed: str) -> str:
+    return "api-key-valid:" + hashed
+
+
+def _rejected_slot(hashed: str) -> str:
+    return "api-key-invalid:" + hashed
+
+
+def mark_api_key_validated(api_key: str, valid: bool = True) -> None:
+    """Record the outcome of validating api_key for rate_limit_key."""
+    hashed = _hash_api_key(api_key)
+    keep, drop = _validated_slot(hashed), _rejected_slot(hashed)
+    if not valid:
+        keep, drop = drop, keep
+    try:
+        _key_storage.clear(drop)
+        _key_storage.incr(keep, RATE_LIMIT_KEY_TTL_SECONDS)
+    except Exception as e:
+        logger.warning("Could not record API key validation: %s", e)
+
+
+def api_key_status(api_key: str) -> Optional[bool]:
+    """The recorded validation of api_key, or None if it has none."""
+    hashed = _hash_api_key(api_key)
+    try:
+        if _key_storage.get(_validated_slot(hashed)):
+            return True
+        if _key_storage.get(_rejected_slot(hashed)):
+            return False
+    except Exception as e:
+        logger.warning("Could not read API key validation: %s", e)
+    return None
+
+
+def rate_limit_key(request: Request) -> str:
+    """
+    Rate-limit bucket for a request: the webhook API key (hashed, so raw keys
+    never reach the limiter storage) if it is valid, else the client IP.
+    Relays behind one load balancer IP therefore get separate buckets, while
+    unknown or rotated keys all share the IP's bucket. ApiKeyMiddleware
+    validates keys before any limit is checked, so a relay's first request
+    already counts against its own bucket.
+
+    Requests are not keyed by user: the webhook's user_id is a query
+    parameter the caller chooses, so a bucket per user would give every
+    made-up user_id a fresh allowance.
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key_status(api_key):
+        return "key:" + _hash_api_key(api_key)
+    return f"ip:{get_remote_address(request)}"
+
+
+class ApiKeyMiddleware:
+    """
+    Pure ASGI middleware that validates a request's X-API-Key before the
+    rate limiter picks its bucket. The result is recorded for
+    RATE_LIMIT_KEY_TTL_SECONDS (valid or not), so a key costs one lookup
+    per TTL across all workers sharing the limiter storage; a failed lookup
+    leaves the request in its IP's bucket.
+    """
+
+    def __init__(self, app, validate: Callable[[str], Awaitable[bool]]):
+        self.app = app
+        self.validate = validate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            api_key = Headers(scope=scope).get("x-api-key")
+            if api_key and api_key_status(api_key) is None:
+                try:
+                    valid = await self.validate(api_key)
+                except Exception as e:
+                    logger.warning("API key lookup for rate limiting failed: %s", e)
+                else:
+                    mark_api_key_validated(api_key, valid)
+        await self.app(scope, receive, send)
+
+
+def is_trusted_request(request: Request) -> bool:
+    """Internal ingestion: flagged by the caller or from a trusted network."""
+    if getattr(request.state, "rate_limit_exempt", False):
+        return True
+    if not RATE_LIMIT_TRUSTED_NETWORKS or not request.client:
+        return False
+    try:
+        address = ipaddress.ip_address(request.client.host)
+    except ValueError:
+        return False
+    return any(address in network for network in RATE_LIMIT_TRUSTED_NETWORKS)
+
+
+class TenantLimiter(Limiter):
+    """slowapi Limiter that lets trusted requests through without a hit."""
+
+    def _check_request_limit(self, request, endpoint_func, in_middleware=True):
+        if is_trusted_request(request):
+            # slowapi reads this when injecting headers after the handler
+            request.state.view_rate_limit = None
+            return
+        super()._check_request_limit(request, endpoint_func, in_middleware)
+
+
+limiter = TenantLimiter(
+    key_func=rate_limit_key,
+    default_limits=[RATE_LIMIT],
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+)
 
 
 def setup_cors(app: FastAPI) -> None:
@@ -34,8 +185,7 @@ def setup_cors(app: FastAPI) -> None:
         allowed_origins = os.getenv("FRONTEND_ORIGIN").split(",")
         allowed_credentials = True
 
-    logger.debug(f"🔒 CORS allowed origins: {allowed_origins}")
-    print(f"🔒 CORS allowed origins: {allowed_origins}")
+    logger.info("🔒 CORS allowed origins: %s", allowed_origins)
 
     app.add_middleware(
         CORSMiddleware,
@@ -44,3 +194,158 @@ def setup_cors(app: FastAPI) -> None:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+
+
+request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Request latency by method, route template and status",
+)
+requests_in_flight = metrics.gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled by this worker",
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route latency and the number of
+    requests in flight. Routes are labelled by
+    their template (e.g. /api/v1/tasks/{task_id}) so label cardinality stays
+    bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_flight.dec()
+            route = scope.get("route")
+            request_duration.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            )
+
+
+class ProfilerMiddleware:
+    """
+    Pure ASGI middleware that runs a sampling profiler around requests
+    carrying a valid X-Profile admin token, or a sampled fraction of all
+    requests. Profiles are kept in profile_store under the request id
+    (X-Request-ID, or a generated one) returned in the X-Profile-Id header.
+
+    Only installed when a token or sample rate is configured; otherwise a
+    request pays one header lookup. At most max_concurrent requests are
+    profiled at once, since all of them sample the same event loop thread.
+    """
+
+    def __init__(
+        self,
+        app,
+        token: str = None,
+        sample_rate: float = None,
+        interval_ms: float = None,
+        max_seconds: float = None,
+        max_concurrent: int = None,
+        store=None,
+    ):
+        self.app = app
+        self.token = (PROFILER_TOKEN if token is None else token).encode()
+        self.sample_rate = PROFILER_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.interval = (
+            PROFILER_INTERVAL_MS if interval_ms is None else interval_ms
+        ) / 1000
+        self.max_seconds = PROFILER_MAX_SECONDS if max_seconds is None else max_seconds
+        self.max_concurrent = (
+            PROFILER_MAX_CONCURRENT if max_concurrent is None else max_concurrent
+        )
+        self.store = store or profile_store
+        self._active = 0
+
+    def _trigger(self, scope) -> str:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    if hmac.compare_digest(value, self.token):
+                        return "header"
+                    break
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return ""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trigger = self._trigger(scope)
+        if not trigger or self._active >= self.max_concurrent:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = (
+            next(
+                (v.decode()[:64] for k, v in scope["headers"] if k == b"x-request-id"),
+                None,
+            )
+            or uuid.uuid4().hex
+        )
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", request_id.encode())
+                ]
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval, self.max_seconds)
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        self._active += 1
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            self._active -= 1
+            self.store.add(
+                Profile(
+                    request_id=request_id,
+                    method=scope["method"],
+                    path=scope["path"],
+                    trigger=trigger,
+                    status_code=status_code,
+                    started_at=started_at,
+                    duration_seconds=time.perf_counter() - start,
+                    samples=profiler.samples,
+                    interval_seconds=profiler.interval,
+                    collapsed=profiler.collapsed(),
+                )
+            )
+            logger.info(
+                "Profiled %s %s as %s (%d samples)",
+                scope["method"],
+                scope["path"],
+                request_id,
+                profiler.samples,
+            )
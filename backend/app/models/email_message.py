@@ -2,7 +2,7 @@
 from typing import Optional
 from pydantic import BaseModel, Field
 from beanie import Document
-from pymongo import IndexModel, ASCENDING
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
 
 class EmailMessageBase(BaseModel):
@@ -21,6 +21,9 @@ class EmailMessage(Document):
     context: Optional[str] = None
     message_id: Optional[str] = Field(None)
     signature: Optional[str] = Field(None)
+    # Body without quoted replies and signatures, for the processing stages
+    normalized_body: Optional[str] = Field(None)
+    normalized_length: Optional[int] = Field(None)
     user_id: str = Field(description="ID of the user who owns this email")
     is_spam: bool = Field(
         default=False, description="Indicates if the email is flagged as spam."
@@ -35,4 +38,13 @@ class EmailMessage(Document):
             IndexModel([("subject", ASCENDING), ("sender", ASCENDING)]),
             IndexModel([("signature", ASCENDING)]),
             IndexModel([("user_id", ASCENDING)]),
+            # Spam quarantine listing (newest first) and recounts
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("is_spam", ASCENDING),
+                    ("is_archived", ASCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
         ]
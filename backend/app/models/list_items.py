@@ -0,0 +1,74 @@
+# backend/app/models/list_items.py
+
+from typing import List, Optional
+from pydantic import AliasChoices, BaseModel, Field, field_validator
+
+# Number of body characters sent to list views (TaskCard shows ~100)
+PREVIEW_LENGTH = 160
+
+
+def _preview_expression(body_path: str) -> dict:
+    """MongoDB expression that truncates a body field to PREVIEW_LENGTH code points."""
+    return {"$substrCP": [{"$ifNull": [body_path, ""]}, 0, PREVIEW_LENGTH]}
+
+
+class TaskListItem(BaseModel):
+    """
+    Slim task representation for list endpoints.
+    Only the fields the task list renders are projected from MongoDB, so the
+    linked email's full body and internal fields (signature, message_id) are
+    never loaded or serialized.
+    """
+
+    id: str = Field(validation_alias=AliasChoices("_id", "id"))
+    email_id: Optional[str] = None
+    sender: Optional[str] = None
+    subject: Optional[str] = None
+    context: Optional[str] = None
+    summary: Optional[str] = None
+    actions: List[str] = Field(default_factory=list)
+    status: str
+    action_taken: Optional[str] = None
+    preview: str = ""
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def stringify_id(cls, value):
+        return str(value)
+
+    class Settings:
+        # Applied after Beanie's $lookup of the linked email
+        projection = {
+            "_id": 1,
+            "email_id": {"$toString": "$email._id"},
+            "sender": 1,
+            "subject": 1,
+            "context": 1,
+            "summary": 1,
+            "actions": 1,
+            "status": 1,
+            "action_taken": 1,
+            "preview": _preview_expression("$email.body"),
+        }
+
+
+class SpamEmailListItem(BaseModel):
+    """Slim spam email representation for the spam quarantine list."""
+
+    id: str = Field(validation_alias=AliasChoices("_id", "id"))
+    sender: str
+    subject: str
+    preview: str = ""
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def stringify_id(cls, value):
+        return str(value)
+
+    class Settings:
+        projection = {
+            "_id": 1,
+            "sender": 1,
+            "subject": 1,
+            "preview": _preview_expression("$body"),
+        }
@@ -0,0 +1,52 @@
+# backend/app/models/reprocess_job.py
+
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
+
+from beanie import Document
+from pydantic import BaseModel, Field
+from pymongo import IndexModel, ASCENDING
+
+# Finished jobs only matter while the client polls them
+REPROCESS_JOB_TTL_SECONDS = 7 * 24 * 3600
+
+
+class ReprocessError(BaseModel):
+    email_id: str
+    error: str
+
+
+class ReprocessJob(BaseModel):
+    """
+    Progress of one bulk "not spam" reprocessing run. A job cut short by a
+    worker shutdown ends "interrupted" with processed < total; errors keeps
+    the first failures only, while failed counts all of them.
+    """
+
+    id: str
+    user_id: str
+    status: Literal["queued", "running", "completed", "interrupted"] = "queued"
+    total: int
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[ReprocessError] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+
+class ReprocessJobRecord(ReprocessJob, Document):
+    """
+    A ReprocessJob as stored in MongoDB, keyed by the job id, so any worker
+    can answer a status poll for a job another worker is running.
+    """
+
+    class Settings:
+        name = "reprocess_jobs"
+        indexes = [
+            IndexModel(
+                [("created_at", ASCENDING)],
+                expireAfterSeconds=REPROCESS_JOB_TTL_SECONDS,
+            ),
+        ]
@@ -0,0 +1,20 @@
+# backend/app/models/spam_counter.py
+
+from beanie import Document
+from pydantic import Field
+from pymongo import IndexModel, ASCENDING
+
+
+class SpamCounter(Document):
+    user_id: str = Field(..., description="ID of the user whose spam is counted")
+    spam_count: int = Field(
+        default=0, description="Number of non-archived spam emails for the user"
+    )
+    initialized: bool = Field(
+        default=False,
+        description="True once spam_count has been seeded from the email collection",
+    )
+
+    class Settings:
+        name = "spam_counters"
+        indexes = [IndexModel([("user_id", ASCENDING)], unique=True)]
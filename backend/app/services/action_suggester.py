@@ -5,7 +5,8 @@ import logging
 from pydantic import BaseModel
 from app.models.email_message import EmailMessageBase
 from app.config import get_settings
-from app.services.ai_client import openai_client
+from app.services.ai_client import chat_completion, openai_client
+from app.services.ai_telemetry import ai_telemetry
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +54,9 @@ Context: {email.context if hasattr(email, 'context') else 'unknown'}
 
 Suggest 3 relevant actions for handling this email."""
 
-        response = await openai_client.chat.completions.create(
+        response = await chat_completion(
+            openai_client,
+            "actions",
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": system_prompt},
@@ -75,14 +78,14 @@ Suggest 3 relevant actions for handling this email."""
             try:
                 actions.append(SuggestedAction(**action))
             except Exception as e:
-                logger.warning(f"Failed to parse AI action: {e}")
+                logger.warning("Failed to parse AI action: %s", e)
                 continue
 
         if actions:
             return actions[:3]
 
     except Exception as e:
-        logger.error(f"AI action suggestion failed: {e}")
+        logger.error("AI action suggestion failed: %s", e)
 
     return None
 
@@ -102,6 +105,8 @@ async def suggest_actions(email: EmailMessageBase) -> List[SuggestedAction]:
         ai_actions = await suggest_actions_ai(email)
         if ai_actions:
             actions.extend(ai_actions)
+        else:
+            ai_telemetry.record_fallback("actions", "no_actions")
 
     # 2. If AI is disabled or fails, use rule-based strategies
     if not actions:
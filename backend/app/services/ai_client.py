@@ -1,13 +1,14 @@
 # backend/app/services/ai_client.py
 
+import hashlib
+import json
 import os
 import logging
-from typing import Set
-import openai
-from dotenv import load_dotenv
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Set
 
-# Load environment variables from .env file
-load_dotenv()
+from app.services.ai_telemetry import ai_telemetry
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -17,15 +18,97 @@ ai_logger = logging.getLogger("ai_client")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_API_MODEL", "gpt-3.5-turbo")
 
+
+class LazyOpenAIClient:
+    """
+    Stands in for openai.AsyncOpenAI until first use. The openai package
+    takes a large share of the app's import time and memory, and workers
+    with AI features off never need it.
+    """
+
+    def __init__(self, **options):
+        self._options = options
+        self._client = None
+
+    def __getattr__(self, name):
+        if self._client is None:
+            import openai
+
+            self._client = openai.AsyncOpenAI(**self._options)
+        return getattr(self._client, name)
+
+
 # Initialize OpenAI client
 if OPENAI_API_KEY:
-    openai_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+    openai_client = LazyOpenAIClient(api_key=OPENAI_API_KEY)
 else:
     openai_client = None
     logger.warning(
         "Missing OPENAI_API_KEY environment variable; AI classification will always return 'other'"
     )
 
+# Deterministic (temperature 0) responses can be reused for identical
+# prompts, e.g. when rescued spam is reprocessed. Off unless sized.
+AI_RESPONSE_CACHE_SIZE = int(os.getenv("AI_RESPONSE_CACHE_SIZE", 0))
+AI_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("AI_RESPONSE_CACHE_TTL_SECONDS", 3600))
+
+_response_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _cache_key(model: str, messages: List[dict], kwargs: dict) -> Optional[str]:
+    if not AI_RESPONSE_CACHE_SIZE or kwargs.get("temperature") != 0:
+        return None
+    payload = json.dumps([model, messages, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def chat_completion(
+    client, feature: str, messages: List[dict], model: str = None, **kwargs
+) -> Any:
+    """
+    The one path for chat completion calls: records latency, token usage
+    and errors per feature and model (and per user, see ai_telemetry.ai_user),
+    and serves repeated deterministic prompts from the response cache.
+    Errors are re-raised for the caller's fallback handling.
+    """
+    model = model or OPENAI_MODEL
+    key = _cache_key(model, messages, kwargs)
+    if key is not None:
+        cached = _response_cache.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            _response_cache.move_to_end(key)
+            ai_telemetry.record_cache_hit(feature, model)
+            return cached[1]
+
+    start = time.perf_counter()
+    try:
+        response = await client.chat.completions.create(
+            model=model, messages=messages, **kwargs
+        )
+    except Exception as e:
+        ai_telemetry.record_call(
+            feature, model, time.perf_counter() - start, error=type(e).__name__
+        )
+        raise
+
+    usage = getattr(response, "usage", None)
+    ai_telemetry.record_call(
+        feature,
+        model,
+        time.perf_counter() - start,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+    )
+    if key is not None:
+        _response_cache[key] = (
+            time.monotonic() + AI_RESPONSE_CACHE_TTL_SECONDS,
+            response,
+        )
+        while len(_response_cache) > AI_RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+    return response
+
+
 # Allowed categories for classification
 _VALID_CATEGORIES: Set[str] = {
     "scheduling",
@@ -61,30 +144,34 @@ async def classify_context_ai(subject: str, body: str) -> str:
         "Respond with only the category label (one of these) in lowercase."
     )
     user_prompt = f"Subject: {subject}\n\nBody: {body}"
-    logger.debug("🔄 User prompt: ", user_prompt)
+    logger.debug("🔄 User prompt: %d chars", len(user_prompt))
 
     try:
-        response = await openai_client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
+        response = await chat_completion(
+            openai_client,
+            "classification",
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
+            model=OPENAI_MODEL,
             temperature=0,
         )
         category = response.choices[0].message.content.strip().lower()
-        logger.debug("🔄 AI classification response: ", category)
+        logger.debug("🔄 AI classification response: %s", category)
     except Exception as e:
-        logger.error(f"AI classification failed: {e}")
-        logger.debug("🔄 AI classification failed: ", e)
+        logger.error("AI classification failed: %s", e)
+        logger.debug("🔄 AI classification failed: %s", e)
+        ai_telemetry.record_fallback("classification", "error")
         return "other"
 
     if category not in _VALID_CATEGORIES:
         logger.warning(
-            f"Received unexpected category '{category}', defaulting to 'other'."
+            "Received unexpected category '%s', defaulting to 'other'.", category
         )
-        logger.debug("🔄 Received unexpected category: ", category)
+        logger.debug("🔄 Received unexpected category: %s", category)
+        ai_telemetry.record_fallback("classification", "invalid_output")
         return "other"
 
-    logger.debug("🔄 Returning category: ", category)
+    logger.debug("🔄 Returning category: %s", category)
     return category
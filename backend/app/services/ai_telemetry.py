@@ -0,0 +1,171 @@
+# backend/app/services/ai_telemetry.py
+
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from app.utils.metrics import metrics
+
+ai_requests = metrics.counter(
+    "ai_requests_total",
+    "AI chat completion calls, by feature, model and outcome (ok or error type)",
+)
+ai_request_seconds = metrics.histogram(
+    "ai_request_duration_seconds",
+    "AI chat completion latency, by feature and model",
+)
+ai_tokens = metrics.counter(
+    "ai_tokens_total",
+    "Tokens reported by the AI provider, by feature, model and kind",
+)
+ai_cache_hits = metrics.counter(
+    "ai_cache_hits_total",
+    "AI calls answered from the response cache, by feature and model",
+)
+# AI results replaced by the rule-based fallback
+ai_fallbacks = metrics.counter(
+    "ai_fallbacks_total",
+    "AI calls that fell back to rule-based results, by component and reason",
+)
+
+# Owner of the email being processed; set by the task mapper so calls deep in
+# the pipeline are attributed without threading user_id through every helper
+ai_user: ContextVar[Optional[str]] = ContextVar("ai_user", default=None)
+
+
+class _Usage:
+    __slots__ = (
+        "calls",
+        "errors",
+        "fallbacks",
+        "cache_hits",
+        "prompt_tokens",
+        "completion_tokens",
+        "latency_seconds",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.fallbacks = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency_seconds = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "fallbacks": self.fallbacks,
+            "cache_hits": self.cache_hits,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_latency_ms": (
+                round(self.latency_seconds / self.calls * 1000, 2)
+                if self.calls
+                else 0.0
+            ),
+        }
+
+
+class AITelemetry:
+    """
+    Rolls up AI usage per feature, globally and per user. Per-user rollups
+    are kept for the max_users most recently active users; the Prometheus
+    metrics above carry the global view without user labels.
+    """
+
+    def __init__(self, max_users: int = 10000):
+        self.max_users = max_users
+        self._global: Dict[str, _Usage] = {}
+        self._users: "OrderedDict[str, Dict[str, _Usage]]" = OrderedDict()
+        # Calls failing in a row, across features; reset by any success
+        self.consecutive_errors = 0
+
+    def _usages(self, feature: str) -> List[_Usage]:
+        usages = [self._global.setdefault(feature, _Usage())]
+        user_id = ai_user.get()
+        if user_id:
+            features = self._users.get(user_id)
+            if features is None:
+                features = self._users[user_id] = {}
+                while len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(user_id)
+            usages.append(features.setdefault(feature, _Usage()))
+        return usages
+
+    def record_call(
+        self,
+        feature: str,
+        model: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        error: Optional[str] = None,
+    ):
+        ai_requests.inc(feature=feature, model=model, outcome=error or "ok")
+        ai_request_seconds.observe(seconds, feature=feature, model=model)
+        if prompt_tokens:
+            ai_tokens.inc(prompt_tokens, feature=feature, model=model, kind="prompt")
+        if completion_tokens:
+            ai_tokens.inc(
+                completion_tokens, feature=feature, model=model, kind="completion"
+            )
+        self.consecutive_errors = self.consecutive_errors + 1 if error else 0
+        for usage in self._usages(feature):
+            usage.calls += 1
+            usage.latency_seconds += seconds
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            if error:
+                usage.errors += 1
+
+    def record_fallback(self, feature: str, reason: str):
+        ai_fallbacks.inc(component=feature, reason=reason)
+        for usage in self._usages(feature):
+            usage.fallbacks += 1
+
+    def record_cache_hit(self, feature: str, model: str):
+        ai_cache_hits.inc(feature=feature, model=model)
+        for usage in self._usages(feature):
+            usage.cache_hits += 1
+
+    def snapshot(self, user_id: Optional[str] = None, limit: int = 20) -> dict:
+        """
+        Global usage per feature plus per-user usage: one user's if user_id
+        is given, otherwise the limit users with the most tokens.
+        """
+        if user_id is not None:
+            users = [user_id] if user_id in self._users else []
+        else:
+            users = sorted(
+                self._users,
+                key=lambda u: sum(
+                    usage.prompt_tokens + usage.completion_tokens
+                    for usage in self._users[u].values()
+                ),
+                reverse=True,
+            )[:limit]
+        return {
+            "global": {f: usage.to_dict() for f, usage in self._global.items()},
+            "users": [
+                {
+                    "user_id": u,
+                    "features": {
+                        f: usage.to_dict() for f, usage in self._users[u].items()
+                    },
+                }
+                for u in users
+            ],
+        }
+
+    def reset(self):
+        self._global.clear()
+        self._users.clear()
+        self.consecutive_errors = 0
+
+
+ai_telemetry = AITelemetry()
@@ -2,10 +2,12 @@
 
 import os
 import logging
+from typing import Optional
 
 from app.models.email_message import EmailMessageBase
 from app.services.ai_client import classify_context_ai
 from app.services.task_classifier import classify_context as classify_context_rule
+from app.utils.email_features import EmailFeatures
 
 # Determine mode via environment variable
 USE_AI = os.getenv("USE_AI_CONTEXT", "false").lower() in ("true", "1", "yes")
@@ -13,10 +15,13 @@ USE_AI = os.getenv("USE_AI_CONTEXT", "false").lower() in ("true", "1", "yes")
 logger = logging.getLogger(__name__)
 
 
-async def classify_context(subject: str, body: str) -> str:
+async def classify_context(
+    subject: str, body: str, features: Optional[EmailFeatures] = None
+) -> str:
     """
     Unified context classifier. If USE_AI_CONTEXT is enabled, delegates to AI-based classifier;
-    otherwise or on error, falls back to rule-based classifier.
+    otherwise or on error, falls back to rule-based classifier, which scans
+    the email's features when given.
     """
     logger.debug("🔄 Classifying context in service")
     if USE_AI:
@@ -24,8 +29,8 @@ async def classify_context(subject: str, body: str) -> str:
             logger.debug("🔄 Using AI classifier")
             return await classify_context_ai(subject, body)
         except Exception as e:
-            logging.error(f"AI classification error, falling back to rule-based: {e}")
+            logging.error("AI classification error, falling back to rule-based: %s", e)
             logger.debug("🔄 Falling back to rule-based classifier")
     # Fallback to rule-based classification
     email = EmailMessageBase(subject=subject, body=body, sender="")
-    return classify_context_rule(email)
+    return classify_context_rule(email, features)
@@ -1,37 +1,74 @@
 # backend/app/services/duplicate_detection.py
 
-import hashlib
 from difflib import SequenceMatcher
-from typing import Optional
+from typing import Iterable, Optional
 import json
 from pathlib import Path
 
 from app.models.email_message import EmailMessage
 from app.config import get_settings
+from app.utils.body_normalizer import normalized_text
+from app.utils.email_features import EmailFeatures, content_signature
 
 # Load spam keywords from a JSON file
 SPAM_KEYWORDS_FILE = Path(__file__).parent / "spam_keywords.json"
 
 
 # Placeholder function for spam detection
-def is_spam_email(email: EmailMessage) -> bool:
-    """Detects if an email is spam based on keywords."""
+def is_spam_email(
+    email: EmailMessage, features: Optional[EmailFeatures] = None
+) -> bool:
+    """
+    Detects if an email is spam based on keywords. Both the raw and the
+    normalized text are scanned: quoted blocks and signatures must not hide
+    a payload, and HTML bodies only read as words once converted. Uses the
+    email's features when the caller has them.
+    """
     try:
         with open(SPAM_KEYWORDS_FILE, "r") as f:
             spam_keywords = json.load(f)
     except FileNotFoundError:
         spam_keywords = []
 
-    # Check if any spam keyword is in the email subject or body
-    email_content = f"{email.subject} {email.body}".lower()
-    return any(keyword.lower() in email_content for keyword in spam_keywords)
+    if features is not None:
+        raw, normalized = features.raw_text, features.text
+    else:
+        raw = f"{email.subject} {email.body}".lower()
+        normalized = f"{email.subject} {normalized_text(email)}".lower()
+    return any(
+        keyword.lower() in raw or keyword.lower() in normalized
+        for keyword in spam_keywords
+    )
 
 
-async def is_duplicate_email(email: EmailMessage) -> bool:
+def is_fuzzy_duplicate(
+    email: EmailMessage, candidates: Iterable[EmailMessage], threshold: float
+) -> bool:
+    """
+    True if the average subject/body similarity to any candidate reaches
+    threshold. Bodies are compared without quoted history and signatures.
+    Kept separate from the database lookups so it can be benchmarked on
+    its own.
+    """
+    body = normalized_text(email)
+    for other in candidates:
+        subj_sim = SequenceMatcher(
+            None, email.subject or "", other.subject or ""
+        ).ratio()
+        body_sim = SequenceMatcher(None, body, normalized_text(other)).ratio()
+        if ((subj_sim + body_sim) / 2) >= threshold:
+            return True
+    return False
+
+
+async def is_duplicate_email(
+    email: EmailMessage, features: Optional[EmailFeatures] = None
+) -> bool:
     """
     Returns True if duplicate, False otherwise.
     Attaches signature to email if unique.
     Only checks for duplicates within the same user's emails.
+    Reuses features.content_hash when the caller has the email's features.
     """
     # Ensure we have a user_id to filter by
     if not hasattr(email, "user_id") or not email.user_id:
@@ -50,8 +87,10 @@ async def is_duplicate_email(email: EmailMessage) -> bool:
             return True
 
     # 2) compute exact content signature
-    hash_input = (email.sender + email.subject + email.body).encode("utf-8")
-    exact_sig = hashlib.sha256(hash_input).hexdigest()
+    if features is not None:
+        exact_sig = features.content_hash
+    else:
+        exact_sig = content_signature(email.sender, email.subject, email.body)
     existing = await EmailMessage.find_one(
         {"signature": exact_sig, "user_id": email.user_id}  # Filter by user_id
     )
@@ -60,13 +99,8 @@ async def is_duplicate_email(email: EmailMessage) -> bool:
 
     # 3) fuzzy match subject+body against recent emails from the same user
     recent = await EmailMessage.find({"user_id": email.user_id}).limit(100).to_list()
-    for other in recent:
-        subj_sim = SequenceMatcher(
-            None, email.subject or "", other.subject or ""
-        ).ratio()
-        body_sim = SequenceMatcher(None, email.body or "", other.body or "").ratio()
-        if ((subj_sim + body_sim) / 2) >= get_settings().duplicate_threshold:
-            return True
+    if is_fuzzy_duplicate(email, recent, get_settings().duplicate_threshold):
+        return True
 
     # unique — attach exact signature and proceed
     email.signature = exact_sig
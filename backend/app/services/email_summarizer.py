@@ -5,8 +5,13 @@ import re
 from typing import Optional
 from app.models.email_message import EmailMessageBase
 from app.config import get_settings
-from app.services.ai_client import openai_client, OPENAI_MODEL, logger as ai_logger
-import openai
+from app.services.ai_client import (
+    chat_completion,
+    openai_client,
+    OPENAI_MODEL,
+    logger as ai_logger,
+)
+from app.services.ai_telemetry import ai_telemetry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -73,8 +78,10 @@ async def generate_summary(email: EmailMessageBase) -> str:
                 f"Subject: {email.subject or '(No Subject)'}\n"
                 f"Body: {email.body or '(No Body)'}"
             )
-            logger.debug("🔄 Sending summary prompt to OpenAI: ", prompt)
-            response = await openai_client.chat.completions.create(
+            logger.debug("🔄 Sending summary prompt to OpenAI: %d chars", len(prompt))
+            response = await chat_completion(
+                openai_client,
+                "summary",
                 model=OPENAI_MODEL,
                 messages=[
                     {
@@ -87,11 +94,13 @@ async def generate_summary(email: EmailMessageBase) -> str:
             )
             summary = response.choices[0].message.content.strip()
             if summary:
-                logger.debug("✅ Received AI-generated task summary: ", summary)
+                logger.debug("✅ Received AI-generated task summary: %s", summary)
                 return summary
+            ai_telemetry.record_fallback("summary", "empty_output")
         except Exception as e:
-            ai_logger.error(f"AI summarization failed: {e}")
-            logger.debug("⚠️ AI summarization failed, falling back: ", e)
+            ai_logger.error("AI summarization failed: %s", e)
+            logger.debug("⚠️ AI summarization failed, falling back: %s", e)
+            ai_telemetry.record_fallback("summary", "error")
 
     # Non-AI fallback path
     if not email.subject and not email.body:
@@ -6,17 +6,48 @@ import logging
 logger = logging.getLogger(__name__)
 from app.models.email_message import EmailMessage, EmailMessageBase
 from app.models.assistant_task import AssistantTask
+from app.models.user_settings import UserSettings
 import app.services.context_classifier as context_classifier
 from app.services.email_summarizer import generate_summary
 from app.services.action_suggester import suggest_actions
-from app.utils.email_utils import parse_forwarded_metadata
+from app.services.ai_telemetry import ai_user
+from app.utils.email_features import EmailFeatures, build_email_features
 from .duplicate_detection import is_spam_email
+from .spam_quarantine import update_spam_flags
+from .user_settings_cache import user_settings_cache
+from app.utils.metrics import metrics
+
+# Contexts treated as low priority when a user enables skip_low_priority_emails
+LOW_PRIORITY_CONTEXTS = ("other",)
+
+stage_seconds = metrics.histogram(
+    "email_pipeline_stage_seconds",
+    "Time spent in each stage of mapping an email to a task",
+)
+emails_spam = metrics.counter(
+    "emails_spam_total",
+    "Emails quarantined as spam during ingestion",
+)
+stages_skipped = metrics.counter(
+    "email_pipeline_stages_skipped_total",
+    "Pipeline stages skipped because of user settings, by stage",
+)
+
+
+async def load_user_settings(user_id: str) -> Optional[UserSettings]:
+    """Cached settings for the email's owner; None means run every stage."""
+    try:
+        return await user_settings_cache.get(user_id)
+    except Exception as e:
+        logger.warning("Could not load settings for %s, using defaults: %s", user_id, e)
+        return None
 
 
 async def handle_spam_email(email: EmailMessage):
     """Handles spam emails by marking them as spam and skipping task creation."""
-    email.is_spam = True
-    await email.save()  # Persist the spam status in the database
+    # Persist the spam status and bump the user's spam counter
+    await update_spam_flags(email, is_spam=True)
+    emails_spam.inc()
     return None  # Skip task creation
 
 
@@ -25,6 +56,8 @@ async def map_email_to_task(
     actions: Optional[List[str]] = None,
     skipSpamCheck: bool = False,
     forceFullProcessing: bool = False,
+    user_settings: Optional[UserSettings] = None,
+    features: Optional[EmailFeatures] = None,
 ) -> Optional[AssistantTask]:
     """
     Map an EmailMessage to an AssistantTask.
@@ -34,78 +67,99 @@ async def map_email_to_task(
         actions: Optional list of actions
         skipSpamCheck: Skip spam check (for emails marked as not spam)
         forceFullProcessing: Force full AI processing regardless of other conditions
+        user_settings: The owner's settings, if the caller already has them;
+            otherwise they are read once from the settings cache
+        features: The email's features, if the caller already built them;
+            otherwise they are built here, once for every stage
 
     Returns:
         An AssistantTask object or None if the email is spam and skipSpamCheck is False
     """
-    if not skipSpamCheck and is_spam_email(email):
-        return await handle_spam_email(email)
+    ai_user.set(email.user_id)
+    # Emails that did not come through the webhook (reprocessing, older
+    # documents) get their features and normalized body here
+    if features is None:
+        with stage_seconds.time(stage="features"):
+            features = build_email_features(email)
+    if email.normalized_body is None:
+        email.normalized_body = features.normalized_body
+        email.normalized_length = features.normalized_length
+    body_text = features.normalized_body
+    if user_settings is None:
+        with stage_seconds.time(stage="settings"):
+            user_settings = await load_user_settings(email.user_id)
+    spam_filtering = user_settings is None or user_settings.enable_spam_filtering
+    categorize = (
+        forceFullProcessing
+        or user_settings is None
+        or user_settings.enable_auto_categorization
+    )
+    skip_low_priority = (
+        not forceFullProcessing
+        and user_settings is not None
+        and user_settings.skip_low_priority_emails
+    )
+
+    if not skipSpamCheck:
+        if not spam_filtering:
+            stages_skipped.inc(stage="spam_check")
+        else:
+            with stage_seconds.time(stage="spam_check"):
+                is_spam = is_spam_email(email, features)
+            if is_spam:
+                return await handle_spam_email(email)
 
     if forceFullProcessing or not email.is_spam:
 
         logger.debug("🔄 Mapping email to task in service")
-        print("Mapping email to task in service")
-        # Try to extract original sender/subject from forwarded content
-        forwarded_sender, forwarded_subject = parse_forwarded_metadata(email.body)
-        # Treat empty strings as None for fallback logic
-        forwarded_sender = (
-            forwarded_sender if forwarded_sender and forwarded_sender.strip() else None
-        )
-        forwarded_subject = (
-            forwarded_subject
-            if forwarded_subject and forwarded_subject.strip()
-            else None
-        )
-        # Determine sender and subject defaults, with warnings if missing
-        if forwarded_sender:
-            sender_val = forwarded_sender
-        else:
-            if not email.sender or not email.sender.strip():
-                logger.warning(
-                    "EmailMessage missing sender; defaulting to 'Unknown Sender'"
-                )
-            sender_val = (
-                email.sender.strip()
-                if email.sender and email.sender.strip()
-                else "Unknown Sender"
+        # Forwarded sender/subject win over the email's own (see EmailFeatures)
+        sender_val = features.sender
+        if sender_val is None:
+            logger.warning(
+                "EmailMessage missing sender; defaulting to 'Unknown Sender'"
             )
-        if forwarded_subject:
-            subject_val = forwarded_subject
-        else:
-            if not email.subject or not email.subject.strip():
-                logger.warning(
-                    "EmailMessage missing subject; defaulting to '(No Subject)'"
+            sender_val = "Unknown Sender"
+        subject_val = features.subject
+        if subject_val is None:
+            logger.warning("EmailMessage missing subject; defaulting to '(No Subject)'")
+            subject_val = "(No Subject)"
+        if categorize:
+            logger.debug("🔄 Classifying context")
+            # Classify context using AI or rule-based
+            with stage_seconds.time(stage="classification"):
+                context_label = await context_classifier.classify_context(
+                    subject_val, body_text, features=features
                 )
-            subject_val = (
-                email.subject.strip()
-                if email.subject and email.subject.strip()
-                else "(No Subject)"
-            )
-        logger.debug("🔄 Classifying context")
-        # Classify context using AI or rule-based
-        context_label = await context_classifier.classify_context(
-            subject_val, email.body
-        )
+        else:
+            stages_skipped.inc(stage="categorization")
+            context_label = "other"
+
+        # Low-priority emails for users who skip them get a plain task
+        # without AI summary or action suggestions
+        low_priority = skip_low_priority and context_label in LOW_PRIORITY_CONTEXTS
+        if low_priority:
+            stages_skipped.inc(stage="summary")
+            if actions is None:
+                stages_skipped.inc(stage="actions")
+                actions = []
+
         logger.debug("🔄 Generating summary")
         # Generate summary: handle long bodies and missing subjects before AI/rule-based
-        body_text = email.body.strip() if email.body else ""
-        if body_text:
+        if body_text and not low_priority:
             # Long body truncation
-            if len(body_text) > 100:
-                snippet = await generate_summary(
-                    EmailMessageBase(
-                        subject=subject_val,
-                        body=body_text[:100] + "…",
-                        sender=email.sender,
-                    )
+            if features.normalized_length > 100:
+                summary_input = EmailMessageBase(
+                    subject=subject_val,
+                    body=body_text[:100] + "…",
+                    sender=email.sender,
                 )
             else:
                 # use AI or rule-based summarizer for concise snippet
-                snippet = await generate_summary(
-                    EmailMessageBase(
-                        subject=subject_val, body=email.body, sender=email.sender
-                    )
+                summary_input = EmailMessageBase(
+                    subject=subject_val, body=body_text, sender=email.sender
                 )
+            with stage_seconds.time(stage="summarization"):
+                snippet = await generate_summary(summary_input)
             summary_text = f"{subject_val}: {snippet}" if snippet else subject_val
         else:
             summary_text = subject_val
@@ -114,17 +168,18 @@ async def map_email_to_task(
         # Get suggested actions if not provided
         if actions is None:
             try:
-                suggested_actions = await suggest_actions(
-                    EmailMessageBase(
-                        subject=subject_val,
-                        body=email.body,
-                        sender=sender_val,
-                        context=context_label,
+                with stage_seconds.time(stage="action_suggestion"):
+                    suggested_actions = await suggest_actions(
+                        EmailMessageBase(
+                            subject=subject_val,
+                            body=body_text,
+                            sender=sender_val,
+                            context=context_label,
+                        )
                     )
-                )
                 actions = [action.label for action in suggested_actions]
             except Exception as e:
-                logger.error(f"Error suggesting actions: {e}")
+                logger.error("Error suggesting actions: %s", e)
                 actions = ["Reply", "Forward", "Archive"]  # fallback or default action
 
         logger.debug("🔄 Building task kwargs")
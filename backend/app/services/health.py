@@ -0,0 +1,122 @@
+# backend/app/services/health.py
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from app.middleware import requests_in_flight
+from app.services import ai_client
+from app.services.ai_telemetry import ai_telemetry
+from app.services.spam_reprocessing import spam_reprocessor
+from app.utils.db_monitoring import pool_stats
+
+logger = logging.getLogger(__name__)
+
+# AI calls failing in a row before the backend is reported as failing.
+# Informational only: every AI feature has a rule-based fallback.
+AI_FAILING_AFTER = 3
+
+
+class HealthMonitor:
+    """
+    Probes the app's dependencies from a background task and caches the
+    result, so /readyz answers from memory and orchestrator probes never
+    add load to MongoDB. A report older than three intervals counts as not
+    ready, since it means the probe loop (or the event loop) is stuck.
+    """
+
+    def __init__(self, interval: float = 5.0, db_timeout: float = 2.0):
+        self.interval = interval
+        self.db_timeout = db_timeout
+        self._report: Optional[dict] = None
+        self._checked_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, client, interval: float = None, db_timeout: float = None):
+        if interval is not None:
+            self.interval = float(interval)
+        if db_timeout is not None:
+            self.db_timeout = float(db_timeout)
+        self._task = asyncio.create_task(self._run(client))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._report = None
+
+    async def _run(self, client):
+        while True:
+            try:
+                await self.refresh(client)
+            except Exception as e:
+                logger.error("❌ Health probe failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self, client) -> dict:
+        """Run every probe once and cache the report."""
+        self._report = {
+            "database": await self._probe_database(client),
+            "pool": self._pool(client),
+            "ingestion": {
+                "requests_in_flight": int(requests_in_flight.value()),
+                "reprocess_pending": spam_reprocessor.pending(),
+            },
+            "ai": self._ai(),
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._checked_at = time.monotonic()
+        return self._report
+
+    async def _probe_database(self, client) -> dict:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(client.admin.command("ping"), self.db_timeout)
+        except Exception as e:
+            return {"ok": False, "error": str(e) or type(e).__name__}
+        return {"ok": True, "ping_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+    def _pool(self, client) -> dict:
+        stats = pool_stats(client)
+        max_size = stats["config"].get("max_pool_size") or 0
+        checked_out = max(
+            (s.get("checked_out", 0) for s in stats["servers"].values()), default=0
+        )
+        waiting = max(
+            (s.get("waiting", 0) for s in stats["servers"].values()), default=0
+        )
+        return {
+            "max_pool_size": max_size,
+            "checked_out": int(checked_out),
+            "waiting": int(waiting),
+            "saturation": round(checked_out / max_size, 3) if max_size else 0.0,
+        }
+
+    def _ai(self) -> dict:
+        errors = ai_telemetry.consecutive_errors
+        return {
+            "configured": ai_client.openai_client is not None,
+            "consecutive_errors": errors,
+            "state": "failing" if errors >= AI_FAILING_AFTER else "ok",
+        }
+
+    def readiness(self) -> Tuple[bool, dict]:
+        """Whether the worker should receive traffic, with the cached report."""
+        if self._report is None:
+            return False, {"status": "starting"}
+        stale = time.monotonic() - self._checked_at > 3 * self.interval
+        ready = self._report["database"]["ok"] and not stale
+        return ready, {
+            "status": "ready" if ready else "not_ready",
+            "stale": stale,
+            **self._report,
+        }
+
+
+health_monitor = HealthMonitor()
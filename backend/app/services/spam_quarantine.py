@@ -0,0 +1,117 @@
+# backend/app/services/spam_quarantine.py
+
+import logging
+from typing import List, Optional
+
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+
+from app.models.email_message import EmailMessage
+from app.models.spam_counter import SpamCounter
+
+logger = logging.getLogger(__name__)
+
+
+def _in_quarantine(email: EmailMessage) -> bool:
+    """Quarantined emails are the ones shown in the spam list."""
+    return email.is_spam and not email.is_archived
+
+
+def spam_list_filter(user_id: str) -> dict:
+    return {"user_id": user_id, "is_spam": True, "is_archived": False}
+
+
+async def adjust_spam_count(user_id: str, delta: int):
+    """Atomically add delta to the user's spam counter, creating it if needed."""
+    await SpamCounter.get_pymongo_collection().update_one(
+        {"user_id": user_id}, {"$inc": {"spam_count": delta}}, upsert=True
+    )
+
+
+async def recount_spam(user_id: str) -> int:
+    """Seed (or repair) the counter from a countDocuments scan."""
+    count = await EmailMessage.get_pymongo_collection().count_documents(
+        spam_list_filter(user_id)
+    )
+    await SpamCounter.get_pymongo_collection().update_one(
+        {"user_id": user_id},
+        {"$set": {"spam_count": count, "initialized": True}},
+        upsert=True,
+    )
+    return count
+
+
+async def get_spam_count(user_id: str) -> int:
+    """
+    Number of quarantined spam emails for user_id, read from the counter
+    document. Only users without a seeded counter pay for a count scan.
+    """
+    counter = await SpamCounter.find_one(SpamCounter.user_id == user_id)
+    if counter is not None and counter.initialized:
+        return max(counter.spam_count, 0)
+    return await recount_spam(user_id)
+
+
+async def update_spam_flags(
+    email: EmailMessage,
+    is_spam: Optional[bool] = None,
+    is_archived: Optional[bool] = None,
+):
+    """
+    Persist spam/archive flag changes on an email and keep the per-user spam
+    counter in step. The counter delta comes from the document as it was
+    just before this write (an atomic find-and-update), not from our own
+    possibly stale read, so concurrent requests always sum to the truth.
+    """
+    changes = {}
+    if is_spam is not None:
+        changes["is_spam"] = is_spam
+    if is_archived is not None:
+        changes["is_archived"] = is_archived
+    if not changes:
+        return
+
+    if email.id is None:
+        # Not stored yet: save the whole document with the new flags
+        was_quarantined = _in_quarantine(email)
+        for key, value in changes.items():
+            setattr(email, key, value)
+        await email.save()
+        now_quarantined = _in_quarantine(email)
+    else:
+        before = await EmailMessage.get_pymongo_collection().find_one_and_update(
+            {"_id": email.id},
+            {"$set": changes},
+            projection={"is_spam": True, "is_archived": True},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if before is None:
+            logger.warning("Email %s vanished before its flags were updated", email.id)
+            return
+        flags = {
+            "is_spam": before.get("is_spam", False),
+            "is_archived": before.get("is_archived", False),
+        }
+        was_quarantined = flags["is_spam"] and not flags["is_archived"]
+        flags.update(changes)
+        now_quarantined = flags["is_spam"] and not flags["is_archived"]
+        email.is_spam, email.is_archived = flags["is_spam"], flags["is_archived"]
+
+    delta = int(now_quarantined) - int(was_quarantined)
+    if delta:
+        await adjust_spam_count(email.user_id, delta)
+
+
+async def clear_spam_flags(user_id: str, email_ids: List[PydanticObjectId]) -> int:
+    """
+    Mark many of a user's emails as not spam with a single update_many.
+    Only quarantined emails match, so the counter drops by exactly the
+    number of documents modified. Returns that number.
+    """
+    result = await EmailMessage.get_pymongo_collection().update_many(
+        {"_id": {"$in": list(email_ids)}, **spam_list_filter(user_id)},
+        {"$set": {"is_spam": False}},
+    )
+    if result.modified_count:
+        await adjust_spam_count(user_id, -result.modified_count)
+    return result.modified_count
@@ -0,0 +1,261 @@
+# backend/app/services/spam_reprocessing.py
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from beanie import PydanticObjectId
+
+from app.config import get_settings
+from app.models.assistant_task import AssistantTask
+from app.models.email_message import EmailMessage
+from app.models.reprocess_job import ReprocessError, ReprocessJob, ReprocessJobRecord
+from app.services.email_task_mapper import map_email_to_task
+from app.services.task_events import publish_task_event
+
+logger = logging.getLogger(__name__)
+
+
+async def reprocess_email(email: EmailMessage) -> Tuple[Optional[AssistantTask], bool]:
+    """
+    Run the full task pipeline for an email that was rescued from spam.
+    An existing task for the email is refreshed in place, otherwise a new
+    one is inserted. Returns the task (None if mapping failed) and whether
+    it was created.
+    """
+    existing_task = await AssistantTask.find_one(
+        {"email.$id": email.id, "user_id": email.user_id}
+    )
+
+    new_task = await map_email_to_task(
+        email, skipSpamCheck=True, forceFullProcessing=True
+    )
+    if not new_task:
+        return None, False
+
+    if existing_task:
+        # Update existing task with new AI-processed data
+        existing_task.subject = new_task.subject
+        existing_task.context = new_task.context
+        existing_task.summary = new_task.summary
+        existing_task.actions = new_task.actions
+        await existing_task.save()
+        publish_task_event("updated", existing_task)
+        return existing_task, False
+
+    await new_task.insert()
+    publish_task_event("created", new_task)
+    return new_task, True
+
+
+class SpamReprocessor:
+    """
+    Runs bulk reprocessing jobs in the background.
+
+    A single semaphore bounds how many emails go through the pipeline at
+    once across all jobs, so rescuing hundreds of messages cannot flood the
+    AI provider or starve request handling.
+
+    Each job runs on the worker that started it, but its progress is saved
+    to the reprocess_jobs collection as it goes, so a status poll served by
+    any worker sees it. Progress is saved every save_every emails or
+    save_interval seconds, whichever comes first, and skipped while an
+    earlier save is still in flight; a job's start and end are always
+    saved. Only the first max_errors failures are listed. The newest
+    max_jobs jobs are also kept in memory, which answers polls on this
+    worker without a query.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        max_jobs: int = 100,
+        save_every: int = 25,
+        save_interval: float = 2.0,
+        max_errors: int = 100,
+    ):
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self.max_errors = max_errors
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._jobs: "OrderedDict[str, ReprocessJob]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        # Serialises each running job's saves so an older state never
+        # overwrites a newer one
+        self._save_locks: Dict[str, asyncio.Lock] = {}
+        # job id -> (processed, monotonic time) at its last save
+        self._last_saved: Dict[str, Tuple[int, float]] = {}
+
+    async def start(
+        self, user_id: str, email_ids: List[PydanticObjectId]
+    ) -> ReprocessJob:
+        """Queue email_ids for reprocessing and return the job to poll."""
+        job = ReprocessJob(id=uuid.uuid4().hex, user_id=user_id, total=len(email_ids))
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        self._save_locks[job.id] = asyncio.Lock()
+        # Saved before the id is handed out, so the first poll finds it
+        await self._save(job)
+
+        task = asyncio.create_task(self._run(job, list(email_ids)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get(self, job_id: str, user_id: str) -> Optional[ReprocessJob]:
+        """Look up a job, only if it belongs to user_id."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await self._load_job(job_id, user_id)
+        if job.user_id != user_id:
+            return None
+        return job
+
+    def pending(self) -> int:
+        """Emails queued or in progress across unfinished jobs."""
+        return sum(
+            job.total - job.processed
+            for job in self._jobs.values()
+            if job.finished_at is None
+        )
+
+    async def _run(self, job: ReprocessJob, email_ids: List[PydanticObjectId]):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores bind to one event loop (tests run several)
+            limit = self.concurrency or get_settings().spam_reprocess_concurrency
+            self._semaphore = asyncio.Semaphore(int(limit))
+            self._loop = loop
+        try:
+            job.status = "running"
+            await self._save(job)
+            emails = await self._load_emails(job.user_id, email_ids)
+            await asyncio.gather(
+                *(self._process_one(job, oid, emails.get(oid)) for oid in email_ids)
+            )
+            job.status = "completed"
+        except asyncio.CancelledError:
+            # Shutdown: the remaining emails were never reprocessed
+            job.status = "interrupted"
+            raise
+        except Exception as e:
+            logger.error("❌ Reprocess job %s failed: %s", job.id, e)
+            remaining = job.total - job.processed
+            job.failed += remaining
+            job.processed = job.total
+            self._add_error(job, ReprocessError(email_id="*", error=str(e)))
+            job.status = "completed"
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            await self._save(job)
+            self._save_locks.pop(job.id, None)
+            self._last_saved.pop(job.id, None)
+            logger.info(
+                "✅ Reprocess job %s %s: %d created, %d updated, %d failed",
+                job.id,
+                job.status,
+                job.created,
+                job.updated,
+                job.failed,
+            )
+
+    def _add_error(self, job: ReprocessJob, error: ReprocessError):
+        if len(job.errors) < self.max_errors:
+            job.errors.append(error)
+
+    async def _save_progress(self, job: ReprocessJob):
+        """Save the job if enough emails or time have passed since its last save."""
+        lock = self._save_locks.get(job.id)
+        if lock is None or lock.locked():
+            return
+        processed, saved_at = self._last_saved.get(job.id, (0, 0.0))
+        if (
+            job.processed - processed < self.save_every
+            and time.monotonic() - saved_at < self.save_interval
+        ):
+            return
+        await self._save(job)
+
+    async def _save(self, job: ReprocessJob):
+        """
+        Store the job's current state. A failed save is logged, not raised:
+        the job carries on and this worker still answers polls for it.
+        """
+        lock = self._save_locks.get(job.id)
+        if lock is None:
+            return
+        async with lock:
+            self._last_saved[job.id] = (job.processed, time.monotonic())
+            try:
+                await self._store_job(job)
+            except Exception as e:
+                logger.warning("⚠️ Saving reprocess job %s failed: %s", job.id, e)
+
+    async def _store_job(self, job: ReprocessJob):
+        await ReprocessJobRecord(**job.model_dump()).save()
+
+    async def _load_job(self, job_id: str, user_id: str) -> Optional[ReprocessJob]:
+        return await ReprocessJobRecord.find_one({"_id": job_id, "user_id": user_id})
+
+    async def _load_emails(
+        self, user_id: str, email_ids: List[PydanticObjectId]
+    ) -> Dict[PydanticObjectId, EmailMessage]:
+        emails = await EmailMessage.find(
+            {"_id": {"$in": email_ids}, "user_id": user_id}
+        ).to_list()
+        return {email.id: email for email in emails}
+
+    async def _process_one(
+        self,
+        job: ReprocessJob,
+        email_id: PydanticObjectId,
+        email: Optional[EmailMessage],
+    ):
+        async with self._semaphore:
+            try:
+                if email is None:
+                    raise LookupError("Email not found")
+                task, created = await reprocess_email(email)
+                if task is None:
+                    raise RuntimeError("Task creation failed")
+                if created:
+                    job.created += 1
+                else:
+                    job.updated += 1
+            except Exception as e:
+                logger.warning("⚠️ Reprocessing email %s failed: %s", email_id, e)
+                job.failed += 1
+                self._add_error(
+                    job, ReprocessError(email_id=str(email_id), error=str(e))
+                )
+            # Not counted when cancelled: the email was never reprocessed
+            job.processed += 1
+        await self._save_progress(job)
+
+    async def shutdown(self):
+        """
+        Cancel in-flight jobs on application shutdown; they are saved as
+        interrupted.
+        """
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Jobs cancelled before their task first ran
+        for job in self._jobs.values():
+            if job.finished_at is None and job.id in self._save_locks:
+                job.status = "interrupted"
+                job.finished_at = datetime.now(timezone.utc)
+                await self._save(job)
+                self._save_locks.pop(job.id, None)
+
+
+spam_reprocessor = SpamReprocessor()
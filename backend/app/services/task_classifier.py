@@ -1,5 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from app.models.email_message import EmailMessageBase
+from app.utils.email_features import EmailFeatures
 
 # Define categories and their associated keywords
 CATEGORY_KEYWORDS: Dict[str, List[str]] = {
@@ -58,13 +59,19 @@ CATEGORY_KEYWORDS: Dict[str, List[str]] = {
 }
 
 
-def classify_context(email: EmailMessageBase) -> str:
+def classify_context(
+    email: EmailMessageBase, features: Optional[EmailFeatures] = None
+) -> str:
     """
     Classifies an email into one of the predefined categories based on keyword matching.
     Returns the category with the highest match count, or 'other' if no matches are found.
+    Scans features.text instead when the caller has the email's features.
     """
     # Combine subject and body for analysis
-    text = f"{email.subject} {email.body}".lower()
+    if features is not None:
+        text = features.text
+    else:
+        text = f"{email.subject} {email.body}".lower()
 
     # Count matches for each category
     match_counts: Dict[str, int] = {}
@@ -0,0 +1,284 @@
+# backend/app/services/task_events.py
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict, deque
+from itertools import count
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+
+from app.models.assistant_task import AssistantTask
+
+logger = logging.getLogger(__name__)
+
+TASK_EVENT_TYPES = ("created", "updated", "archived")
+
+
+class TaskEvent(BaseModel):
+    """A single change to a user's task, as pushed over the task stream."""
+
+    id: int
+    type: str
+    user_id: str
+    task_id: str
+    data: Dict[str, Any]
+
+    def to_sse(self) -> str:
+        """Render the event in text/event-stream wire format."""
+        payload = json.dumps({"task_id": self.task_id, **self.data}, default=str)
+        return f"id: {self.id}\nevent: task.{self.type}\ndata: {payload}\n\n"
+
+
+def serialize_task(task: AssistantTask) -> Dict[str, Any]:
+    """Build the event payload for a task without its linked email."""
+    return task.model_dump(mode="json", exclude={"email", "revision_id"})
+
+
+class TaskEventBroker:
+    """
+    In-process pub/sub for task changes, partitioned by user_id.
+
+    Every published event gets a monotonically increasing id and is kept in a
+    bounded per-user replay buffer so reconnecting clients can resume from the
+    last event id they saw. Ids start at the broker's boot time in
+    microseconds: an id issued by an earlier process is below this broker's
+    range and one from another worker is almost never inside it, and any id
+    outside the range is answered with a reset rather than a partial replay. Subscribers each get their own bounded queue; a
+    subscriber that cannot keep up is dropped rather than blocking publishers.
+    Replay buffers are kept for the max_users users with the most recent
+    events; beyond that the least recently active user without a live
+    subscriber is forgotten.
+    """
+
+    def __init__(
+        self,
+        replay_size: int = 256,
+        queue_size: int = 100,
+        max_users: int = 10000,
+        first_id: Optional[int] = None,
+    ):
+        self.replay_size = replay_size
+        self.queue_size = queue_size
+        self.max_users = max_users
+        if first_id is None:
+            first_id = time.time_ns() // 1000
+        self.first_id = first_id
+        self.last_id = first_id - 1
+        self._ids = count(first_id)
+        # user_id -> replay buffer, least recently published to first
+        self._replay: "OrderedDict[str, Deque[TaskEvent]]" = OrderedDict()
+        # Highest event id per user that has been pushed out of the replay buffer
+        self._evicted: Dict[str, int] = {}
+        # Highest event id of any forgotten user: a user without a buffer may
+        # have had events up to here, so older resume ids cannot be trusted
+        self._forgotten = 0
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        # When a change stream feeds the broker, local publishes are ignored
+        # so each write is delivered exactly once.
+        self.change_stream_active = False
+
+    def publish(self, event_type: str, user_id: str, task_id: str, data: dict):
+        """Record an event for user_id and fan it out to live subscribers."""
+        if event_type not in TASK_EVENT_TYPES:
+            raise ValueError(f"Unknown task event type: {event_type}")
+
+        event = TaskEvent(
+            id=next(self._ids),
+            type=event_type,
+            user_id=user_id,
+            task_id=task_id,
+            data=data,
+        )
+        self.last_id = event.id
+        buffered = self._buffer(user_id)
+        if len(buffered) == self.replay_size:
+            self._evicted[user_id] = buffered[0].id
+        buffered.append(event)
+
+        for queue in list(self._subscribers.get(user_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning("Dropping slow task stream subscriber for %s", user_id)
+                self._subscribers[user_id].discard(queue)
+                # Wake the subscriber so it can close its stream
+                queue.get_nowait()
+                queue.put_nowait(None)
+        return event
+
+    def _buffer(self, user_id: str) -> Deque[TaskEvent]:
+        """user_id's replay buffer, marked most recently used."""
+        buffered = self._replay.get(user_id)
+        if buffered is not None:
+            self._replay.move_to_end(user_id)
+            return buffered
+        if len(self._replay) >= self.max_users:
+            self._forget_idle_user()
+        buffered = self._replay[user_id] = deque(maxlen=self.replay_size)
+        if self._forgotten:
+            self._evicted[user_id] = self._forgotten
+        return buffered
+
+    def _forget_idle_user(self):
+        """Drop the least recently active buffer with no live subscriber."""
+        for user_id in self._replay:
+            if user_id not in self._subscribers:
+                buffered = self._replay.pop(user_id)
+                self._evicted.pop(user_id, None)
+                if buffered:
+                    self._forgotten = max(self._forgotten, buffered[-1].id)
+                return
+
+    def replay_since(
+        self, user_id: str, last_event_id: int
+    ) -> Optional[List[TaskEvent]]:
+        """
+        Return buffered events newer than last_event_id, or None if the
+        requested id has already fallen out of the replay buffer or was not
+        issued by this broker (a restart, or another worker).
+        """
+        if not self.first_id <= last_event_id <= self.last_id:
+            return None
+        evicted = self._evicted.get(user_id, 0)
+        if user_id not in self._replay:
+            evicted = self._forgotten
+        if last_event_id < evicted:
+            return None
+        buffered = self._replay.get(user_id, ())
+        return [event for event in buffered if event.id > last_event_id]
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(user_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def subscriber_count(self, user_id: Optional[str] = None) -> int:
+        if user_id is not None:
+            return len(self._subscribers.get(user_id, ()))
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def stream(
+        self,
+        user_id: str,
+        last_event_id: Optional[int] = None,
+        heartbeat_seconds: float = 15.0,
+    ) -> AsyncIterator[str]:
+        """
+        Yield SSE frames for user_id: replayed events first, then live events,
+        with a comment heartbeat whenever the stream has been idle.
+        """
+        queue = self.subscribe(user_id)
+        try:
+            if last_event_id is not None:
+                missed = self.replay_since(user_id, last_event_id)
+                if missed is None:
+                    # Cannot resume; client should re-fetch the list, and
+                    # every live event from here on is new to it
+                    yield "event: task.reset\ndata: {}\n\n"
+                    last_sent = 0
+                else:
+                    for event in missed:
+                        yield event.to_sse()
+                    last_sent = missed[-1].id if missed else last_event_id
+            else:
+                last_sent = 0
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if event is None:
+                    return
+                # Skip anything already delivered during replay
+                if event.id <= last_sent:
+                    continue
+                last_sent = event.id
+                yield event.to_sse()
+        finally:
+            self.unsubscribe(user_id, queue)
+
+
+task_event_broker = TaskEventBroker()
+
+
+def publish_task_event(event_type: str, task: AssistantTask):
+    """Publish a task change from a local write path."""
+    if task_event_broker.change_stream_active:
+        return None
+    return task_event_broker.publish(
+        event_type, task.user_id, str(task.id), serialize_task(task)
+    )
+
+
+def publish_task_events(
+    event_type: str, user_id: str, task_ids: List[str], changes: dict
+):
+    """Publish one event per task for a bulk write, carrying only the changed fields."""
+    if task_event_broker.change_stream_active:
+        return []
+    return [
+        task_event_broker.publish(
+            event_type, user_id, task_id, {"id": task_id, **changes}
+        )
+        for task_id in task_ids
+    ]
+
+
+def _event_type_for_change(change: dict) -> Optional[str]:
+    operation = change.get("operationType")
+    if operation == "insert":
+        return "created"
+    if operation in ("update", "replace"):
+        document = change.get("fullDocument") or {}
+        return "archived" if document.get("status") == "archived" else "updated"
+    return None
+
+
+async def watch_task_changes(broker: TaskEventBroker = task_event_broker):
+    """
+    Feed the broker from a MongoDB change stream on the tasks collection so
+    events written by other workers reach this worker's subscribers.
+    Requires a replica set; falls back to local publishing if unavailable.
+    """
+    collection = AssistantTask.get_pymongo_collection()
+    try:
+        async with collection.watch(
+            [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}],
+            full_document="updateLookup",
+        ) as change_stream:
+            broker.change_stream_active = True
+            logger.info("Task event broker is now fed by MongoDB change streams")
+            async for change in change_stream:
+                event_type = _event_type_for_change(change)
+                document = change.get("fullDocument")
+                if not event_type or not document:
+                    continue
+                task_id = str(document.pop("_id"))
+                document.pop("email", None)
+                document.pop("revision_id", None)
+                broker.publish(
+                    event_type,
+                    document.get("user_id"),
+                    task_id,
+                    {"id": task_id, **document},
+                )
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning("Task change stream unavailable, using local events: %s", e)
+    finally:
+        broker.change_stream_active = False
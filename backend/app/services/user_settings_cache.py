@@ -0,0 +1,73 @@
+# backend/app/services/user_settings_cache.py
+
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.config import get_settings
+from app.models.user_settings import UserSettings
+from app.utils.metrics import metrics
+
+settings_cache_requests = metrics.counter(
+    "user_settings_cache_requests_total",
+    "UserSettings cache lookups, by result (hit or miss)",
+)
+
+
+class UserSettingsCache:
+    """
+    In-process cache of UserSettings keyed by user_id.
+
+    Entries expire after a TTL and the least recently used ones are evicted
+    beyond max_entries. The settings API writes through the cache, so a
+    user's own changes apply immediately on this worker; other workers pick
+    them up when their entry expires.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, UserSettings]]" = OrderedDict()
+
+    def _ttl(self) -> float:
+        if self.ttl_seconds is not None:
+            return self.ttl_seconds
+        return float(get_settings().user_settings_cache_ttl_seconds)
+
+    async def get(self, user_id: str) -> UserSettings:
+        """Return the user's settings, loading them on a miss or after expiry."""
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(user_id)
+            settings_cache_requests.inc(result="hit")
+            return entry[1]
+
+        settings_cache_requests.inc(result="miss")
+        user_settings = await self._load(user_id)
+        self.set(user_settings)
+        return user_settings
+
+    async def _load(self, user_id: str) -> UserSettings:
+        user_settings = await UserSettings.find_one(UserSettings.user_id == user_id)
+        # Users who never saved settings get the model defaults
+        return user_settings or UserSettings(user_id=user_id)
+
+    def set(self, user_settings: UserSettings):
+        """Store freshly written settings so the next ingestion sees them."""
+        self._entries[user_settings.user_id] = (
+            time.monotonic() + self._ttl(),
+            user_settings,
+        )
+        self._entries.move_to_end(user_settings.user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[str] = None):
+        """Drop one user's entry, or every entry when user_id is None."""
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+
+user_settings_cache = UserSettingsCache()
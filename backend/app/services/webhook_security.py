@@ -1,8 +1,11 @@
 import secrets
 import os
+import logging
 from typing import List, Optional
 from app.models.webhook_security import WebhookSecurity
 
+logger = logging.getLogger(__name__)
+
 
 async def validate_api_key(provided_key: str) -> bool:
     """Check if the provided API key matches an active stored key or emergency override."""
@@ -28,9 +31,7 @@ async def is_ip_allowed(ip_address: str) -> bool:
             "allowed_ips": ip_address,
         }
     )
-    print(
-        f"Checking IP: {ip_address}, Config: {config.allowed_ips if config else None}"
-    )
+    logger.debug("Checking IP: %s, allowed: %s", ip_address, config is not None)
     return config is not None
 
 
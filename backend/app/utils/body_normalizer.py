@@ -0,0 +1,89 @@
+# backend/app/utils/body_normalizer.py
+
+from typing import List, Optional
+
+from app.utils.html_text import html_to_text, looks_like_html
+
+# Mobile and client footers that end the written part of a message
+_FOOTER_PREFIXES = (
+    "sent from my ",
+    "get outlook for ",
+    "sent from outlook",
+    "sent from yahoo mail",
+)
+# Lines opening a non-">" quoted history (Outlook and similar clients)
+_SEPARATORS = ("-----original message-----", "----- original message -----")
+# Outlook's quoted-header block: "From:" directly followed by one of these
+_OUTLOOK_HEADERS = ("sent:", "date:")
+
+
+def _is_signature_delimiter(line: str) -> bool:
+    # RFC 3676 "-- ", plus the common trailing-space-stripped "--"
+    return line.rstrip("\r") in ("-- ", "--") or line.strip() in ("--", "—")
+
+
+def _ends_history(lines: List[str], index: int, probe: str) -> bool:
+    lowered = probe.lower()
+    if lowered in _SEPARATORS:
+        return True
+    if len(probe) >= 10 and set(probe) == {"_"}:
+        return True
+    if lowered.startswith("from:") and index + 1 < len(lines):
+        return lines[index + 1].strip().lower().startswith(_OUTLOOK_HEADERS)
+    return False
+
+
+def normalize_body(body: Optional[str]) -> str:
+    """
+    The part of a body its sender wrote, for the downstream stages: quoted
+    replies (">" lines and their "On ... wrote:" attribution), Outlook-style
+    quoted history (Original Message / underscore separators, From:+Sent:
+    blocks) and signatures are removed, and blank-line runs collapsed.
+
+    HTML-only bodies are converted to text first. One pass over the lines.
+    Falls back to the stripped body when nothing would be left, e.g. a
+    reply that only quotes.
+    """
+    if not body:
+        return ""
+    if looks_like_html(body):
+        body = html_to_text(body)
+
+    lines = body.splitlines()
+    kept: List[str] = []
+    for index, line in enumerate(lines):
+        probe = line.strip()
+
+        if probe.startswith(">"):
+            continue
+        if probe.endswith("wrote:"):
+            if probe.startswith("On "):
+                continue
+            # Attribution wrapped over two lines
+            if kept and kept[-1].strip().startswith("On "):
+                kept.pop()
+                continue
+        if (
+            _is_signature_delimiter(line)
+            or probe.lower().startswith(_FOOTER_PREFIXES)
+            or _ends_history(lines, index, probe)
+        ):
+            break
+
+        if probe or (kept and kept[-1]):
+            kept.append(line.rstrip())
+
+    normalized = "\n".join(kept).strip()
+    return normalized or body.strip()
+
+
+def normalized_text(email) -> str:
+    """
+    The email's normalized body: the stored normalized_body when the email
+    has one, otherwise computed from its body (older documents, and
+    EmailMessageBase inputs, which have no such field).
+    """
+    stored = getattr(email, "normalized_body", None)
+    if stored is not None:
+        return stored
+    return normalize_body(email.body)
@@ -0,0 +1,127 @@
+# backend/app/utils/consistency.py
+
+import inspect
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Type, Union
+
+from beanie import Document
+from beanie.odm.queries.find import FindMany
+from beanie.odm.utils.projection import get_projection
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReadPreference
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+)
+from pymongo.write_concern import WriteConcern
+
+from app.config import get_settings
+
+INTERACTIVE_READ = "interactive-read"
+ANALYTICS_READ = "analytics-read"
+CRITICAL_WRITE = "critical-write"
+FIRE_AND_FORGET_WRITE = "fire-and-forget-write"
+
+# pymongo's public read preference modes
+ReadPreferenceMode = Union[
+    Primary, PrimaryPreferred, Secondary, SecondaryPreferred, Nearest
+]
+
+
+@dataclass(frozen=True)
+class ConsistencyProfile:
+    """Read preference, read concern and write concern applied to one operation."""
+
+    name: str
+    read_preference: Optional[ReadPreferenceMode] = None
+    read_concern: Optional[ReadConcern] = None
+    write_concern: Optional[WriteConcern] = None
+
+
+@lru_cache()
+def get_consistency_profile(name: str) -> ConsistencyProfile:
+    """
+    Resolve a named profile.
+
+    - interactive-read: user-facing list reads; may be served by a secondary
+      no more than MONGODB_MAX_STALENESS_SECONDS behind the primary.
+    - analytics-read: admin/reporting reads that tolerate more lag and should
+      stay off the primary when a secondary is available.
+    - critical-write: writes that must survive failover (majority, journaled).
+    - fire-and-forget-write: telemetry-style writes where losing one is fine
+      and the caller should not wait for an acknowledgement.
+    """
+    settings = get_settings()
+    if name == INTERACTIVE_READ:
+        return ConsistencyProfile(
+            name=name,
+            read_preference=SecondaryPreferred(
+                max_staleness=int(settings.mongodb_max_staleness_seconds)
+            ),
+            read_concern=ReadConcern("local"),
+        )
+    if name == ANALYTICS_READ:
+        return ConsistencyProfile(
+            name=name,
+            read_preference=SecondaryPreferred(
+                max_staleness=int(settings.mongodb_analytics_max_staleness_seconds)
+            ),
+            read_concern=ReadConcern("available"),
+        )
+    if name == CRITICAL_WRITE:
+        return ConsistencyProfile(
+            name=name,
+            read_preference=ReadPreference.PRIMARY,
+            read_concern=ReadConcern("majority"),
+            write_concern=WriteConcern(w="majority", j=True),
+        )
+    if name == FIRE_AND_FORGET_WRITE:
+        return ConsistencyProfile(name=name, write_concern=WriteConcern(w=0))
+    raise ValueError(f"Unknown consistency profile: {name}")
+
+
+def profiled_collection(
+    document_model: Type[Document], profile: str
+) -> AsyncIOMotorCollection:
+    """Return the model's collection with the named profile's options applied."""
+    resolved = get_consistency_profile(profile)
+    return document_model.get_pymongo_collection().with_options(
+        read_preference=resolved.read_preference,
+        read_concern=resolved.read_concern,
+        write_concern=resolved.write_concern,
+    )
+
+
+async def find_with_profile(query: FindMany, profile: str) -> List:
+    """
+    Run a Beanie find query against the profiled collection.
+    Beanie always reads through the collection defaults, so the query's
+    filter, links, sort, paging and projection are replayed here instead.
+    """
+    collection = profiled_collection(query.document_model, profile)
+    projection_model = query.projection_model
+    projection = get_projection(projection_model)
+
+    if query.fetch_links:
+        pipeline = query.build_aggregation_pipeline()
+        if projection is not None:
+            pipeline.append({"$project": projection})
+        cursor = collection.aggregate(pipeline)
+        if inspect.isawaitable(cursor):
+            # pymongo's async API returns a coroutine; Motor returns the cursor
+            cursor = await cursor
+    else:
+        cursor = collection.find(
+            filter=query.get_filter_query(),
+            sort=query.sort_expressions or None,
+            projection=projection,
+            skip=query.skip_number,
+            limit=query.limit_number,
+        )
+
+    return [projection_model.model_validate(doc) for doc in await cursor.to_list(None)]
@@ -0,0 +1,385 @@
+# backend/app/utils/db_monitoring.py
+
+import asyncio
+import logging
+import random
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from pymongo import monitoring
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Connection checkout waits are usually sub-millisecond; long waits mean the
+# pool is saturated and requests are queueing for a connection.
+CHECKOUT_WAIT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+
+pool_checkout_wait = metrics.histogram(
+    "mongodb_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=CHECKOUT_WAIT_BUCKETS,
+)
+pool_checkout_failures = metrics.counter(
+    "mongodb_pool_checkout_failures_total",
+    "Connection checkouts that failed, by reason",
+)
+pool_connections = metrics.gauge(
+    "mongodb_pool_connections",
+    "Open connections in the pool, by server",
+)
+pool_checked_out = metrics.gauge(
+    "mongodb_pool_checked_out_connections",
+    "Connections currently checked out of the pool, by server",
+)
+pool_waiting = metrics.gauge(
+    "mongodb_pool_waiting_checkouts",
+    "Checkouts currently waiting for a connection, by server",
+)
+
+
+def _server(address) -> str:
+    host, port = address
+    return f"{host}:{port}"
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    Records connection pool checkout waits and occupancy.
+    Callbacks run on driver threads, so they only update metrics.
+
+    Connections checked out when a pool is cleared or closed are still
+    checked in (and closed) afterwards, so occupancy is only decremented,
+    never reset on a clear, and decrements stop at zero after a close.
+    """
+
+    def pool_created(self, event):
+        logger.debug("MongoDB pool created for %s", _server(event.address))
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        logger.warning("MongoDB pool cleared for %s", _server(event.address))
+
+    def pool_closed(self, event):
+        server = _server(event.address)
+        pool_connections.set(0, server=server)
+        pool_checked_out.set(0, server=server)
+        pool_waiting.set(0, server=server)
+
+    def connection_created(self, event):
+        pool_connections.inc(server=_server(event.address))
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pool_connections.dec(floor=0, server=_server(event.address))
+
+    def connection_check_out_started(self, event):
+        pool_waiting.inc(server=_server(event.address))
+
+    def connection_check_out_failed(self, event):
+        server = _server(event.address)
+        pool_waiting.dec(floor=0, server=server)
+        pool_checkout_failures.inc(server=server, reason=event.reason)
+        if event.duration is not None:
+            pool_checkout_wait.observe(event.duration, server=server)
+
+    def connection_checked_out(self, event):
+        server = _server(event.address)
+        pool_waiting.dec(floor=0, server=server)
+        pool_checked_out.inc(server=server)
+        if event.duration is not None:
+            pool_checkout_wait.observe(event.duration, server=server)
+
+    def connection_checked_in(self, event):
+        pool_checked_out.dec(floor=0, server=_server(event.address))
+
+
+def pool_stats(client=None) -> dict:
+    """Snapshot of pool configuration and checkout metrics for the admin API."""
+    servers = {}
+    for key, value in pool_connections.samples().items():
+        server = dict(key)["server"]
+        servers.setdefault(server, {})["connections"] = value
+    for key, value in pool_checked_out.samples().items():
+        server = dict(key)["server"]
+        servers.setdefault(server, {})["checked_out"] = value
+    for key, value in pool_waiting.samples().items():
+        server = dict(key)["server"]
+        servers.setdefault(server, {})["waiting"] = value
+    for server, stats in servers.items():
+        stats["checkout_wait_seconds"] = pool_checkout_wait.summary(server=server)
+        stats["checkout_failures"] = {
+            dict(key)["reason"]: value
+            for key, value in pool_checkout_failures.samples().items()
+            if dict(key)["server"] == server
+        }
+
+    config = {}
+    if client is not None:
+        pool_options = client.options.pool_options
+        config = {
+            "max_pool_size": pool_options.max_pool_size,
+            "min_pool_size": pool_options.min_pool_size,
+            "max_idle_time_seconds": pool_options.max_idle_time_seconds,
+            "wait_queue_timeout_seconds": pool_options.wait_queue_timeout,
+        }
+    return {"config": config, "servers": servers}
+
+
+command_duration = metrics.histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command round-trip time, by command and collection",
+)
+slow_commands = metrics.counter(
+    "mongodb_slow_commands_total",
+    "Commands slower than the slow-query threshold, by command and collection",
+)
+collscans = metrics.counter(
+    "mongodb_collscan_total",
+    "Sampled slow queries whose plan scanned a whole collection, by collection",
+)
+
+# Driver housekeeping that says nothing about application queries
+IGNORED_COMMANDS = {
+    "hello",
+    "ismaster",
+    "isMaster",
+    "ping",
+    "buildinfo",
+    "buildInfo",
+    "saslStart",
+    "saslContinue",
+    "endSessions",
+    "explain",
+}
+# Commands whose plan explain() can show, and where their filter lives
+EXPLAINABLE = {"find", "aggregate", "count", "distinct", "update", "delete"}
+# Session and transaction fields that explain() does not accept
+_NOT_EXPLAINABLE_FIELDS = {
+    "lsid",
+    "txnNumber",
+    "autocommit",
+    "startTransaction",
+    "readConcern",
+    "writeConcern",
+}
+
+
+def query_shape(value: Any) -> Any:
+    """Field names and operators of a query with every value replaced by "?"."""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [query_shape(value[0])] if value else []
+    return "?"
+
+
+def _command_shape(name: str, command: dict) -> dict:
+    if name in ("find", "count", "distinct"):
+        keys = ("filter", "query", "sort", "projection", "key")
+        shape = {k: query_shape(command[k]) for k in keys if k in command}
+        if "limit" in command:
+            shape["limit"] = command["limit"]
+        return shape
+    if name == "aggregate":
+        return {"pipeline": query_shape(command.get("pipeline", []))}
+    if name in ("update", "delete", "findAndModify"):
+        ops = command.get("updates") or command.get("deletes") or [command]
+        return {"filter": query_shape(ops[0].get("q", ops[0].get("query", {})))}
+    if name == "getMore":
+        return {"cursor": "?"}
+    return {}
+
+
+def plan_stages(explain_output: Any) -> List[str]:
+    """Every plan stage named anywhere in an explain() result, outermost first."""
+    stages: List[str] = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            if isinstance(node.get("stage"), str):
+                stages.append(node["stage"])
+            for key, item in node.items():
+                if key not in ("rejectedPlans", "allPlansExecution"):
+                    walk(item)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(explain_output)
+    return stages
+
+
+class SlowQuery(BaseModel):
+    command: str
+    database: str
+    collection: Optional[str] = None
+    duration_ms: float
+    failed: bool = False
+    shape: Dict[str, Any] = Field(default_factory=dict)
+    occurred_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Filled in when explain() was sampled for this query
+    plan_stages: Optional[List[str]] = None
+    collscan: Optional[bool] = None
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    """
+    Times every command and keeps the slowest ones (at or above threshold)
+    in a bounded ring buffer, storing only the query shape, never values.
+
+    With explain_rate > 0 a fraction of slow reads are re-run through
+    explain("queryPlanner") on the event loop to flag collection scans.
+    Callbacks run on driver threads, so they only record and hand off.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 100,
+        max_entries: int = 200,
+        explain_rate: float = 0.0,
+        max_pending_explains: int = 2,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_rate = explain_rate
+        self.max_pending_explains = max_pending_explains
+        self._entries: deque = deque(maxlen=max_entries)
+        self._inflight: Dict[tuple, tuple] = {}
+        self._explaining = 0
+        self._lock = threading.Lock()
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def configure(
+        self,
+        threshold_ms: float,
+        max_entries: int,
+        explain_rate: float,
+    ):
+        self.threshold_ms = float(threshold_ms)
+        self.explain_rate = float(explain_rate)
+        self._entries = deque(self._entries, maxlen=int(max_entries))
+
+    def attach(self, client, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Give the listener a client and loop to run sampled explains on."""
+        self._client = client
+        self._loop = loop or asyncio.get_running_loop()
+
+    def entries(self) -> List[SlowQuery]:
+        """Recorded slow queries, newest first."""
+        return list(reversed(self._entries))
+
+    def started(self, event):
+        name = event.command_name
+        if name in IGNORED_COMMANDS:
+            return
+        collection = event.command.get(name)
+        self._inflight[(event.connection_id, event.request_id)] = (
+            event.database_name,
+            collection if isinstance(collection, str) else None,
+            event.command,
+        )
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool):
+        started = self._inflight.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        database, collection, command = started
+        name = event.command_name
+        seconds = event.duration_micros / 1_000_000
+        labels = {"command": name, "collection": collection or ""}
+        command_duration.observe(seconds, **labels)
+
+        if seconds * 1000 < self.threshold_ms:
+            return
+        slow_commands.inc(**labels)
+        entry = SlowQuery(
+            command=name,
+            database=database,
+            collection=collection,
+            duration_ms=round(seconds * 1000, 3),
+            failed=failed,
+            shape=_command_shape(name, command),
+        )
+        self._entries.append(entry)
+        logger.warning(
+            "Slow MongoDB %s on %s: %.1f ms %s",
+            name,
+            collection,
+            entry.duration_ms,
+            entry.shape,
+        )
+        if not failed and name in EXPLAINABLE and self._should_explain():
+            self._schedule_explain(entry, command)
+
+    def _should_explain(self) -> bool:
+        if not self.explain_rate or self._client is None or self._loop is None:
+            return False
+        if random.random() >= self.explain_rate:
+            return False
+        with self._lock:
+            if self._explaining >= self.max_pending_explains:
+                return False
+            self._explaining += 1
+        return True
+
+    def _schedule_explain(self, entry: SlowQuery, command: dict):
+        explainable = {
+            key: value
+            for key, value in command.items()
+            if not key.startswith("$") and key not in _NOT_EXPLAINABLE_FIELDS
+        }
+        try:
+            asyncio.run_coroutine_threadsafe(
+                self._explain(entry, explainable), self._loop
+            )
+        except RuntimeError:
+            # Loop already closed (shutdown)
+            with self._lock:
+                self._explaining -= 1
+
+    async def _explain(self, entry: SlowQuery, command: dict):
+        try:
+            output = await self._client[entry.database].command(
+                {"explain": command, "verbosity": "queryPlanner"}
+            )
+            entry.plan_stages = plan_stages(output)
+            entry.collscan = "COLLSCAN" in entry.plan_stages
+            if entry.collscan:
+                collscans.inc(collection=entry.collection or "")
+                logger.warning(
+                    "Collection scan on %s for %s", entry.collection, entry.shape
+                )
+        except Exception as e:
+            logger.debug("explain() for slow %s failed: %s", entry.command, e)
+        finally:
+            with self._lock:
+                self._explaining -= 1
+
+
+slow_query_listener = SlowQueryListener()
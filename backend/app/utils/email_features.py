@@ -0,0 +1,94 @@
+# backend/app/utils/email_features.py
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from typing import FrozenSet, List, Optional
+
+from app.utils.body_normalizer import normalized_text
+from app.utils.forwarded import ForwardedChain, parse_forwarded_chain
+
+_TOKEN = re.compile(r"\w+")
+
+
+def content_signature(sender: str, subject: str, body: str) -> str:
+    """Exact-duplicate signature of an email's sender, subject and body."""
+    return hashlib.sha256((sender + subject + body).encode("utf-8")).hexdigest()
+
+
+def token_hash(token: str) -> int:
+    """A 64-bit hash of token that is the same in every process and run."""
+    return int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    )
+
+
+def _present(value: Optional[str]) -> Optional[str]:
+    value = value.strip() if value else ""
+    return value or None
+
+
+@dataclass(frozen=True)
+class EmailFeatures:
+    """
+    Everything the processing stages derive from one email's text, computed
+    once at ingestion and handed from stage to stage.
+
+    sender and subject are the values a task shows: the forwarded message's
+    when the body is a forward, otherwise the email's own, stripped (None
+    when blank). text is the lowercased subject and normalized body that
+    the keyword checks scan; raw_text is the same over the raw body, which
+    the spam check scans as well so quoting cannot hide a payload.
+    content_hash is the content_signature of the email as it was received,
+    before any forward rewrite, which is what stored signatures cover.
+    """
+
+    sender: Optional[str]
+    subject: Optional[str]
+    normalized_body: str
+    text: str
+    raw_text: str
+    forwarded: ForwardedChain
+    body_length: int
+    normalized_length: int
+    content_hash: str
+
+    # Tokens are only needed by token-based consumers, so they are split
+    # on first use (and then kept) rather than for every email
+    @cached_property
+    def tokens(self) -> List[str]:
+        return _TOKEN.findall(self.text)
+
+    @cached_property
+    def token_hashes(self) -> FrozenSet[int]:
+        # Stable across workers and restarts, unlike the salted hash()
+        return frozenset(token_hash(token) for token in self.tokens)
+
+
+def build_email_features(
+    email,
+    forwarded: Optional[ForwardedChain] = None,
+    content_hash: Optional[str] = None,
+) -> EmailFeatures:
+    """
+    The features of email (an EmailMessage or EmailMessageBase). Uses the
+    stored normalized_body when present, forwarded when the caller has
+    already parsed the body's forward chain, and content_hash when the
+    caller signed the email before rewriting it.
+    """
+    if forwarded is None:
+        forwarded = parse_forwarded_chain(email.body)
+    normalized = normalized_text(email)
+    return EmailFeatures(
+        sender=_present(forwarded.sender) or _present(email.sender),
+        subject=_present(forwarded.subject) or _present(email.subject),
+        normalized_body=normalized,
+        text=f"{email.subject} {normalized}".lower(),
+        raw_text=f"{email.subject} {email.body}".lower(),
+        forwarded=forwarded,
+        body_length=len(email.body),
+        normalized_length=len(normalized),
+        content_hash=content_hash
+        or content_signature(email.sender, email.subject, email.body),
+    )
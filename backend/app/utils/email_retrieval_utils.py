@@ -1,6 +1,9 @@
-from mailslurp_client import Configuration, InboxControllerApi, EmailControllerApi
+import logging
+
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 def get_inbox_id_from_email_address(email_address: str) -> str:
     """
@@ -8,6 +11,8 @@ def get_inbox_id_from_email_address(email_address: str) -> str:
     """
     if not email_address:
         return ""
+    from mailslurp_client import InboxControllerApi
+
     # Example: user1@example.com -> user1
     return InboxControllerApi.get_inbox_id_from_email_address(email_address)
 
@@ -19,6 +24,8 @@ def get_emails_from_inbox(inbox_id: str) -> list:
     if not inbox_id:
         return []
     # Example: Fetch emails from the specified inbox
+    from mailslurp_client import Configuration, InboxControllerApi
+
     config = Configuration()
     api_instance = InboxControllerApi(config)
     try:
@@ -26,7 +33,7 @@ def get_emails_from_inbox(inbox_id: str) -> list:
         result = thread.get()
         return result
     except Exception as e:
-        print(f"Error fetching emails: {e}")
+        logger.error("Error fetching emails: %s", e)
         return []
 
 
@@ -37,6 +44,8 @@ def get_emails_from_email_address(email_address: str) -> list:
     if not email_address:
         return []
     # Example: Fetch emails from the specified email address
+    from mailslurp_client import Configuration, InboxControllerApi
+
     config = Configuration()
     api_instance = InboxControllerApi(config)
     try:
@@ -44,5 +53,5 @@ def get_emails_from_email_address(email_address: str) -> list:
         result = thread.get()
         return result
     except Exception as e:
-        print(f"Error fetching emails: {e}")
+        logger.error("Error fetching emails: %s", e)
         return []
@@ -1,6 +1,6 @@
 import re
-from mailslurp_client import Configuration, InboxControllerApi, EmailControllerApi
 from app.config import get_settings
+from app.utils.forwarded import parse_forwarded_chain
 
 
 def is_generic_subject(subject: str) -> bool:
@@ -42,55 +42,19 @@ def parse_forwarded_metadata(body: str):
     """
     Parses forwarded email content to extract the original sender and subject.
     Returns (original_sender, original_subject) or (None, None) if not found.
-    Handles common 'From:' and 'Subject:' patterns in the body.
+    Taken from the first forwarded message; see parse_forwarded_chain.
     """
-    if not body:
-        return None, None
-    # Regex for common forwarded email headers (match up to end of line)
-    from_pattern = re.compile(r"^From:\s*(.*)$", re.MULTILINE)
-    subject_pattern = re.compile(r"^Subject:\s*(.*)$", re.MULTILINE)
-    # Find all matches
-    from_matches = from_pattern.findall(body)
-    subject_matches = subject_pattern.findall(body)
-
-    # Use the first non-empty, non-header match if available
-    def valid_value(val):
-        val = val.strip()
-        return val and not val.startswith("Subject:") and not val.startswith("From:")
-
-    original_sender = (
-        from_matches[0].strip()
-        if from_matches and valid_value(from_matches[0])
-        else None
-    )
-    original_subject = (
-        subject_matches[0].strip()
-        if subject_matches and valid_value(subject_matches[0])
-        else None
-    )
-    return original_sender, original_subject
+    chain = parse_forwarded_chain(body)
+    return chain.sender, chain.subject
 
 
 def parse_forwarded_body(body: str):
     """
-    Parses the body of a forwarded email to extract the original content.
-    This function is a placeholder and should be implemented based on specific needs.
+    Parses the body of a forwarded email to extract the original content:
+    the text after the first forwarded header block, or the whole body
+    when it contains no forward.
     """
     if not body:
         return ""
-    # Example: Remove common forward indicators
-    body = re.sub(r"^-----Original Message-----.*", "", body, flags=re.DOTALL)
-    body = re.sub(r"^From:.*", "", body, flags=re.DOTALL)
-    body = re.sub(r"^Sent:.*", "", body, flags=re.DOTALL)
-    body = re.sub(r"^To:.*", "", body, flags=re.DOTALL)
-    body = re.sub(r"^Subject:.*", "", body, flags=re.DOTALL)
-    body = re.sub(r"^---.*", "", body, flags=re.DOTALL)
-    body = re.sub(r"^On.*wrote:", "", body, flags=re.DOTALL)
-    body = re.sub(r"^-----.*", "", body, flags=re.DOTALL)
-    body = re.sub(r"^>.*", "", body, flags=re.DOTALL)
-    body = re.sub(r"\n{2,}", "\n", body)  # Remove excessive newlines
-    body = body.strip()  # Clean up leading/trailing whitespace
-    # Return the cleaned body
-
-    return body
-
+    chain = parse_forwarded_chain(body)
+    return chain.content if chain.is_forward else body.strip()
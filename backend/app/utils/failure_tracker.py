@@ -0,0 +1,207 @@
+# backend/app/utils/failure_tracker.py
+
+import asyncio
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+
+class FailureTracker(ABC):
+    """
+    Counts failures per key (e.g. client IP) over a sliding window.
+    The window is split into fixed buckets, so counts are accurate to one
+    bucket width and memory per key does not grow with the failure rate.
+    """
+
+    def __init__(self, window_seconds: float, buckets: int = 10):
+        if buckets < 1:
+            raise ValueError("buckets must be at least 1")
+        self.window_seconds = float(window_seconds)
+        self.buckets = buckets
+        self.bucket_width = self.window_seconds / buckets
+
+    def _bucket(self, now: float) -> int:
+        return int(now // self.bucket_width)
+
+    @abstractmethod
+    def record(self, key: str, now: Optional[float] = None) -> int:
+        """Record one failure for key and return the count inside the window."""
+
+    @abstractmethod
+    def count(self, key: str, now: Optional[float] = None) -> int:
+        """Failures for key inside the window, without recording one."""
+
+    @abstractmethod
+    def reset(self, key: str):
+        """Forget every failure recorded for key."""
+
+    async def record_async(self, key: str) -> int:
+        """
+        record() for callers on the event loop. Trackers that do blocking
+        I/O override this to keep it off the loop.
+        """
+        return self.record(key)
+
+
+class _KeyWindow:
+    __slots__ = ("epochs", "counts", "last_bucket")
+
+    def __init__(self, buckets: int):
+        self.epochs: List[int] = [-1] * buckets
+        self.counts: List[int] = [0] * buckets
+        self.last_bucket = -1
+
+
+class InMemoryFailureTracker(FailureTracker):
+    """
+    Per-process tracker: a ring of bucket counters per key, with keys kept
+    in LRU order and the least recently failing ones evicted beyond
+    max_keys. It takes no lock, so call it only from the event loop thread.
+    """
+
+    def __init__(self, window_seconds: float, buckets: int = 10, max_keys: int = 10000):
+        super().__init__(window_seconds, buckets)
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[str, _KeyWindow]" = OrderedDict()
+
+    def record(self, key: str, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        bucket = self._bucket(now)
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _KeyWindow(self.buckets)
+        else:
+            self._windows.move_to_end(key)
+
+        slot = bucket % self.buckets
+        if window.epochs[slot] != bucket:
+            window.epochs[slot] = bucket
+            window.counts[slot] = 0
+        window.counts[slot] += 1
+        window.last_bucket = bucket
+
+        self._evict(bucket)
+        return self._sum(window, bucket)
+
+    def count(self, key: str, now: Optional[float] = None) -> int:
+        window = self._windows.get(key)
+        if window is None:
+            return 0
+        return self._sum(window, self._bucket(time.time() if now is None else now))
+
+    def reset(self, key: str):
+        self._windows.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def _sum(self, window: _KeyWindow, bucket: int) -> int:
+        return sum(
+            count
+            for epoch, count in zip(window.epochs, window.counts)
+            if bucket - epoch < self.buckets
+        )
+
+    def _evict(self, bucket: int):
+        # Oldest keys sit at the front: drop them once idle for a full window,
+        # and unconditionally while over capacity.
+        while self._windows:
+            key, window = next(iter(self._windows.items()))
+            idle = bucket - window.last_bucket >= self.buckets
+            if not idle and len(self._windows) <= self.max_keys:
+                break
+            self._windows.popitem(last=False)
+
+
+class SQLiteFailureTracker(FailureTracker):
+    """
+    Tracker backed by a local SQLite file, so every worker process on the
+    host sees the same counts. Each call is a short transaction on one
+    (key, bucket) row plus a range read. Transactions can wait on another
+    worker's lock, so record_async runs them on a dedicated thread. The
+    synchronous methods submit to the same thread and wait, so it is the
+    only one that ever touches the connection.
+    """
+
+    def __init__(self, path: str, window_seconds: float, buckets: int = 10):
+        super().__init__(window_seconds, buckets)
+        self.path = path
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="failure-tracker"
+        )
+        self._conn = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS failure_buckets ("
+            "key TEXT NOT NULL, bucket INTEGER NOT NULL, count INTEGER NOT NULL,"
+            " PRIMARY KEY (key, bucket))"
+        )
+        # For the expiry DELETE, which spans every key
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS failure_buckets_bucket"
+            " ON failure_buckets (bucket)"
+        )
+
+    async def record_async(self, key: str) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._record, key)
+
+    def record(self, key: str, now: Optional[float] = None) -> int:
+        return self._executor.submit(self._record, key, now).result()
+
+    def count(self, key: str, now: Optional[float] = None) -> int:
+        return self._executor.submit(self._count, key, now).result()
+
+    def reset(self, key: str):
+        self._executor.submit(self._reset, key).result()
+
+    def _record(self, key: str, now: Optional[float] = None) -> int:
+        bucket = self._bucket(time.time() if now is None else now)
+        oldest = bucket - self.buckets + 1
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "INSERT INTO failure_buckets (key, bucket, count) VALUES (?, ?, 1)"
+                " ON CONFLICT (key, bucket) DO UPDATE SET count = count + 1",
+                (key, bucket),
+            )
+            # Expired buckets for every key go too, so idle keys do not pile up
+            self._conn.execute(
+                "DELETE FROM failure_buckets WHERE bucket < ?", (oldest,)
+            )
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM failure_buckets"
+                " WHERE key = ? AND bucket >= ?",
+                (key, oldest),
+            ).fetchone()
+        return row[0]
+
+    def _count(self, key: str, now: Optional[float] = None) -> int:
+        bucket = self._bucket(time.time() if now is None else now)
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM failure_buckets"
+            " WHERE key = ? AND bucket >= ?",
+            (key, bucket - self.buckets + 1),
+        ).fetchone()
+        return row[0]
+
+    def _reset(self, key: str):
+        self._conn.execute("DELETE FROM failure_buckets WHERE key = ?", (key,))
+
+
+def create_failure_tracker(
+    backend: str, window_seconds: float, path: Optional[str] = None
+) -> FailureTracker:
+    """Build the tracker named by backend ("memory" or "sqlite")."""
+    if backend == "memory":
+        return InMemoryFailureTracker(window_seconds)
+    if backend == "sqlite":
+        if not path:
+            raise ValueError("The sqlite failure tracker needs a database path")
+        return SQLiteFailureTracker(path, window_seconds)
+    raise ValueError(f"Unknown failure tracker backend: {backend}")
@@ -0,0 +1,181 @@
+# backend/app/utils/forwarded.py
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+# Header names recognised in a forwarded block, mapped to message fields
+_HEADER_FIELDS = {
+    "from": "sender",
+    "subject": "subject",
+    "date": "date",
+    "sent": "date",
+    "to": "to",
+    "cc": None,
+}
+# Longest header name plus room for spaces before the colon
+_HEADER_NAME_WINDOW = 12
+# Marker lines that open a forwarded block in common mail clients
+_SEPARATORS = ("forwarded message", "original message")
+
+
+class ForwardedMessage(BaseModel):
+    """One hop of a forward: the headers quoted for it and its own text."""
+
+    sender: Optional[str] = None
+    subject: Optional[str] = None
+    date: Optional[str] = None
+    to: Optional[str] = None
+    body: str = ""
+
+
+class ForwardedChain(BaseModel):
+    """
+    A body split into the forwarder's own text (preamble) and the forwarded
+    messages, outermost first: messages[0] is the message that was
+    forwarded, and each later entry was forwarded inside the one before it.
+    """
+
+    preamble: str = ""
+    messages: List[ForwardedMessage] = Field(default_factory=list)
+    # Everything after the first forwarded header block, nested forwards
+    # included: the forwarded message as its author wrote it
+    content: str = ""
+
+    @property
+    def is_forward(self) -> bool:
+        return bool(self.messages)
+
+    @property
+    def sender(self) -> Optional[str]:
+        return self.messages[0].sender if self.messages else None
+
+    @property
+    def subject(self) -> Optional[str]:
+        return self.messages[0].subject if self.messages else None
+
+
+def _probe(line: str) -> str:
+    """A line with indentation and ">" quoting removed, for marker checks."""
+    return line.strip().lstrip(">").strip()
+
+
+def _is_separator(probe: str) -> bool:
+    if not probe:
+        return False
+    if probe[0] in "-_":
+        lowered = probe.lower()
+        return any(marker in lowered for marker in _SEPARATORS)
+    return probe[:23].lower() == "begin forwarded message"
+
+
+def _header(probe: str):
+    """(name, value) if the line is a recognised header, else None."""
+    colon = probe.find(":", 0, _HEADER_NAME_WINDOW)
+    if colon <= 0:
+        return None
+    name = probe[:colon].strip().lower()
+    if name not in _HEADER_FIELDS:
+        return None
+    return name, probe[colon + 1 :].strip()
+
+
+def _is_quoted(line: str) -> bool:
+    return line.lstrip().startswith(">")
+
+
+def _opens_header_block(lines: List[str], index: int) -> bool:
+    """
+    Whether the "From:" line at index is followed by a Sent, Date or
+    Subject header in the same block, as in a quoted forward. Only the
+    header lines directly after it are looked at.
+    """
+    for line in lines[index + 1 : index + len(_HEADER_FIELDS)]:
+        header = _header(_probe(line))
+        if header is None:
+            return False
+        if header[0] in ("sent", "date", "subject"):
+            return True
+    return False
+
+
+def parse_forwarded_chain(body: Optional[str]) -> ForwardedChain:
+    """
+    Split a body into its chain of forwarded messages in one pass over its
+    lines, so the cost is linear in the body size.
+
+    A hop starts at a separator line ("---------- Forwarded message
+    ---------", "-----Original Message-----", "Begin forwarded message:")
+    or at a "From:" line; the header lines directly after it (From, Sent,
+    Date, To, Cc, Subject) fill in the hop, and the text up to the next hop
+    is its body. A second "From:" in the same header block starts a new
+    hop. Indented and ">"-quoted headers are recognised too, but a quoted
+    "From:" only starts a hop after a separator or when a Sent, Date or
+    Subject header follows it, so a reply quoting "> From: ..." prose is
+    not taken for a forward.
+    """
+    if not body:
+        return ForwardedChain()
+
+    lines = body.splitlines()
+    preamble: List[str] = []
+    messages: List[ForwardedMessage] = []
+    bodies: List[List[str]] = []
+    seen: set = set()
+    in_headers = False
+    content_start = None
+
+    for index, line in enumerate(lines):
+        probe = _probe(line)
+
+        if _is_separator(probe):
+            messages.append(ForwardedMessage())
+            bodies.append([])
+            seen = set()
+            in_headers = True
+            if len(messages) == 1:
+                content_start = index + 1
+            continue
+
+        header = _header(probe)
+        if header is not None:
+            name, value = header
+            if name == "from" and (not in_headers or "from" in seen):
+                if not _is_quoted(line) or _opens_header_block(lines, index):
+                    messages.append(ForwardedMessage())
+                    bodies.append([])
+                    seen = set()
+                    in_headers = True
+                else:
+                    in_headers = False
+            if in_headers:
+                field = _HEADER_FIELDS[name]
+                if name not in seen and field and value:
+                    setattr(messages[-1], field, value)
+                seen.add(name)
+                if len(messages) == 1:
+                    content_start = index + 1
+                continue
+
+        if in_headers:
+            # Blank lines between a separator and its headers, or the one
+            # ending the header block, belong to neither part
+            if not probe:
+                in_headers = not seen
+                continue
+            in_headers = False
+
+        (bodies[-1] if messages else preamble).append(line)
+
+    for message, message_lines in zip(messages, bodies):
+        message.body = "\n".join(message_lines).strip()
+
+    return ForwardedChain(
+        preamble="\n".join(preamble).strip(),
+        messages=messages,
+        content=(
+            "\n".join(lines[content_start:]).strip()
+            if content_start is not None
+            else ""
+        ),
+    )
@@ -0,0 +1,164 @@
+# backend/app/utils/html_text.py
+
+import os
+from email.message import Message
+from html.parser import HTMLParser
+from typing import List, Optional
+
+# Longest text kept from one HTML body; the rest of the markup is not parsed
+HTML_TEXT_MAX_CHARS = int(os.getenv("HTML_TEXT_MAX_CHARS", 100000))
+
+# Elements whose content is never visible text
+_SKIPPED = {"script", "style", "head", "title", "noscript", "template", "svg"}
+# Elements that start a new paragraph, or just a new line
+_PARAGRAPHS = {
+    "p",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "blockquote",
+    "ul",
+    "ol",
+    "table",
+    "pre",
+    "hr",
+}
+_LINES = {"br", "div", "li", "tr", "section", "article", "header", "footer"}
+
+_FEED_CHUNK = 64 * 1024
+
+
+class HTMLTextExtractor(HTMLParser):
+    """
+    Streaming HTML to plain text: feed() markup in chunks and read text().
+
+    Script, style and other invisible elements are dropped, whitespace is
+    collapsed to single spaces, block elements become line breaks (at most
+    one blank line in a row), and entities are decoded. Output stops at
+    max_chars; after that, further markup is ignored, so callers can stop
+    feeding once done is set.
+    """
+
+    def __init__(self, max_chars: int = HTML_TEXT_MAX_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self._parts: List[str] = []
+        self._length = 0
+        self._skip_depth = 0
+        self._pending_breaks = 0
+        self._space = False
+        self._line_started = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED:
+            self._skip_depth += 1
+        else:
+            self._block(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        # Void or self-closing: <br/>, <hr/>, <img/>
+        if tag not in _SKIPPED:
+            self._block(tag)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        else:
+            self._block(tag)
+
+    def _block(self, tag: str):
+        if tag in _PARAGRAPHS:
+            self._pending_breaks = 2
+        elif tag in _LINES:
+            self._pending_breaks = max(self._pending_breaks, 1)
+
+    def handle_data(self, data):
+        if self._skip_depth or self.done:
+            return
+        words = data.split()
+        if not words:
+            self._space = self._space or bool(data)
+            return
+        if data[0].isspace():
+            self._space = True
+        self._write(" ".join(words))
+        self._space = data[-1].isspace()
+
+    def _write(self, text: str):
+        if self._pending_breaks and self._length:
+            prefix = "\n" * self._pending_breaks
+        elif self._space and self._line_started:
+            prefix = " "
+        else:
+            prefix = ""
+        self._pending_breaks = 0
+        chunk = prefix + text
+        room = self.max_chars - self._length
+        if len(chunk) >= room:
+            chunk = chunk[:room]
+            self.done = True
+        self._parts.append(chunk)
+        self._length += len(chunk)
+        self._line_started = True
+
+    def text(self) -> str:
+        return "".join(self._parts).strip()
+
+
+def html_to_text(html: Optional[str], max_chars: int = HTML_TEXT_MAX_CHARS) -> str:
+    """Plain text of an HTML document, capped at max_chars."""
+    if not html:
+        return ""
+    parser = HTMLTextExtractor(max_chars=max_chars)
+    for start in range(0, len(html), _FEED_CHUNK):
+        parser.feed(html[start : start + _FEED_CHUNK])
+        if parser.done:
+            break
+    else:
+        parser.close()
+    return parser.text()
+
+
+def looks_like_html(body: Optional[str]) -> bool:
+    """Cheap check for markup bodies: a tag at the start and a closing tag."""
+    if not body:
+        return False
+    head = body[:1024].lstrip()
+    return head.startswith("<") and "</" in body[:65536]
+
+
+def _part_text(part: Message) -> Optional[str]:
+    payload = part.get_payload(decode=True)
+    if payload is None:
+        return None
+    charset = part.get_content_charset() or "utf-8"
+    try:
+        return payload.decode(charset, errors="replace")
+    except LookupError:
+        # Unknown charset name in the header
+        return payload.decode("utf-8", errors="replace")
+
+
+def message_text(msg: Message) -> str:
+    """
+    The text body of a parsed email: the first text/plain part that is not
+    an attachment, else the first text/html part converted to text, else "".
+    """
+    html = None
+    for part in msg.walk():
+        if part.is_multipart():
+            continue
+        if "attachment" in part.get("Content-Disposition", ""):
+            continue
+        content_type = part.get_content_type()
+        if content_type == "text/plain":
+            text = _part_text(part)
+            if text is not None:
+                return text
+        elif content_type == "text/html" and html is None:
+            html = _part_text(part)
+    return html_to_text(html) if html else ""
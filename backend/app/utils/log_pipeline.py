@@ -0,0 +1,179 @@
+# backend/app/utils/log_pipeline.py
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.utils.metrics import metrics
+
+log_records_dropped = metrics.counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full",
+)
+log_records_sampled_out = metrics.counter(
+    "log_records_sampled_out_total",
+    "High-volume log records skipped by sampling, by event",
+)
+log_queue_backlog = metrics.gauge(
+    "log_queue_backlog",
+    "Log records waiting to be written",
+)
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including fields passed via `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of high-volume records, chosen by their `event` extra.
+    Only successful and attempted events are sampled; failures always pass.
+    """
+
+    KEEP_STATUSES = ("failure", "error")
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        rate = self.rates.get(event) if event else None
+        if rate is None or getattr(record, "status", None) in self.KEEP_STATUSES:
+            return True
+        if random.random() < rate:
+            return True
+        log_records_sampled_out.inc(event=event)
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue without waiting. When the writer falls
+    behind, new records are dropped and counted instead of stalling the
+    event loop. Records that pass the filters have their message merged
+    with its args here, as the stdlib QueueHandler does; output formatting
+    (JSON or text) is left to the listener thread.
+    """
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+        log_queue_backlog.set(self.queue.qsize())
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only records that passed the level and sampling filters get here.
+        # Merge args now: mutable args may change before the writer runs,
+        # and tracebacks are rendered now as frames do not outlive the request.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+            record.exc_info = None
+        return record
+
+
+class _BacklogHandler(logging.Handler):
+    """Writer-side wrapper that keeps the backlog gauge current."""
+
+    def __init__(self, target: logging.Handler, log_queue: queue.Queue):
+        super().__init__()
+        self.target = target
+        self.log_queue = log_queue
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        log_queue_backlog.set(self.log_queue.qsize())
+        return self.target.handle(record)
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "event=rate,event=rate" (e.g. "webhook_access=0.1")."""
+    rates = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        event, _, rate = part.partition("=")
+        rates[event.strip()] = float(rate)
+    return rates
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_format: str = "json",
+    queue_size: int = 10000,
+    sample_rates: Optional[Dict[str, float]] = None,
+) -> QueueListener:
+    """
+    Route all logging through a bounded queue drained by a background
+    thread, so request handlers never block on stream writes. Safe to call
+    more than once; the previous listener is stopped first.
+    """
+    global _listener
+    shutdown_logging()
+
+    stream_handler = logging.StreamHandler()
+    if log_format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        )
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, _BacklogHandler(stream_handler, log_queue))
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
@@ -3,28 +3,30 @@
 import logging
 from datetime import datetime
 from typing import Optional
-from collections import defaultdict
-from threading import Lock
-import time
 import os
 
+from app.utils.failure_tracker import FailureTracker, create_failure_tracker
+
 logger = logging.getLogger("security")
 
-# Configure security logger if not already configured
-if not logger.hasHandlers():
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
+# Security events propagate to the root handlers (see app.utils.log_pipeline)
+logger.setLevel(logging.INFO)
 
 ALERT_FAILURE_THRESHOLD = int(os.getenv("SECURITY_ALERT_FAILURE_THRESHOLD", 5))
 ALERT_WINDOW_SECONDS = int(
     os.getenv("SECURITY_ALERT_WINDOW_SECONDS", 600)
 )  # 10 min default
 
-_failed_attempts = defaultdict(list)  # ip -> [timestamps]
-_failed_attempts_lock = Lock()
+# "memory" tracks failures per worker; "sqlite" shares counts between the
+# workers on one host through SECURITY_FAILURE_TRACKER_PATH
+FAILURE_TRACKER_BACKEND = os.getenv("SECURITY_FAILURE_TRACKER_BACKEND", "memory")
+FAILURE_TRACKER_PATH = os.getenv(
+    "SECURITY_FAILURE_TRACKER_PATH", "/tmp/email_assistant_failures.db"
+)
+
+_failed_attempts: FailureTracker = create_failure_tracker(
+    FAILURE_TRACKER_BACKEND, ALERT_WINDOW_SECONDS, FAILURE_TRACKER_PATH
+)
 
 
 def alert_suspicious_activity(ip_address: str, reason: str):
@@ -32,23 +34,20 @@ def alert_suspicious_activity(ip_address: str, reason: str):
     Send an alert for suspicious activity (e.g., repeated failures from the same IP).
     For demo: log at WARNING level. In production, send email, webhook, etc.
     """
-    logger.warning(f"ALERT: Suspicious activity from IP {ip_address}: {reason}")
+    logger.warning(
+        "ALERT: Suspicious activity from IP %s: %s",
+        ip_address,
+        reason,
+        extra={"event": "suspicious_activity", "status": "failure", "ip": ip_address},
+    )
 
 
-def track_and_alert_failed_attempt(ip_address: str, reason: str):
+async def track_and_alert_failed_attempt(ip_address: str, reason: str):
     """
     Track failed attempts and alert if threshold is exceeded.
     """
-    now = time.time()
-    with _failed_attempts_lock:
-        attempts = _failed_attempts[ip_address]
-        attempts.append(now)
-        # Remove old attempts
-        _failed_attempts[ip_address] = [
-            t for t in attempts if now - t < ALERT_WINDOW_SECONDS
-        ]
-        if len(_failed_attempts[ip_address]) >= ALERT_FAILURE_THRESHOLD:
-            alert_suspicious_activity(ip_address, reason)
+    if await _failed_attempts.record_async(ip_address) >= ALERT_FAILURE_THRESHOLD:
+        alert_suspicious_activity(ip_address, reason)
 
 
 def log_security_event(
@@ -66,11 +65,16 @@ def log_security_event(
     :param user: Optional user identifier
     :param details: Optional additional details (avoid sensitive data)
     """
-    log_msg = f"event={event} status={status}"
-    if ip_address:
-        log_msg += f" ip={ip_address}"
-    if user:
-        log_msg += f" user={user}"
-    if details:
-        log_msg += f" details={details}"
-    logger.info(log_msg)
+    # Lazy %-formatting: the message is only built if the record is written.
+    # The fields are also attached as structured data for the JSON output.
+    fmt = "event=%s status=%s"
+    args = [event, status]
+    for name, value in (("ip", ip_address), ("user", user), ("details", details)):
+        if value:
+            fmt += f" {name}=%s"
+            args.append(value)
+    logger.info(
+        fmt,
+        *args,
+        extra={"event": event, "status": status, "ip": ip_address, "user": user},
+    )
@@ -0,0 +1,145 @@
+# backend/app/utils/loop_monitor.py
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+loop_lag = metrics.histogram(
+    "event_loop_lag_seconds",
+    "Delay between when a loop callback was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+loop_stalls = metrics.counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked for longer than the lag threshold",
+)
+
+MAX_STACK_FRAMES = 40
+
+
+class LoopStall(BaseModel):
+    # Lag seen when the stack was captured, then the full lag once the loop ran
+    lag_ms: float
+    stack: List[str] = Field(default_factory=list)
+    occurred_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+def _format_stack(frame) -> List[str]:
+    """Innermost-last "file:line in function" entries for a frame."""
+    return [
+        f"{entry.filename}:{entry.lineno} in {entry.name}"
+        for entry in traceback.extract_stack(frame, limit=MAX_STACK_FRAMES)
+    ]
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop scheduling delay and catches what blocks it.
+
+    A heartbeat task sleeps for interval seconds and records how late it
+    woke up. A watchdog thread checks the heartbeat: once it is overdue by
+    threshold_ms, the loop is stuck in synchronous code, so the watchdog
+    captures the loop thread's current stack (the offending call) while the
+    stall is still happening. The most recent stalls are kept for the admin
+    API.
+    """
+
+    def __init__(
+        self, interval_ms: float = 250, threshold_ms: float = 100, max_stalls: int = 50
+    ):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self._stalls: deque = deque(maxlen=max_stalls)
+        self._last_beat = 0.0
+        self._pending: Optional[LoopStall] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def configure(
+        self, interval_ms: float = None, threshold_ms: float = None, max_stalls=None
+    ):
+        if interval_ms is not None:
+            self.interval = float(interval_ms) / 1000
+        if threshold_ms is not None:
+            self.threshold = float(threshold_ms) / 1000
+        if max_stalls is not None:
+            self._stalls = deque(self._stalls, maxlen=int(max_stalls))
+
+    def start(self):
+        """Start monitoring the running loop; call from the loop thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._last_beat - self.interval)
+            loop_lag.observe(lag)
+            stall = self._pending
+            if stall is not None:
+                self._pending = None
+                stall.lag_ms = round(lag * 1000, 2)
+                logger.warning(
+                    "🐢 Event loop blocked for %.0f ms at %s",
+                    stall.lag_ms,
+                    stall.stack[-1] if stall.stack else "unknown",
+                )
+
+    def _watch(self):
+        beat_seen = None
+        while not self._stop.wait(max(self.threshold / 2, 0.005)):
+            beat = self._last_beat
+            overdue = time.monotonic() - beat - self.interval
+            # One capture per stall: the heartbeat resets _last_beat when it runs
+            if overdue < self.threshold or beat == beat_seen:
+                continue
+            beat_seen = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stall = LoopStall(
+                lag_ms=round(overdue * 1000, 2),
+                stack=_format_stack(frame) if frame is not None else [],
+            )
+            self._pending = stall
+            self._stalls.append(stall)
+            loop_stalls.inc()
+
+    def stalls(self) -> List[LoopStall]:
+        """Recent stalls, newest first."""
+        return list(reversed(self._stalls))
+
+
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,154 @@
+# backend/app/utils/memory_diagnostics.py
+
+import gc
+import os
+import threading
+import tracemalloc
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import List, Literal, Optional, Tuple
+
+from pydantic import BaseModel
+
+# tracemalloc snapshots are large; only the newest are kept
+MEMORY_MAX_SNAPSHOTS = int(os.getenv("MEMORY_MAX_SNAPSHOTS", 5))
+
+# Allocations made by the diagnostics machinery itself
+_IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<unknown>")
+
+
+class TracingStatus(BaseModel):
+    tracing: bool
+    frames: int
+    traced_bytes: int
+    peak_bytes: int
+
+
+class SnapshotInfo(BaseModel):
+    id: str
+    taken_at: datetime
+    traced_bytes: int
+
+
+class AllocationDiff(BaseModel):
+    # "file:line", or just the file when grouped by filename
+    location: str
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+
+class ObjectCount(BaseModel):
+    type: str
+    count: int
+
+
+class MemoryDiagnostics:
+    """
+    Admin-driven tracemalloc sessions. Tracing is off until started, since
+    it slows allocation-heavy code; snapshots taken while it runs can be
+    compared to find which lines hold on to more memory over time. Calls
+    may come from several threadpool workers at once, so the snapshot store
+    is guarded by a lock.
+    """
+
+    def __init__(self, max_snapshots: int = MEMORY_MAX_SNAPSHOTS):
+        self.max_snapshots = max_snapshots
+        # id -> (info, snapshot), oldest first
+        self._snapshots: "OrderedDict[str, Tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def status(self) -> TracingStatus:
+        traced, peak = tracemalloc.get_traced_memory()
+        return TracingStatus(
+            tracing=tracemalloc.is_tracing(),
+            frames=tracemalloc.get_traceback_limit(),
+            traced_bytes=traced,
+            peak_bytes=peak,
+        )
+
+    def start(self, frames: int = 1) -> TracingStatus:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        return self.status()
+
+    def stop(self) -> TracingStatus:
+        """Stop tracing; existing snapshots are dropped with the traces."""
+        with self._lock:
+            tracemalloc.stop()
+            self._snapshots.clear()
+        return self.status()
+
+    def take_snapshot(self) -> SnapshotInfo:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in _IGNORED_FILES]
+        )
+        info = SnapshotInfo(
+            id=uuid.uuid4().hex[:12],
+            taken_at=datetime.now(timezone.utc),
+            traced_bytes=sum(stat.size for stat in snapshot.statistics("filename")),
+        )
+        with self._lock:
+            self._snapshots[info.id] = (info, snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return info
+
+    def snapshots(self) -> List[SnapshotInfo]:
+        """Snapshots still held, oldest first."""
+        with self._lock:
+            return [info for info, _ in self._snapshots.values()]
+
+    def diff(
+        self,
+        from_id: str,
+        to_id: str,
+        group_by: Literal["lineno", "filename"] = "lineno",
+        limit: int = 20,
+    ) -> Optional[List[AllocationDiff]]:
+        """
+        Largest allocation growth from one snapshot to another, or None if
+        either snapshot is unknown.
+        """
+        with self._lock:
+            if from_id not in self._snapshots or to_id not in self._snapshots:
+                return None
+            old = self._snapshots[from_id][1]
+            new = self._snapshots[to_id][1]
+        return [
+            AllocationDiff(
+                location=(
+                    f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}"
+                    if group_by == "lineno"
+                    else stat.traceback[0].filename
+                ),
+                size_bytes=stat.size,
+                size_diff_bytes=stat.size_diff,
+                count=stat.count,
+                count_diff=stat.count_diff,
+            )
+            for stat in new.compare_to(old, group_by)[:limit]
+        ]
+
+    def object_counts(
+        self, module_prefix: str = "app.", limit: int = 50
+    ) -> List[ObjectCount]:
+        """Live instances of the app's own classes (models, services), most first."""
+        counts: Counter = Counter()
+        for obj in gc.get_objects():
+            cls = type(obj)
+            module = cls.__dict__.get("__module__")
+            # Some extension types expose __module__ as a descriptor
+            if isinstance(module, str) and module.startswith(module_prefix):
+                counts[f"{module}.{cls.__qualname__}"] += 1
+        return [
+            ObjectCount(type=name, count=count)
+            for name, count in counts.most_common(limit)
+        ]
+
+
+memory_diagnostics = MemoryDiagnostics()
@@ -0,0 +1,279 @@
+# backend/app/utils/metrics.py
+
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond to tens of seconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Metric:
+    """Base class for in-process metrics. Updates are safe from driver threads."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._lock = Lock()
+
+
+class Counter(Metric):
+    """Monotonically increasing count, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(Metric):
+    """Value that can go up and down, optionally split by labels."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str):
+        super().__init__(name, description)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, floor: Optional[float] = None, **labels):
+        """Decrease the value, never below floor when one is given."""
+        key = _label_key(labels)
+        with self._lock:
+            value = self._values.get(key, 0) - amount
+            if floor is not None:
+                value = max(value, floor)
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class HistogramSample:
+    __slots__ = ("bucket_counts", "count", "sum", "max")
+
+    def __init__(self, n_buckets: int):
+        self.bucket_counts = [0] * n_buckets
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def copy(self) -> "HistogramSample":
+        clone = HistogramSample(0)
+        clone.bucket_counts = list(self.bucket_counts)
+        clone.count, clone.sum, clone.max = self.count, self.sum, self.max
+        return clone
+
+
+class Histogram(Metric):
+    """
+    Fixed-bucket histogram. Observing a value is a bisect plus a few integer
+    increments, so it is cheap enough for per-request and per-stage timing.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, description: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, description)
+        self.buckets = tuple(sorted(buckets))
+        self._samples: Dict[LabelKey, HistogramSample] = {}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = self._samples[key] = HistogramSample(len(self.buckets) + 1)
+            sample.bucket_counts[index] += 1
+            sample.count += 1
+            sample.sum += value
+            if value > sample.max:
+                sample.max = value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of the with-block, awaits included."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def summary(self, **labels) -> Dict[str, float]:
+        """Count, sum, mean, max and bucket-estimated p50/p95/p99 for one label set."""
+        with self._lock:
+            sample = self._samples.get(_label_key(labels))
+            if sample is None or sample.count == 0:
+                return {"count": 0, "sum": 0.0, "mean": 0.0, "max": 0.0}
+            counts = list(sample.bucket_counts)
+            count, total, maximum = sample.count, sample.sum, sample.max
+        result = {
+            "count": count,
+            "sum": total,
+            "mean": total / count,
+            "max": maximum,
+        }
+        for quantile in (0.5, 0.95, 0.99):
+            result[f"p{int(quantile * 100)}"] = self._quantile(
+                counts, count, quantile, maximum
+            )
+        return result
+
+    def _quantile(self, counts, count, quantile, maximum) -> float:
+        target = quantile * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return self.buckets[index] if index < len(self.buckets) else maximum
+        return maximum
+
+    def samples(self) -> Dict[LabelKey, HistogramSample]:
+        """Consistent copies of every label set's sample."""
+        with self._lock:
+            return {key: sample.copy() for key, sample in self._samples.items()}
+
+
+class MetricsRegistry:
+    """Holds the process-wide metrics, keyed by name."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = Lock()
+
+    def _get_or_create(self, cls, name: str, description: str, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        kwargs = {"buckets": buckets} if buckets is not None else {}
+        return self._get_or_create(Histogram, name, description, **kwargs)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def all(self):
+        return list(self._metrics.values())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus(registry: Optional[MetricsRegistry] = None) -> str:
+    """Render every metric in the Prometheus text exposition format (0.0.4)."""
+    registry = registry or metrics
+    lines: List[str] = []
+    for metric in sorted(registry.all(), key=lambda m: m.name):
+        if metric.description:
+            lines.append(f"# HELP {metric.name} {_escape(metric.description)}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        if isinstance(metric, Histogram):
+            for key, sample in sorted(metric.samples().items()):
+                cumulative = 0
+                bounds = list(metric.buckets) + [math.inf]
+                for bound, bucket_count in zip(bounds, sample.bucket_counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(key, ("le", _format_value(bound)))
+                    lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(key)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(sample.sum)}")
+                lines.append(f"{metric.name}_count{labels} {sample.count}")
+        else:
+            for key, value in sorted(metric.samples().items()):
+                lines.append(
+                    f"{metric.name}{_format_labels(key)} {_format_value(value)}"
+                )
+    return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,127 @@
+# backend/app/utils/profiler.py
+
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+# Profiles kept for the admin endpoint; the oldest are dropped first
+PROFILER_MAX_PROFILES = int(os.getenv("PROFILER_MAX_PROFILES", 50))
+
+MAX_STACK_DEPTH = 128
+
+
+class ProfileSummary(BaseModel):
+    request_id: str
+    method: str
+    path: str
+    trigger: str
+    status_code: int
+    started_at: datetime
+    duration_seconds: float
+    samples: int
+
+
+class Profile(ProfileSummary):
+    interval_seconds: float
+    # Flame graph input: one "outer;...;inner count" line per distinct stack
+    collapsed: str
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    parts = code.co_filename.replace("\\", "/").rsplit("/", 2)
+    return f"{code.co_name} ({'/'.join(parts[-2:])}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's Python stack from a background thread at a fixed
+    interval and aggregates the stacks into collapsed (flame graph) form.
+
+    The profiled thread is not instrumented, so overhead is limited to the
+    sampler waking up. Under asyncio every task shares the loop thread:
+    samples show whatever the loop was running, and time the request spent
+    awaiting I/O appears as the loop's select() call.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.005,
+        max_seconds: float = 30.0,
+        thread_id: Optional[int] = None,
+    ):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame)
+            if time.monotonic() > deadline:
+                return
+
+    def _record(self, frame):
+        labels: List[str] = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(
+            f"{stack} {count}" for stack, count in self.stacks.most_common()
+        )
+
+
+class ProfileStore:
+    """Most recent profiles keyed by request id, bounded to max_profiles."""
+
+    def __init__(self, max_profiles: int = PROFILER_MAX_PROFILES):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+
+    def add(self, profile: Profile):
+        self._profiles[profile.request_id] = profile
+        self._profiles.move_to_end(profile.request_id)
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Profile]:
+        return self._profiles.get(request_id)
+
+    def list(self) -> List[ProfileSummary]:
+        """Newest first, without the stack data."""
+        return [
+            ProfileSummary(**p.model_dump(exclude={"interval_seconds", "collapsed"}))
+            for p in reversed(self._profiles.values())
+        ]
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,162 @@
+# backend/scripts/fake_openai.py
+
+"""
+Stand-in for the OpenAI chat completions API, used by the load harness.
+
+It answers the three prompts the backend sends (context classification,
+task summary, action suggestions) with well-formed responses after an
+injectable delay, and fails a configurable fraction of calls so fallback
+paths and client retries show up under load.
+
+Run it on its own with:
+    python scripts/fake_openai.py --port 8100 --latency-ms 300 --error-rate 0.05
+and point the backend at it with OPENAI_BASE_URL=http://127.0.0.1:8100/v1.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+CATEGORIES = ["scheduling", "sales", "support", "partner", "personal", "other"]
+
+ACTIONS = [
+    {"label": "Reply", "action_type": "reply", "handler": "handle_reply"},
+    {"label": "Forward to Team", "action_type": "forward", "handler": "handle_forward"},
+    {"label": "Archive", "action_type": "archive", "handler": "handle_archive"},
+]
+
+
+class FakeOpenAIConfig:
+    """Latency and failure knobs; may be changed while the server runs."""
+
+    def __init__(
+        self,
+        latency_ms: float = 200.0,
+        jitter_ms: float = 50.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.calls: Counter = Counter()
+
+    def delay_seconds(self) -> float:
+        delay = self.random.gauss(self.latency_ms, self.jitter_ms)
+        return max(0.0, delay) / 1000
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and self.random.random() < self.error_rate
+
+
+def _prompt_kind(payload: dict) -> str:
+    if payload.get("response_format", {}).get("type") == "json_object":
+        return "actions"
+    system = next(
+        (m["content"] for m in payload.get("messages", []) if m["role"] == "system"),
+        "",
+    )
+    if "classif" in system.lower():
+        return "classification"
+    return "summary"
+
+
+def _reply_content(kind: str, payload: dict) -> str:
+    user = next(
+        (m["content"] for m in payload.get("messages", []) if m["role"] == "user"),
+        "",
+    )
+    if kind == "actions":
+        return json.dumps({"actions": ACTIONS})
+    if kind == "classification":
+        # Stable per email, spread across every category
+        digest = hashlib.sha256(user.encode("utf-8")).digest()
+        return CATEGORIES[digest[0] % len(CATEGORIES)]
+    subject = next(
+        (line[9:] for line in user.splitlines() if line.startswith("Subject: ")),
+        "the email",
+    )
+    return f"Review and respond to {subject.strip()}"
+
+
+def create_app(config: Optional[FakeOpenAIConfig] = None) -> FastAPI:
+    config = config or FakeOpenAIConfig()
+    app = FastAPI(title="Fake OpenAI")
+    app.state.config = config
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        kind = _prompt_kind(payload)
+        await asyncio.sleep(config.delay_seconds())
+
+        if config.should_fail():
+            config.calls[f"{kind}_error"] += 1
+            return JSONResponse(
+                status_code=config.error_status,
+                content={
+                    "error": {
+                        "message": "Injected failure",
+                        "type": "server_error",
+                        "code": None,
+                    }
+                },
+            )
+
+        config.calls[kind] += 1
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-3.5-turbo"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": _reply_content(kind, payload),
+                    },
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
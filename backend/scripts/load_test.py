@@ -0,0 +1,498 @@
+# backend/scripts/load_test.py
+
+"""
+End-to-end load harness for POST /api/v1/email/incoming.
+
+Drives the ASGI app in-process with a fixed number of concurrent senders,
+against a real MongoDB (an existing local server, or a throwaway mongod
+started for the run) and the fake OpenAI server in scripts/fake_openai.py.
+Reports throughput, p50/p95/p99 latency and the 409/429/500 rates.
+
+Example:
+    python scripts/load_test.py --spawn-mongod --requests 2000 --concurrency 50 \\
+        --mix unique=70,duplicate=15,spam=5,forwarded=10 \\
+        --ai-latency-ms 400 --ai-error-rate 0.02 --no-rate-limit
+
+The app's own settings are read at import time, so this script sets the
+environment first and imports the app afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.fake_openai import FakeOpenAIConfig, create_app as create_fake_openai
+
+ENDPOINT = "/api/v1/email/incoming"
+EMAIL_KINDS = ("unique", "duplicate", "spam", "forwarded")
+DEFAULT_MIX = "unique=75,duplicate=10,spam=5,forwarded=10"
+CLIENT_IP = "10.20.0.1"
+
+_WORDS = (
+    "project progress review draft notes follow next week report numbers "
+    "budget plan thanks please share status customer feedback release "
+    "document attached version changes office today tomorrow agenda "
+    "topic proposal summary item list pricing meeting support invoice"
+).split()
+
+
+@dataclass
+class LoadConfig:
+    requests: int = 500
+    concurrency: int = 20
+    duration: Optional[float] = None
+    warmup: int = 20
+    mix: Dict[str, float] = field(default_factory=dict)
+    body_bytes: int = 2048
+    users: int = 5
+    api_keys: int = 1
+    rate_limit: bool = True
+    mongodb_uri: str = "mongodb://localhost:27017"
+    mongodb_db: str = "email_assistant_load"
+    spawn_mongod: bool = False
+    keep_data: bool = False
+    ai: bool = True
+    ai_latency_ms: float = 200.0
+    ai_jitter_ms: float = 50.0
+    ai_error_rate: float = 0.0
+    ai_error_status: int = 500
+    seed: int = 42
+
+
+@dataclass
+class Result:
+    kind: str
+    status: int
+    latency: float
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse "unique=70,duplicate=10,..." into normalised weights."""
+    weights: Dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in EMAIL_KINDS:
+            raise ValueError(f"Unknown email kind '{kind}' (use {EMAIL_KINDS})")
+        weights[kind] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Email mix needs at least one positive weight")
+    return {kind: weight / total for kind, weight in weights.items()}
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class EmailFactory:
+    """
+    Builds webhook payloads for each email kind. Duplicates resend an
+    earlier unique email verbatim; spam carries a spam keyword; forwarded
+    emails wrap the body in a forward header.
+    """
+
+    def __init__(self, body_bytes: int, users: int, seed: int):
+        self.body_bytes = body_bytes
+        self.users = [f"load-user-{i}" for i in range(max(1, users))]
+        self.random = random.Random(seed)
+        self.sent: List[dict] = []
+
+    def _body(self) -> str:
+        words = []
+        size = 0
+        while size < self.body_bytes:
+            word = self.random.choice(_WORDS)
+            words.append(word)
+            size += len(word) + 1
+        return f"Hi,\n\n{' '.join(words)}.\n\nThanks,\nLoad Tester"
+
+    def build(self, kind: str) -> dict:
+        if kind == "duplicate" and self.sent:
+            return dict(self.random.choice(self.sent))
+
+        user_id = self.random.choice(self.users)
+        token = uuid.uuid4().hex[:8]
+        payload = {
+            "user_id": user_id,
+            "sender": f"sender-{token}@example.com",
+            "subject": f"Load test {token}",
+            "body": self._body(),
+        }
+        if kind == "spam":
+            payload["subject"] = f"Limited time offer {token}"
+            payload["body"] = "Click here to win a prize! " + payload["body"]
+        elif kind == "forwarded":
+            payload["subject"] = f"Fwd: Original thread {token}"
+            payload["body"] = (
+                "---------- Forwarded message ---------\n"
+                f"From: Original <original-{token}@example.org>\n"
+                f"Subject: Original thread {token}\n\n" + payload["body"]
+            )
+        else:
+            self.sent.append(payload)
+        return payload
+
+
+def build_plan(config: LoadConfig) -> List[Tuple[str, dict]]:
+    """
+    The (kind, payload) sequence to send. Built up front so generating
+    payloads does not compete with the app for the event loop.
+    """
+    rng = random.Random(config.seed)
+    kinds = list(config.mix)
+    weights = [config.mix[k] for k in kinds]
+    factory = EmailFactory(config.body_bytes, config.users, config.seed)
+    return [
+        (kind, factory.build(kind))
+        for kind in rng.choices(kinds, weights=weights, k=config.requests)
+    ]
+
+
+def summarize(results: List[Result], elapsed: float, ai_calls: Counter) -> dict:
+    statuses = Counter(r.status for r in results)
+    latencies = sorted(r.latency for r in results)
+    total = len(results)
+    by_kind: Dict[str, Counter] = defaultdict(Counter)
+    for r in results:
+        by_kind[r.kind][r.status] += 1
+
+    def rate(*codes: int) -> float:
+        return sum(statuses[c] for c in codes) / total if total else 0.0
+
+    ok = sum(n for code, n in statuses.items() if 200 <= code < 300)
+    return {
+        "requests": total,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "accepted_per_second": round(ok / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+        "rates": {
+            "409": round(rate(409), 4),
+            "429": round(rate(429), 4),
+            "500": round(rate(500), 4),
+        },
+        "status_counts": {str(code): n for code, n in sorted(statuses.items())},
+        "by_kind": {
+            kind: {str(code): n for code, n in sorted(counts.items())}
+            for kind, counts in sorted(by_kind.items())
+        },
+        "ai_calls": dict(sorted(ai_calls.items())),
+    }
+
+
+def format_report(report: dict) -> str:
+    latency = report["latency_ms"]
+    rates = report["rates"]
+    lines = [
+        f"Requests:        {report['requests']} in {report['elapsed_seconds']}s",
+        f"Throughput:      {report['throughput_rps']} req/s "
+        f"({report['accepted_per_second']} accepted/s)",
+        f"Latency (ms):    p50 {latency['p50']}  p95 {latency['p95']}  "
+        f"p99 {latency['p99']}  max {latency['max']}",
+        f"409 rate:        {rates['409']:.2%}",
+        f"429 rate:        {rates['429']:.2%}",
+        f"500 rate:        {rates['500']:.2%}",
+        f"Status counts:   {report['status_counts']}",
+    ]
+    for kind, counts in report["by_kind"].items():
+        lines.append(f"  {kind:<14} {counts}")
+    if report["ai_calls"]:
+        lines.append(f"Fake OpenAI:     {report['ai_calls']}")
+    return "\n".join(lines)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ThrowawayMongod:
+    """A mongod on a free port with a temporary data directory."""
+
+    def __init__(self):
+        binary = shutil.which("mongod")
+        if not binary:
+            raise RuntimeError("mongod not found on PATH; pass --mongodb-uri instead")
+        self.binary = binary
+        self.port = _free_port()
+        self.dbpath = tempfile.mkdtemp(prefix="email-assistant-load-")
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def uri(self) -> str:
+        return f"mongodb://127.0.0.1:{self.port}"
+
+    def start(self):
+        self.process = subprocess.Popen(
+            [
+                self.binary,
+                "--dbpath",
+                self.dbpath,
+                "--port",
+                str(self.port),
+                "--bind_ip",
+                "127.0.0.1",
+                "--quiet",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=30)
+        shutil.rmtree(self.dbpath, ignore_errors=True)
+
+
+async def _wait_for_mongo(client, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.admin.command("ping")
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+def _configure_environment(config: LoadConfig, openai_url: Optional[str]):
+    """Set what the app reads at import time; must run before importing it."""
+    os.environ["MONGODB_URI"] = config.mongodb_uri
+    os.environ["MONGODB_DB"] = config.mongodb_db
+    os.environ["API_ENVIRONMENT"] = "load"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("FRONTEND_ORIGIN", "http://localhost:3000")
+    os.environ.setdefault("MAILBOX_API_KEY", "load-test")
+    # Required by Settings; random so it never matches the tenants' keys
+    os.environ.setdefault("EMERGENCY_WEBHOOK_API_KEY", uuid.uuid4().hex)
+    ai = "true" if config.ai and openai_url else "false"
+    os.environ["USE_AI_CONTEXT"] = ai
+    os.environ["USE_AI_SUMMARY"] = ai
+    os.environ["USE_AI_ACTIONS"] = ai
+    if openai_url:
+        os.environ["OPENAI_API_KEY"] = "load-test"
+        os.environ["OPENAI_BASE_URL"] = openai_url
+
+
+async def _send(client, kind: str, payload: dict, api_key: str) -> Result:
+    params = {"user_id": payload["user_id"]}
+    body = {k: v for k, v in payload.items() if k != "user_id"}
+    started = time.perf_counter()
+    try:
+        response = await client.post(
+            ENDPOINT, params=params, json=body, headers={"x-api-key": api_key}
+        )
+        status = response.status_code
+    except Exception:
+        # Unhandled exceptions surface as 500s behind a real server
+        status = 500
+    return Result(kind=kind, status=status, latency=time.perf_counter() - started)
+
+
+async def _drive(
+    app, config: LoadConfig, plan: List[Tuple[str, dict]], api_keys: List[str]
+) -> Tuple[List[Result], float]:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app, client=(CLIENT_IP, 50000))
+    warmup = EmailFactory(config.body_bytes, config.users, config.seed + 1)
+    results: List[Result] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, (kind, payload) in enumerate(plan):
+        queue.put_nowait((api_keys[i % len(api_keys)], kind, payload))
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://load-test", timeout=None
+    ) as client:
+        # Warm caches and connection pools; not counted
+        for _ in range(config.warmup):
+            await _send(client, "unique", warmup.build("unique"), api_keys[0])
+
+        deadline = time.monotonic() + config.duration if config.duration else None
+
+        async def worker():
+            while not queue.empty():
+                if deadline and time.monotonic() > deadline:
+                    return
+                api_key, kind, payload = queue.get_nowait()
+                results.append(await _send(client, kind, payload, api_key))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(config.concurrency)))
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+async def run(config: LoadConfig, openai_url: Optional[str] = None) -> dict:
+    """Run one load test and return the report dictionary."""
+    import uvicorn
+
+    mongod = None
+    fake_server = None
+    fake_config = FakeOpenAIConfig(
+        latency_ms=config.ai_latency_ms,
+        jitter_ms=config.ai_jitter_ms,
+        error_rate=config.ai_error_rate,
+        error_status=config.ai_error_status,
+        seed=config.seed,
+    )
+    try:
+        if config.spawn_mongod:
+            mongod = ThrowawayMongod()
+            mongod.start()
+            config.mongodb_uri = mongod.uri
+
+        if config.ai and not openai_url:
+            port = _free_port()
+            fake_server = uvicorn.Server(
+                uvicorn.Config(
+                    create_fake_openai(fake_config),
+                    host="127.0.0.1",
+                    port=port,
+                    log_level="warning",
+                )
+            )
+            asyncio.create_task(fake_server.serve())
+            while not fake_server.started:
+                await asyncio.sleep(0.05)
+            openai_url = f"http://127.0.0.1:{port}/v1"
+
+        _configure_environment(config, openai_url)
+
+        from beanie import init_beanie
+        from app.config import get_settings
+        from app.dependencies import create_motor_client
+        from app.main import DOCUMENT_MODELS, app
+        from app.middleware import limiter
+        from app.models.webhook_security import WebhookSecurity
+
+        get_settings.cache_clear()
+        settings = get_settings()
+        client = create_motor_client(settings)
+        await _wait_for_mongo(client)
+        if not config.keep_data:
+            await client.drop_database(config.mongodb_db)
+        await init_beanie(
+            database=client[config.mongodb_db], document_models=DOCUMENT_MODELS
+        )
+
+        # One webhook config per simulated tenant, each rate limited separately
+        api_keys = [f"load-key-{i}" for i in range(max(1, config.api_keys))]
+        for key in api_keys:
+            await WebhookSecurity(api_key=key, allowed_ips=[CLIENT_IP]).insert()
+        limiter.enabled = config.rate_limit
+
+        results, elapsed = await _drive(app, config, build_plan(config), api_keys)
+        report = summarize(results, elapsed, fake_config.calls if fake_server else {})
+
+        if not config.keep_data:
+            await client.drop_database(config.mongodb_db)
+        client.close()
+        return report
+    finally:
+        if fake_server is not None:
+            fake_server.should_exit = True
+            await asyncio.sleep(0.1)
+        if mongod is not None:
+            mongod.stop()
+
+
+def parse_args(
+    argv: Optional[Sequence[str]] = None,
+) -> Tuple[LoadConfig, argparse.Namespace]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="Stop after this many seconds even if requests remain",
+    )
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"default: {DEFAULT_MIX}")
+    parser.add_argument("--body-bytes", type=int, default=2048)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument(
+        "--api-keys", type=int, default=1, help="Tenants; rate limits are per API key"
+    )
+    parser.add_argument("--no-rate-limit", action="store_true")
+    parser.add_argument("--mongodb-uri", default="mongodb://localhost:27017")
+    parser.add_argument("--mongodb-db", default="email_assistant_load")
+    parser.add_argument("--spawn-mongod", action="store_true")
+    parser.add_argument("--keep-data", action="store_true")
+    parser.add_argument("--no-ai", action="store_true", help="Rule-based pipeline only")
+    parser.add_argument(
+        "--openai-url", help="Use an already running (fake) OpenAI at this base URL"
+    )
+    parser.add_argument("--ai-latency-ms", type=float, default=200.0)
+    parser.add_argument("--ai-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--ai-error-rate", type=float, default=0.0)
+    parser.add_argument("--ai-error-status", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Also write the report here")
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        mix=parse_mix(args.mix),
+        body_bytes=args.body_bytes,
+        users=args.users,
+        api_keys=args.api_keys,
+        rate_limit=not args.no_rate_limit,
+        mongodb_uri=args.mongodb_uri,
+        mongodb_db=args.mongodb_db,
+        spawn_mongod=args.spawn_mongod,
+        keep_data=args.keep_data,
+        ai=not args.no_ai,
+        ai_latency_ms=args.ai_latency_ms,
+        ai_jitter_ms=args.ai_jitter_ms,
+        ai_error_rate=args.ai_error_rate,
+        ai_error_status=args.ai_error_status,
+        seed=args.seed,
+    )
+    return config, args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    config, args = parse_args(argv)
+    report = asyncio.run(run(config, openai_url=args.openai_url))
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# backend/tests/benchmarks/corpus.py
+
+"""
+Synthetic email corpus shared by the benchmark suite.
+
+Bodies are generated from a fixed seed so every run (and every saved
+baseline) measures exactly the same input. None of the text contains a
+spam keyword or a classifier keyword by accident, so the keyword scanners
+always walk the whole body, which is their worst case.
+"""
+
+import random
+from typing import Dict, List
+
+from app.models.email_message import EmailMessageBase
+
+SEED = 1337
+
+# Body sizes every benchmark is parametrised over
+SIZES = ("short", "typical", "1mb")
+
+_WORDS = (
+    "project progress team review draft notes follow next week report numbers "
+    "budget plan thanks please share status customer feedback release "
+    "document attached version changes office today "
+    "tomorrow morning afternoon agenda topic proposal summary item list"
+).split()
+
+_SIGNATURE = "\n\n--\nAlice Example\nHead of Operations\nExample Corp\n"
+
+_FORWARD_HEADER = (
+    "---------- Forwarded message ---------\n"
+    "From: Bob Original <bob@example.org>\n"
+    "Date: Mon, 6 Jan 2025 at 09:12\n"
+    "Subject: Quarterly planning notes\n"
+    "To: Alice Example <alice@example.com>\n\n"
+)
+
+
+def _paragraph(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(3, 6)):
+        words = rng.choices(_WORDS, k=rng.randint(8, 18))
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def _body_of_length(rng: random.Random, length: int) -> str:
+    parts = ["Team,\n\n"]
+    size = len(parts[0])
+    while size < length:
+        paragraph = _paragraph(rng) + "\n\n"
+        parts.append(paragraph)
+        size += len(paragraph)
+    return "".join(parts)[:length] + _SIGNATURE
+
+
+_LENGTHS = {"typical": 3 * 1024, "1mb": 1024 * 1024}
+
+
+def _build_bodies() -> Dict[str, str]:
+    rng = random.Random(SEED)
+    return {
+        "short": "Quick note: the report is attached, thanks." + _SIGNATURE,
+        "typical": _body_of_length(rng, _LENGTHS["typical"]),
+        "1mb": _body_of_length(rng, _LENGTHS["1mb"]),
+    }
+
+
+BODIES: Dict[str, str] = _build_bodies()
+
+
+def make_email(size: str, forwarded: bool = False) -> EmailMessageBase:
+    """An email with the body for size, optionally wrapped as a forward."""
+    body = BODIES[size]
+    if forwarded:
+        body = _FORWARD_HEADER + body
+    return EmailMessageBase(
+        subject=f"Fwd: Quarterly planning notes ({size})" if forwarded else "Notes",
+        sender="alice@example.com",
+        body=body,
+    )
+
+
+def make_near_duplicate(size: str) -> EmailMessageBase:
+    """The same email with a handful of words changed, as resends often are."""
+    rng = random.Random(SEED + 1)
+    words = BODIES[size].split(" ")
+    for _ in range(max(1, len(words) // 200)):
+        words[rng.randrange(len(words))] = rng.choice(_WORDS)
+    return EmailMessageBase(
+        subject="Notes", sender="alice@example.com", body=" ".join(words)
+    )
+
+
+def make_unrelated_emails(size: str, count: int) -> List[EmailMessageBase]:
+    """Emails of the same size as size's body but with different text."""
+    emails = []
+    for i in range(count):
+        rng = random.Random(SEED + 100 + i)
+        if size == "short":
+            body = " ".join(rng.choices(_WORDS, k=8)).capitalize() + _SIGNATURE
+        else:
+            body = _body_of_length(rng, _LENGTHS[size])
+        emails.append(
+            EmailMessageBase(subject=f"Notes {i}", sender="bob@example.org", body=body)
+        )
+    return emails
+
+
+# HTML-only marketing mail: table layout, inline styles, a style block,
+# a script and tracking pixels around every content row
+HTML_SIZES = ("typical", "2mb")
+_HTML_LENGTHS = {"typical": 50 * 1024, "2mb": 2 * 1024 * 1024}
+_HTML_HEAD = (
+    "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Newsletter</title>"
+    "<style>body{margin:0}.row td{padding:12px;font-family:Arial}</style>"
+    "<script>window.dataLayer=[{'event':'open'}];</script></head>"
+    "<body><table width='100%' cellpadding='0' cellspacing='0' border='0'>"
+)
+_HTML_TAIL = "</table></body></html>"
+
+
+def _html_row(rng: random.Random, index: int) -> str:
+    return (
+        "<tr class='row'><td style='color:#333333;font-size:14px;"
+        "line-height:20px;padding:12px 24px'>"
+        f"<h2 style='margin:0 0 8px 0'>Item {index}</h2>"
+        f"<p style='margin:0'>{_paragraph(rng)}&nbsp;&amp; more</p>"
+        f"<a href='https://example.com/t/{index}?utm_source=mail'>Read more</a>"
+        f"<img src='https://example.com/p/{index}.gif' width='1' height='1' "
+        "style='display:block' alt=''></td></tr>"
+    )
+
+
+def make_marketing_html(size: str) -> str:
+    """An HTML-only marketing body of roughly the size's length."""
+    rng = random.Random(SEED + 2)
+    parts = [_HTML_HEAD]
+    length = len(_HTML_HEAD)
+    index = 0
+    while length < _HTML_LENGTHS[size]:
+        row = _html_row(rng, index)
+        parts.append(row)
+        length += len(row)
+        index += 1
+    parts.append(_HTML_TAIL)
+    return "".join(parts)
@@ -0,0 +1,99 @@
+# backend/tests/benchmarks/test_list_serialization.py
+
+import pytest
+from typing import List
+from beanie import PydanticObjectId
+from pydantic import TypeAdapter
+from app.models.email_message import EmailMessage
+from app.models.assistant_task import AssistantTask
+from app.models.list_items import TaskListItem, SpamEmailListItem, PREVIEW_LENGTH
+
+pytestmark = pytest.mark.per
+
+TASK_COUNT = 200
+TYPICAL_BODY = (
+    "Hi team,\n\nCan we schedule a call next week to review the Q3 pricing "
+    "proposal? I have attached the latest numbers.\n\nThanks,\nAlice\n"
+) * 40
+
+
+def _build_tasks() -> List[AssistantTask]:
+    tasks = []
+    for i in range(TASK_COUNT):
+        email = EmailMessage(
+            id=PydanticObjectId(),
+            subject=f"Pricing review {i}",
+            sender="alice@example.com",
+            body=TYPICAL_BODY,
+            signature="a" * 64,
+            message_id=f"<msg-{i}@example.com>",
+            user_id="bench-user",
+        )
+        tasks.append(
+            AssistantTask(
+                id=PydanticObjectId(),
+                email=email,
+                context="scheduling",
+                summary=f"Pricing review {i}: Handle: Pricing review {i}",
+                actions=["Schedule Meeting", "Reply", "Archive"],
+                user_id="bench-user",
+            )
+        )
+    return tasks
+
+
+def _to_list_items(tasks: List[AssistantTask]) -> List[TaskListItem]:
+    return [
+        TaskListItem(
+            id=str(t.id),
+            email_id=str(t.email.id),
+            sender=t.sender,
+            subject=t.subject,
+            context=t.context,
+            summary=t.summary,
+            actions=t.actions,
+            status=t.status,
+            preview=t.email.body[:PREVIEW_LENGTH],
+        )
+        for t in tasks
+    ]
+
+
+async def test_benchmark_full_task_list(test_db, benchmark):
+    """Baseline: the previous List[AssistantTask] response with linked emails."""
+    tasks = _build_tasks()
+    adapter = TypeAdapter(List[AssistantTask])
+    payload = benchmark(adapter.dump_json, tasks)
+    benchmark.extra_info["response_bytes"] = len(payload)
+
+
+async def test_benchmark_slim_task_list(test_db, benchmark):
+    """The TaskListItem response used by GET /api/v1/tasks."""
+    items = _to_list_items(_build_tasks())
+    adapter = TypeAdapter(List[TaskListItem])
+    payload = benchmark(adapter.dump_json, items)
+    benchmark.extra_info["response_bytes"] = len(payload)
+
+
+async def test_slim_task_list_is_smaller(test_db):
+    tasks = _build_tasks()
+    full = TypeAdapter(List[AssistantTask]).dump_json(tasks)
+    slim = TypeAdapter(List[TaskListItem]).dump_json(_to_list_items(tasks))
+    assert len(slim) * 5 < len(full)
+    assert b"signature" not in slim
+
+
+def test_benchmark_spam_list(benchmark):
+    """The SpamEmailListItem response used by GET /api/v1/email/spam."""
+    items = [
+        SpamEmailListItem(
+            id=str(PydanticObjectId()),
+            sender="promo@example.com",
+            subject=f"Limited time offer {i}",
+            preview=TYPICAL_BODY[:PREVIEW_LENGTH],
+        )
+        for i in range(TASK_COUNT)
+    ]
+    adapter = TypeAdapter(List[SpamEmailListItem])
+    payload = benchmark(adapter.dump_json, items)
+    benchmark.extra_info["response_bytes"] = len(payload)
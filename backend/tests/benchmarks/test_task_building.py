@@ -0,0 +1,90 @@
+# backend/tests/benchmarks/test_task_building.py
+
+import asyncio
+
+import pytest
+from beanie import PydanticObjectId, init_beanie
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.config import Settings
+from app.models.assistant_task import AssistantTask
+from app.models.email_message import EmailMessage
+from app.services.action_suggester import suggest_actions
+from tests.benchmarks.corpus import SIZES, make_email
+
+pytestmark = pytest.mark.per
+
+
+@pytest.fixture
+def rule_based_actions(monkeypatch):
+    """Force the rule path of suggest_actions (no AI call)."""
+    settings = Settings(use_ai_actions=False)
+    monkeypatch.setattr("app.services.action_suggester.get_settings", lambda: settings)
+
+
+class _OfflineDatabase(AsyncDatabase):
+    """A database handle that answers Beanie's one startup query locally."""
+
+    async def command(self, command, *args, **kwargs):
+        return {"version": "7.0.0"}
+
+
+@pytest.fixture
+def offline_models():
+    """
+    Initialise the task models without a MongoDB server: constructing a
+    Document only needs Beanie's class settings, not a connection. The
+    previous settings are restored afterwards.
+    """
+    models = (EmailMessage, AssistantTask)
+    saved = {model: model._document_settings for model in models}
+    client = AsyncMongoClient("mongodb://localhost:27017", connect=False)
+    asyncio.run(
+        init_beanie(
+            database=_OfflineDatabase(client, "benchmarks"),
+            document_models=list(models),
+            skip_indexes=True,
+        )
+    )
+    yield
+    for model, settings in saved.items():
+        model._document_settings = settings
+
+
+@pytest.mark.benchmark(group="suggest_actions")
+@pytest.mark.parametrize("context", ["scheduling", "sales", "other"])
+def test_benchmark_suggest_actions_rules(benchmark, rule_based_actions, context):
+    email = make_email("typical")
+    email.context = context
+    loop = asyncio.new_event_loop()
+    try:
+        actions = benchmark(lambda: loop.run_until_complete(suggest_actions(email)))
+    finally:
+        loop.close()
+    assert len(actions) == 3
+
+
+@pytest.mark.benchmark(group="AssistantTask")
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_assistant_task_construction(offline_models, benchmark, size):
+    base = make_email(size)
+    email = EmailMessage(
+        id=PydanticObjectId(),
+        subject=base.subject,
+        sender=base.sender,
+        body=base.body,
+        user_id="bench-user",
+    )
+
+    def build():
+        return AssistantTask(
+            email=email,
+            context="other",
+            summary=base.subject,
+            actions=["Reply", "Forward", "Archive"],
+            user_id="bench-user",
+        )
+
+    task = benchmark(build)
+    assert task.email.body == base.body
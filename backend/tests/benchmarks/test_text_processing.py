@@ -0,0 +1,94 @@
+# backend/tests/benchmarks/test_text_processing.py
+
+import pytest
+
+from app.services.duplicate_detection import is_fuzzy_duplicate, is_spam_email
+from app.services.task_classifier import classify_context
+from app.utils.email_features import build_email_features
+from app.utils.email_utils import parse_forwarded_body, parse_forwarded_metadata
+from app.utils.html_text import HTML_TEXT_MAX_CHARS, html_to_text
+from tests.benchmarks.corpus import (
+    HTML_SIZES,
+    SIZES,
+    make_email,
+    make_marketing_html,
+    make_near_duplicate,
+    make_unrelated_emails,
+)
+
+pytestmark = pytest.mark.per
+
+# SequenceMatcher is roughly quadratic in body length: one 1 MB comparison
+# takes minutes, so that case is listed but skipped until the step is fixed.
+FUZZY_SIZES = [
+    "short",
+    "typical",
+    pytest.param(
+        "1mb", marks=pytest.mark.skip(reason="fuzzy match on 1 MB takes minutes")
+    ),
+]
+RECENT_EMAILS = 10
+
+
+@pytest.mark.benchmark(group="is_spam_email")
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_is_spam_email(benchmark, size):
+    email = make_email(size)
+    assert benchmark(is_spam_email, email) is False
+
+
+@pytest.mark.benchmark(group="classify_context")
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_classify_context(benchmark, size):
+    email = make_email(size)
+    assert benchmark(classify_context, email) == "other"
+
+
+@pytest.mark.benchmark(group="parse_forwarded_metadata")
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_parse_forwarded_metadata(benchmark, size):
+    body = make_email(size, forwarded=True).body
+    sender, subject = benchmark(parse_forwarded_metadata, body)
+    assert sender == "Bob Original <bob@example.org>"
+    assert subject == "Quarterly planning notes"
+
+
+@pytest.mark.benchmark(group="parse_forwarded_body")
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_parse_forwarded_body(benchmark, size):
+    body = make_email(size, forwarded=True).body
+    benchmark(parse_forwarded_body, body)
+
+
+@pytest.mark.benchmark(group="is_fuzzy_duplicate")
+@pytest.mark.parametrize("size", FUZZY_SIZES)
+def test_benchmark_fuzzy_duplicate_miss(benchmark, size):
+    """Worst case: no candidate matches, so every one is compared."""
+    email = make_email(size)
+    recent = make_unrelated_emails(size, RECENT_EMAILS)
+    assert benchmark(is_fuzzy_duplicate, email, recent, 0.9) is False
+
+
+@pytest.mark.benchmark(group="is_fuzzy_duplicate")
+@pytest.mark.parametrize("size", FUZZY_SIZES)
+def test_benchmark_fuzzy_duplicate_hit(benchmark, size):
+    email = make_email(size)
+    recent = [make_near_duplicate(size)]
+    assert benchmark(is_fuzzy_duplicate, email, recent, 0.9) is True
+
+
+@pytest.mark.benchmark(group="html_to_text")
+@pytest.mark.parametrize("size", HTML_SIZES)
+def test_benchmark_html_to_text(benchmark, size):
+    html = make_marketing_html(size)
+    text = benchmark(html_to_text, html)
+    assert "<" not in text and "dataLayer" not in text
+    assert len(text) <= HTML_TEXT_MAX_CHARS
+
+
+@pytest.mark.benchmark(group="email_features")
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_build_email_features(benchmark, size):
+    email = make_email(size, forwarded=True)
+    features = benchmark(build_email_features, email)
+    assert features.sender == "Bob Original <bob@example.org>"
@@ -24,6 +24,8 @@ from app.main import app
 from app.models.email_message import EmailMessage
 from app.models.assistant_task import AssistantTask
 from app.models.webhook_security import WebhookSecurity
+from app.models.spam_counter import SpamCounter
+from app.models.reprocess_job import ReprocessJobRecord
 from app.models.user_settings import UserSettings
 from app.config import get_settings, Settings
 from app.strategies.action_registry import ActionRegistry
@@ -96,7 +98,14 @@ async def test_db(event_loop):
 
     await init_beanie(
         database=db,
-        document_models=[EmailMessage, AssistantTask, WebhookSecurity, UserSettings],
+        document_models=[
+            EmailMessage,
+            AssistantTask,
+            WebhookSecurity,
+            UserSettings,
+            SpamCounter,
+            ReprocessJobRecord,
+        ],
         allow_index_dropping=True,
     )
 
@@ -233,7 +242,7 @@ def mock_openai_failure_scenario(monkeypatch):
 def mock_context_classifier_scenario(monkeypatch):
     """Mock context classifier to always return a fixed label."""
 
-    async def fake_classify(subject, body):
+    async def fake_classify(subject, body, features=None):
         return "mocked_context"
 
     monkeypatch.setattr(
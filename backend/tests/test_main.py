@@ -13,3 +13,12 @@ def test_read_root():
     response = client.get("/")
     assert response.status_code == 200
     assert response.json() == {"message": "Welcome to Email Assistant API"}
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    client.get("/")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'route="/",status="200"' in response.text
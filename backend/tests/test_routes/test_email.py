@@ -67,7 +67,7 @@ def test_email_task_context_integration(client, monkeypatch):
     }
 
     # ❗ Correct: async fake
-    async def fake_classify(subject, body):
+    async def fake_classify(subject, body, features=None):
         return "scheduling"
 
     monkeypatch.setattr(
@@ -201,3 +201,70 @@ async def test_incoming_forwarded_email(async_client, set_webhook_security):
     assert isinstance(task["actions"], list)
     assert 2 <= len(task["actions"]) <= 3, "Should have 2-3 suggested actions"
     action_labels = set(task["actions"])
+
+
+def test_spam_list_pagination_and_count(client):
+    """GET /email/spam pages with X-Next-Cursor and /email/spam/count matches"""
+    user = "spam-page-user"
+    for i in range(3):
+        resp = client.post(
+            f"/api/v1/email?user_id={user}",
+            json={
+                "sender": "promo@example.com",
+                "subject": f"Win a prize {i}",
+                "body": "Click here to claim your free money",
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.json()["task_id"] is None
+
+    count = client.get(f"/api/v1/email/spam/count?user_id={user}").json()["count"]
+    assert count == 3
+
+    first = client.get(f"/api/v1/email/spam?user_id={user}&limit=2")
+    assert first.status_code == 200
+    assert len(first.json()) == 2
+    assert all("body" not in item for item in first.json())
+
+    cursor = first.headers["X-Next-Cursor"]
+    rest = client.get(f"/api/v1/email/spam?user_id={user}&limit=2&before={cursor}")
+    assert len(rest.json()) == 1
+    assert "X-Next-Cursor" not in rest.headers
+
+    client.patch(f"/api/v1/email/{cursor}/archive?user_id={user}")
+    count = client.get(f"/api/v1/email/spam/count?user_id={user}").json()["count"]
+    assert count == 2
+
+
+def test_bulk_not_spam_queues_reprocessing(client):
+    """PATCH /email/not-spam rescues many emails and reports per-id errors"""
+    user = "bulk-not-spam-user"
+    for i in range(2):
+        client.post(
+            f"/api/v1/email?user_id={user}",
+            json={
+                "sender": "promo@example.com",
+                "subject": f"Win a prize {i}",
+                "body": "Click here to claim your free money",
+            },
+        )
+    spam_ids = [
+        item["id"] for item in client.get(f"/api/v1/email/spam?user_id={user}").json()
+    ]
+
+    resp = client.patch(
+        f"/api/v1/email/not-spam?user_id={user}",
+        json={"email_ids": spam_ids + ["not-an-id"]},
+    )
+    assert resp.status_code == 202
+    data = resp.json()
+    assert data["updated"] == 2
+    assert data["errors"] == [{"email_id": "not-an-id", "error": "Invalid email id"}]
+
+    status_resp = client.get(f"/api/v1/email/reprocess/{data['job_id']}?user_id={user}")
+    assert status_resp.status_code == 200
+    assert status_resp.json()["total"] == 2
+    assert client.get(f"/api/v1/email/spam/count?user_id={user}").json()["count"] == 0
+
+    other = client.get(f"/api/v1/email/reprocess/{data['job_id']}?user_id=someone")
+    assert other.status_code == 404
@@ -23,13 +23,79 @@ def test_get_tasks(client):
     assert len(data) > 0, "There should be at least one task returned"
 
     task = data[0]
-    assert "email" in task
-    assert "subject" in task["email"]
-    assert "sender" in task["email"]
-    assert "body" in task["email"]
+    # List responses are slim: no embedded email document or full body
+    assert "email" not in task
+    assert "id" in task
+    assert "email_id" in task
+    assert "subject" in task
+    assert "sender" in task
+    assert "preview" in task
     assert "context" in task
     assert "summary" in task
     assert "actions" in task
     assert isinstance(task["actions"], list)
     assert len(task["actions"]) > 0
     assert "status" in task
+
+
+def test_bulk_update_tasks_by_ids(client):
+    """PATCH /api/v1/tasks/bulk updates owned tasks and reports bad ids"""
+    task_ids = []
+    for i in range(3):
+        resp = client.post(
+            "/api/v1/email",
+            json={"sender": "bulk@example.com", "subject": f"Bulk {i}", "body": "Body"},
+        )
+        assert resp.status_code == 200
+        task_ids.append(resp.json()["task_id"])
+
+    missing_id = "0123456789abcdef01234567"
+    response = client.patch(
+        "/api/v1/tasks/bulk",
+        json={
+            "task_ids": task_ids + ["not-an-id", missing_id],
+            "update": {"status": "done", "action_taken": "Archive"},
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["matched"] == 3
+    assert data["modified"] == 3
+    errors = {e["task_id"]: e["error"] for e in data["errors"]}
+    assert errors == {"not-an-id": "Invalid task id", missing_id: "Task not found"}
+
+    remaining = {t["id"] for t in client.get("/api/v1/tasks/").json()}
+    assert not remaining.intersection(task_ids)
+
+
+def test_bulk_update_by_filter_reports_truncation(client, monkeypatch):
+    """A filter matching more than the limit updates the first ones and says so"""
+    monkeypatch.setattr("app.api.routers.tasks.BULK_UPDATE_LIMIT", 2)
+    user = "bulk-truncated-user"
+    for i in range(3):
+        client.post(
+            f"/api/v1/email?user_id={user}",
+            json={"sender": "bulk@example.com", "subject": f"Bulk {i}", "body": "Body"},
+        )
+
+    payload = {"filter": {"status": "pending"}, "update": {"status": "in_progress"}}
+    first = client.patch(f"/api/v1/tasks/bulk?user_id={user}", json=payload).json()
+    assert (first["modified"], first["truncated"]) == (2, True)
+
+    # The status filter no longer matches the updated tasks
+    rest = client.patch(f"/api/v1/tasks/bulk?user_id={user}", json=payload).json()
+    assert (rest["modified"], rest["truncated"]) == (1, False)
+
+
+def test_bulk_update_tasks_requires_one_selector(client):
+    """Bulk updates must select tasks by exactly one of task_ids or filter"""
+    response = client.patch(
+        "/api/v1/tasks/bulk", json={"update": {"status": "archived"}}
+    )
+    assert response.status_code == 422
+
+    response = client.patch(
+        "/api/v1/tasks/bulk",
+        json={"filter": {"context": "sales"}, "update": {"status": "bogus"}},
+    )
+    assert response.status_code == 400
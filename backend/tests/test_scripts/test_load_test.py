@@ -0,0 +1,131 @@
+# backend/tests/test_scripts/test_load_test.py
+
+import httpx
+import openai
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+
+from app.services import action_suggester, ai_client
+from app.models.email_message import EmailMessageBase
+from scripts.fake_openai import CATEGORIES, FakeOpenAIConfig, create_app
+from scripts.load_test import (
+    LoadConfig,
+    Result,
+    _drive,
+    build_plan,
+    parse_mix,
+    percentile,
+    summarize,
+)
+
+
+def _fake_openai_client(config: FakeOpenAIConfig) -> openai.AsyncOpenAI:
+    transport = httpx.ASGITransport(app=create_app(config))
+    return openai.AsyncOpenAI(
+        api_key="test",
+        base_url="http://fake-openai/v1",
+        http_client=httpx.AsyncClient(transport=transport),
+        max_retries=0,
+    )
+
+
+def test_parse_mix_normalises_weights():
+    mix = parse_mix("unique=6, duplicate=2,spam=2")
+    assert mix == {"unique": 0.6, "duplicate": 0.2, "spam": 0.2}
+    with pytest.raises(ValueError):
+        parse_mix("bogus=1")
+    with pytest.raises(ValueError):
+        parse_mix("unique=0")
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 99) == 0.0
+
+
+def test_build_plan_kinds():
+    config = LoadConfig(
+        requests=200, mix=parse_mix("unique=1,duplicate=1,spam=1,forwarded=1")
+    )
+    plan = build_plan(config)
+    assert len(plan) == 200
+    sent = {(p["sender"], p["subject"], p["body"]) for k, p in plan if k == "unique"}
+    for kind, payload in plan:
+        if kind == "spam":
+            assert "click here" in payload["body"].lower()
+        elif kind == "forwarded":
+            assert payload["subject"].startswith("Fwd:")
+            assert "\nFrom: " in payload["body"]
+    # Duplicates after the first unique email resend one verbatim
+    first_unique = next(i for i, (k, _) in enumerate(plan) if k == "unique")
+    for kind, payload in plan[first_unique + 1 :]:
+        if kind == "duplicate":
+            assert (payload["sender"], payload["subject"], payload["body"]) in sent
+
+
+def test_summarize_reports_rates_and_latency():
+    results = (
+        [Result("unique", 200, 0.010)] * 90
+        + [Result("duplicate", 409, 0.005)] * 5
+        + [Result("unique", 429, 0.001)] * 4
+        + [Result("unique", 500, 0.500)]
+    )
+    report = summarize(results, elapsed=2.0, ai_calls={"summary": 3})
+    assert report["throughput_rps"] == 50.0
+    assert report["accepted_per_second"] == 45.0
+    assert report["rates"] == {"409": 0.05, "429": 0.04, "500": 0.01}
+    assert report["latency_ms"]["p50"] == 10.0
+    assert report["latency_ms"]["max"] == 500.0
+    assert report["by_kind"]["duplicate"] == {"409": 5}
+
+
+async def test_drive_records_status_per_request():
+    app = FastAPI()
+    seen = []
+
+    @app.post("/api/v1/email/incoming")
+    async def incoming(request: Request):
+        payload = await request.json()
+        seen.append(request.headers["x-api-key"])
+        if payload["subject"].startswith("Limited time"):
+            raise HTTPException(status_code=429)
+        return {"task_id": "t"}
+
+    config = LoadConfig(
+        requests=40, concurrency=4, warmup=2, mix=parse_mix("unique=3,spam=1")
+    )
+    results, elapsed = await _drive(app, config, build_plan(config), ["k1", "k2"])
+
+    assert len(results) == 40
+    assert elapsed > 0
+    assert {r.status for r in results if r.kind == "spam"} == {429}
+    assert {r.status for r in results if r.kind == "unique"} == {200}
+    assert set(seen) == {"k1", "k2"}
+
+
+async def test_fake_openai_answers_app_prompts(monkeypatch):
+    client = _fake_openai_client(FakeOpenAIConfig(latency_ms=0, jitter_ms=0))
+    monkeypatch.setenv("USE_AI_CONTEXT", "true")
+    monkeypatch.setattr(ai_client, "openai_client", client)
+    monkeypatch.setattr(action_suggester, "openai_client", client)
+
+    category = await ai_client.classify_context_ai("Lunch", "Are you free Friday?")
+    assert category in CATEGORIES
+
+    email = EmailMessageBase(subject="Lunch", sender="a@example.com", body="Friday?")
+    actions = await action_suggester.suggest_actions_ai(email)
+    assert [a.label for a in actions] == ["Reply", "Forward to Team", "Archive"]
+
+
+async def test_fake_openai_injects_errors():
+    config = FakeOpenAIConfig(latency_ms=0, jitter_ms=0, error_rate=1.0)
+    client = _fake_openai_client(config)
+    with pytest.raises(openai.InternalServerError):
+        await client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "system", "content": "Summarize this email"}],
+        )
+    assert config.calls["summary_error"] == 1
@@ -0,0 +1,135 @@
+# backend/tests/test_services/test_ai_telemetry.py
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import ai_client
+from app.services.ai_client import chat_completion, classify_context_ai
+from app.services.ai_telemetry import AITelemetry, ai_telemetry, ai_user
+
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+
+class FakeClient:
+    def __init__(self, content="work", error=None):
+        self.calls = 0
+        self.content = content
+        self.error = error
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(prompt_tokens=12, completion_tokens=3),
+        )
+
+
+@pytest.fixture(autouse=True)
+def fresh_telemetry(monkeypatch):
+    ai_telemetry.reset()
+    monkeypatch.setattr(ai_client, "_response_cache", type(ai_client._response_cache)())
+    yield
+    ai_telemetry.reset()
+
+
+def test_rollups_per_feature_and_user():
+    telemetry = AITelemetry()
+    telemetry.record_call("summary", "m", 0.2, prompt_tokens=10, completion_tokens=5)
+    token = ai_user.set("u1")
+    try:
+        telemetry.record_call("summary", "m", 0.4, prompt_tokens=20)
+        telemetry.record_call("summary", "m", 0.1, error="APIError")
+        telemetry.record_fallback("summary", "error")
+    finally:
+        ai_user.reset(token)
+
+    snapshot = telemetry.snapshot()
+    summary = snapshot["global"]["summary"]
+    assert summary["calls"] == 3
+    assert summary["errors"] == 1
+    assert summary["fallbacks"] == 1
+    assert summary["prompt_tokens"] == 30
+    assert summary["avg_latency_ms"] == pytest.approx(233.33, abs=0.01)
+
+    (user,) = snapshot["users"]
+    assert user["user_id"] == "u1"
+    assert user["features"]["summary"]["calls"] == 2
+    assert user["features"]["summary"]["prompt_tokens"] == 20
+    assert telemetry.snapshot(user_id="nobody")["users"] == []
+
+
+def test_per_user_rollups_are_bounded():
+    telemetry = AITelemetry(max_users=2)
+    for user_id in ("a", "b", "c"):
+        token = ai_user.set(user_id)
+        telemetry.record_call("actions", "m", 0.1)
+        ai_user.reset(token)
+    assert {u["user_id"] for u in telemetry.snapshot()["users"]} == {"b", "c"}
+    assert telemetry.snapshot()["global"]["actions"]["calls"] == 3
+
+
+async def test_chat_completion_records_tokens_and_errors():
+    await chat_completion(FakeClient(), "summary", MESSAGES, model="m")
+    with pytest.raises(RuntimeError):
+        await chat_completion(
+            FakeClient(error=RuntimeError("down")), "summary", MESSAGES, model="m"
+        )
+
+    summary = ai_telemetry.snapshot()["global"]["summary"]
+    assert summary["calls"] == 2
+    assert summary["errors"] == 1
+    assert summary["prompt_tokens"] == 12
+    assert summary["completion_tokens"] == 3
+
+
+async def test_chat_completion_caches_deterministic_responses(monkeypatch):
+    monkeypatch.setattr(ai_client, "AI_RESPONSE_CACHE_SIZE", 10)
+    client = FakeClient()
+    for _ in range(3):
+        await chat_completion(client, "summary", MESSAGES, model="m", temperature=0)
+    await chat_completion(client, "summary", MESSAGES, model="m", temperature=0.7)
+
+    assert client.calls == 2
+    summary = ai_telemetry.snapshot()["global"]["summary"]
+    assert summary["cache_hits"] == 2
+    assert summary["calls"] == 2
+
+
+async def test_classifier_fallbacks_are_attributed(monkeypatch):
+    monkeypatch.setenv("USE_AI_CONTEXT", "true")
+    monkeypatch.setattr(ai_client, "openai_client", FakeClient(content="nonsense"))
+    assert await classify_context_ai("Subject", "Body") == "other"
+    monkeypatch.setattr(
+        ai_client, "openai_client", FakeClient(error=RuntimeError("down"))
+    )
+    assert await classify_context_ai("Subject", "Body") == "other"
+
+    classification = ai_telemetry.snapshot()["global"]["classification"]
+    assert classification["calls"] == 2
+    assert classification["errors"] == 1
+    assert classification["fallbacks"] == 2
+
+
+def test_admin_ai_usage_endpoint(monkeypatch):
+    monkeypatch.setattr("app.api.routers.admin.PROFILER_TOKEN", "admin-secret")
+    token = ai_user.set("u1")
+    ai_telemetry.record_call("actions", "m", 0.05, completion_tokens=7)
+    ai_user.reset(token)
+
+    client = TestClient(app)
+    assert client.get("/api/v1/admin/ai/usage").status_code == 403
+    response = client.get(
+        "/api/v1/admin/ai/usage",
+        params={"user_id": "u1"},
+        headers={"X-Admin-Token": "admin-secret"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["global"]["actions"]["completion_tokens"] == 7
+    assert body["users"][0]["features"]["actions"]["calls"] == 1
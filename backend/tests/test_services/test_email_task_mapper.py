@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 
 from app.services.email_task_mapper import map_email_to_task
 from app.models.email_message import EmailMessage
@@ -17,7 +18,7 @@ async def test_full_mapping_and_defaults(monkeypatch):
     """
 
     # Stub classifier to return a known context
-    async def fake_classify(subject, body):
+    async def fake_classify(subject, body, features=None):
         return "mocked_context"
 
     monkeypatch.setattr(
@@ -57,7 +58,7 @@ async def test_summary_truncation(monkeypatch):
     Body longer than 100 chars should be truncated with an ellipsis.
     """
 
-    async def fake_classify2(subject, body):
+    async def fake_classify2(subject, body, features=None):
         return "ctx"
 
     monkeypatch.setattr(
@@ -79,7 +80,7 @@ async def test_missing_sender_and_subject(monkeypatch):
     When sender or subject is empty, defaults should be applied.
     """
 
-    async def fake_classify3(s, b):
+    async def fake_classify3(s, b, features=None):
         return "ctx"
 
     monkeypatch.setattr(
@@ -101,7 +102,7 @@ async def test_empty_body_summary(monkeypatch):
     When body is empty, summary should equal the subject.
     """
 
-    async def fake_classify4(s, b):
+    async def fake_classify4(s, b, features=None):
         return "ctx"
 
     monkeypatch.setattr(
@@ -119,7 +120,7 @@ async def test_custom_actions(monkeypatch):
     Passing a custom actions list should override the defaults.
     """
 
-    async def fake_classify5(s, b):
+    async def fake_classify5(s, b, features=None):
         return "ctx"
 
     monkeypatch.setattr(
@@ -139,7 +140,7 @@ async def test_forwarded_email_parsing(monkeypatch):
     When the email body contains forwarded headers, the original sender and subject are extracted.
     """
 
-    async def fake_classify(subject, body):
+    async def fake_classify(subject, body, features=None):
         return "ctx"
 
     monkeypatch.setattr(
@@ -165,7 +166,7 @@ async def test_forwarded_email_fallback(monkeypatch):
     If no forwarded headers are found, fallback to the forwarding user's metadata.
     """
 
-    async def fake_classify(subject, body):
+    async def fake_classify(subject, body, features=None):
         return "ctx"
 
     monkeypatch.setattr(
@@ -185,7 +186,7 @@ async def test_forwarded_email_multiple_fields(monkeypatch):
     If multiple From:/Subject: fields are present, use the first instance.
     """
 
-    async def fake_classify(subject, body):
+    async def fake_classify(subject, body, features=None):
         return "ctx"
 
     monkeypatch.setattr(
@@ -211,7 +212,7 @@ async def test_forwarded_email_malformed_fields(monkeypatch):
     Malformed or partial forwarded headers should not crash and should fallback gracefully.
     """
 
-    async def fake_classify(subject, body):
+    async def fake_classify(subject, body, features=None):
         return "ctx"
 
     monkeypatch.setattr(
@@ -251,3 +252,63 @@ async def test_map_email_to_task_creates_task_for_non_spam():
     task = await map_email_to_task(email)
     assert task is not None
     assert email.is_spam is False
+
+
+def _user_settings(**overrides):
+    values = {
+        "enable_spam_filtering": True,
+        "enable_auto_categorization": True,
+        "skip_low_priority_emails": False,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.mark.asyncio
+async def test_disabled_spam_filtering_skips_spam_check():
+    """Users who turn spam filtering off get tasks even for spammy emails."""
+    email = EmailMessage(
+        subject="Win a prize",
+        body="Click here to claim your free money",
+        sender="test@example.com",
+    )
+    task = await map_email_to_task(
+        email, user_settings=_user_settings(enable_spam_filtering=False)
+    )
+    assert task is not None
+    assert email.is_spam is False
+
+
+@pytest.mark.asyncio
+async def test_disabled_categorization_skips_classifier(monkeypatch):
+    """With auto-categorization off the classifier is never called."""
+
+    async def fail_classify(subject, body, features=None):
+        raise AssertionError("classifier should not run")
+
+    monkeypatch.setattr(
+        "app.services.context_classifier.classify_context", fail_classify
+    )
+    email = EmailMessage(subject="Meeting", sender="Ann", body="Agenda attached")
+    task = await map_email_to_task(
+        email, user_settings=_user_settings(enable_auto_categorization=False)
+    )
+    assert task.context == "other"
+
+
+@pytest.mark.asyncio
+async def test_low_priority_emails_skip_ai_stages(monkeypatch):
+    """Low-priority emails skip summary and action suggestion when requested."""
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("AI stage should not run")
+
+    monkeypatch.setattr("app.services.email_task_mapper.generate_summary", fail)
+    monkeypatch.setattr("app.services.email_task_mapper.suggest_actions", fail)
+    email = EmailMessage(subject="FYI", sender="Ann", body="Nothing to see")
+    task = await map_email_to_task(
+        email, user_settings=_user_settings(skip_low_priority_emails=True)
+    )
+    assert task.context == "other"
+    assert task.summary == "FYI"
+    assert task.actions == ["Reply", "Forward", "Archive"]
@@ -0,0 +1,114 @@
+# backend/tests/test_services/test_health.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.ai_telemetry import ai_telemetry
+from app.services.health import HealthMonitor, health_monitor
+
+
+class FakeMotorClient:
+    def __init__(self, ping_error=None, ping_delay=0.0):
+        self.pings = 0
+        self.ping_error = ping_error
+        self.ping_delay = ping_delay
+        self.admin = SimpleNamespace(command=self.command)
+        self.options = SimpleNamespace(
+            pool_options=SimpleNamespace(
+                max_pool_size=10,
+                min_pool_size=0,
+                max_idle_time_seconds=60,
+                wait_queue_timeout=None,
+            )
+        )
+
+    async def command(self, name):
+        self.pings += 1
+        await asyncio.sleep(self.ping_delay)
+        if self.ping_error:
+            raise self.ping_error
+        return {"ok": 1}
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    ai_telemetry.reset()
+    yield
+    ai_telemetry.reset()
+    health_monitor._report = None
+
+
+async def test_readiness_reports_cached_probe():
+    monitor = HealthMonitor()
+    assert monitor.readiness() == (False, {"status": "starting"})
+
+    client = FakeMotorClient()
+    await monitor.refresh(client)
+    ready, report = monitor.readiness()
+    monitor.readiness()
+
+    assert ready
+    assert client.pings == 1  # readiness checks never probe
+    assert report["status"] == "ready"
+    assert report["database"]["ok"]
+    assert report["pool"]["max_pool_size"] == 10
+    assert set(report["ingestion"]) == {"requests_in_flight", "reprocess_pending"}
+    assert report["ai"]["state"] == "ok"
+
+
+async def test_unreachable_or_slow_database_is_not_ready():
+    monitor = HealthMonitor(db_timeout=0.01)
+    await monitor.refresh(FakeMotorClient(ping_error=ConnectionError("refused")))
+    ready, report = monitor.readiness()
+    assert not ready
+    assert report["database"] == {"ok": False, "error": "refused"}
+
+    await monitor.refresh(FakeMotorClient(ping_delay=1))
+    assert monitor.readiness()[0] is False
+
+
+async def test_stale_report_is_not_ready():
+    monitor = HealthMonitor(interval=1)
+    await monitor.refresh(FakeMotorClient())
+    monitor._checked_at -= 10
+    ready, report = monitor.readiness()
+    assert not ready
+    assert report["stale"]
+
+
+async def test_background_loop_refreshes_until_stopped():
+    monitor = HealthMonitor()
+    client = FakeMotorClient()
+    monitor.start(client, interval=0.01)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+    pings = client.pings
+    assert pings >= 2
+    await asyncio.sleep(0.03)
+    assert client.pings == pings
+
+
+async def test_ai_failures_are_reported():
+    for _ in range(3):
+        ai_telemetry.record_call("summary", "m", 0.1, error="APIError")
+    monitor = HealthMonitor()
+    await monitor.refresh(FakeMotorClient())
+    ready, report = monitor.readiness()
+    assert ready  # AI features fall back to rules
+    assert report["ai"]["state"] == "failing"
+    assert report["ai"]["consecutive_errors"] == 3
+
+
+def test_probe_endpoints():
+    client = TestClient(app)
+    assert client.get("/healthz").json() == {"status": "ok"}
+    assert client.get("/readyz").status_code == 503
+
+    asyncio.run(health_monitor.refresh(FakeMotorClient()))
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
@@ -39,3 +39,152 @@ def test_rate_limit_exceeded(client):
 # returns correct status code
 # have event_loop error
 # skipping until tests are all fixed with correct fixtures
+
+
+@pytest.fixture(autouse=True)
+def key_storage(monkeypatch):
+    """Fresh storage for recorded API key validations in every test."""
+    from limits.storage import storage_from_string
+
+    import app.middleware as middleware
+
+    storage = storage_from_string("memory://")
+    monkeypatch.setattr(middleware, "_key_storage", storage)
+    return storage
+
+
+VALID_KEYS = {"relay-a", "relay-b"}
+
+
+async def _validate(api_key):
+    return api_key in VALID_KEYS
+
+
+def _limited_app(limit, monkeypatch, trusted=(), validate=_validate):
+    """Minimal app using the webhook limiter classes without the database."""
+    import ipaddress
+
+    from fastapi import FastAPI, Request
+    from fastapi.testclient import TestClient
+    from slowapi import _rate_limit_exceeded_handler
+    from slowapi.errors import RateLimitExceeded
+
+    import app.middleware as middleware
+
+    monkeypatch.setattr(
+        middleware,
+        "RATE_LIMIT_TRUSTED_NETWORKS",
+        [ipaddress.ip_network(net) for net in trusted],
+    )
+    limiter = middleware.TenantLimiter(key_func=middleware.rate_limit_key)
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_middleware(middleware.ApiKeyMiddleware, validate=validate)
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @app.post("/hook")
+    @limiter.limit(limit)
+    async def hook(request: Request):
+        return {"ok": True}
+
+    @app.post("/internal")
+    async def internal(request: Request):
+        request.state.rate_limit_exempt = True
+        return await hook(request=request)
+
+    return TestClient(app, client=("10.1.2.3", 50000))
+
+
+def test_limits_are_per_api_key(monkeypatch):
+    """Relays sharing one IP are limited separately by validated API key."""
+    client = _limited_app("2/minute", monkeypatch)
+
+    for _ in range(2):
+        assert client.post("/hook", headers={"x-api-key": "relay-a"}).status_code == 200
+    assert client.post("/hook", headers={"x-api-key": "relay-a"}).status_code == 429
+    assert client.post("/hook", headers={"x-api-key": "relay-b"}).status_code == 200
+
+
+def test_unvalidated_keys_share_the_ip_bucket(monkeypatch):
+    """Rotating made-up keys does not buy a fresh bucket per request."""
+    client = _limited_app("2/minute", monkeypatch)
+
+    for attempt in range(2):
+        headers = {"x-api-key": f"rotated-{attempt}"}
+        assert client.post("/hook", headers=headers).status_code == 200
+    headers = {"x-api-key": "rotated-2"}
+    assert client.post("/hook", headers=headers).status_code == 429
+
+
+def test_full_ip_bucket_does_not_block_a_new_relay(monkeypatch):
+    """A relay's first request is keyed by its API key, not the shared IP."""
+    client = _limited_app("2/minute", monkeypatch)
+    for attempt in range(3):
+        client.post("/hook", headers={"x-api-key": f"junk-{attempt}"})
+    assert client.post("/hook").status_code == 429
+
+    assert client.post("/hook", headers={"x-api-key": "relay-a"}).status_code == 200
+
+
+def test_validations_are_recorded_once_per_key(monkeypatch):
+    calls = []
+
+    async def counting_validate(api_key):
+        calls.append(api_key)
+        return api_key in VALID_KEYS
+
+    client = _limited_app("10/minute", monkeypatch, validate=counting_validate)
+    for api_key in ("relay-a", "relay-a", "junk", "junk"):
+        client.post("/hook", headers={"x-api-key": api_key})
+    assert calls == ["relay-a", "junk"]
+
+
+def test_failed_lookup_falls_back_to_the_ip_bucket(monkeypatch):
+    async def broken_validate(api_key):
+        raise RuntimeError("database down")
+
+    client = _limited_app("1/minute", monkeypatch, validate=broken_validate)
+    assert client.post("/hook", headers={"x-api-key": "relay-a"}).status_code == 200
+    assert client.post("/hook", headers={"x-api-key": "relay-b"}).status_code == 429
+
+
+def test_burst_and_sustained_limits_both_apply(monkeypatch):
+    client = _limited_app("1/second;3/minute", monkeypatch)
+
+    assert client.post("/hook").status_code == 200
+    assert client.post("/hook").status_code == 429
+
+
+def test_trusted_requests_bypass_limits(monkeypatch):
+    client = _limited_app("1/minute", monkeypatch)
+    for _ in range(3):
+        assert client.post("/internal").status_code == 200
+
+    trusted = _limited_app("1/minute", monkeypatch, trusted=("10.1.0.0/16",))
+    assert trusted.post("/hook").status_code == 200
+
+
+def test_rate_limit_key_hashes_api_keys(key_storage):
+    from starlette.requests import Request
+
+    from app.middleware import mark_api_key_validated, rate_limit_key
+
+    request = Request(
+        {
+            "type": "http",
+            "headers": [(b"x-api-key", b"secret-key")],
+            "query_string": b"user_id=alice",
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+    # Neither an unvalidated key nor a client-supplied user_id gets a bucket
+    assert rate_limit_key(request) == "ip:10.0.0.1"
+
+    mark_api_key_validated("secret-key")
+    key = rate_limit_key(request)
+    assert key.startswith("key:")
+    assert "secret-key" not in key
+    assert not any("secret-key" in slot for slot in key_storage.storage)
+
+    mark_api_key_validated("secret-key", valid=False)
+    assert rate_limit_key(request) == "ip:10.0.0.1"
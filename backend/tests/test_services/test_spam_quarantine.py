@@ -0,0 +1,88 @@
+# backend/tests/test_services/test_spam_quarantine.py
+
+import pytest
+from app.models.email_message import EmailMessage
+from app.models.spam_counter import SpamCounter
+from app.services.spam_quarantine import (
+    get_spam_count,
+    recount_spam,
+    update_spam_flags,
+)
+
+
+async def _insert_email(subject: str, user_id: str = "spam-user") -> EmailMessage:
+    email = EmailMessage(
+        subject=subject, sender="promo@example.com", body="Buy now", user_id=user_id
+    )
+    await email.insert()
+    return email
+
+
+@pytest.mark.asyncio
+async def test_counter_follows_spam_transitions(db_transaction):
+    """Flag changes keep the counter equal to the number of quarantined emails."""
+    first = await _insert_email("Offer 1")
+    second = await _insert_email("Offer 2")
+    assert await get_spam_count("spam-user") == 0
+
+    await update_spam_flags(first, is_spam=True)
+    await update_spam_flags(second, is_spam=True)
+    assert await get_spam_count("spam-user") == 2
+
+    await update_spam_flags(first, is_spam=False)  # rescued
+    await update_spam_flags(second, is_archived=True)  # dismissed
+    assert await get_spam_count("spam-user") == 0
+
+    # Repeating a transition does not change the count again
+    await update_spam_flags(second, is_archived=True)
+    assert await get_spam_count("spam-user") == 0
+    assert await recount_spam("spam-user") == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_flags_adjust_counter_once(db_transaction):
+    """Two requests acting on the same stale copy only decrement once."""
+    email = await _insert_email("Offer")
+    await update_spam_flags(email, is_spam=True)
+    assert await get_spam_count("spam-user") == 1
+
+    copy_a = await EmailMessage.get(email.id)
+    copy_b = await EmailMessage.get(email.id)
+    await update_spam_flags(copy_a, is_spam=False)
+    await update_spam_flags(copy_b, is_archived=True)
+
+    counter = await SpamCounter.find_one(SpamCounter.user_id == "spam-user")
+    assert counter.spam_count == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_write_that_changes_flags_adjusts_counter(db_transaction):
+    """A write from a stale read still moves the counter with the data."""
+    email = await _insert_email("Offer")
+    stale = await EmailMessage.get(email.id)
+
+    await update_spam_flags(email, is_spam=True)
+    assert await get_spam_count("spam-user") == 1
+
+    # stale still believes is_spam=False; its write flips the stored flag
+    await update_spam_flags(stale, is_spam=False)
+    counter = await SpamCounter.find_one(SpamCounter.user_id == "spam-user")
+    assert counter.spam_count == 0
+    assert await recount_spam("spam-user") == 0
+
+
+@pytest.mark.asyncio
+async def test_count_is_seeded_for_existing_users(db_transaction):
+    """Users with spam from before the counter existed get a one-time recount."""
+    email = EmailMessage(
+        subject="Old spam",
+        sender="promo@example.com",
+        body="Buy now",
+        user_id="legacy-user",
+        is_spam=True,
+    )
+    await email.insert()
+
+    assert await get_spam_count("legacy-user") == 1
+    counter = await SpamCounter.find_one(SpamCounter.user_id == "legacy-user")
+    assert counter.initialized is True
@@ -0,0 +1,152 @@
+# backend/tests/test_services/test_spam_reprocessing.py
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.spam_reprocessing as spam_reprocessing
+from app.services.spam_reprocessing import SpamReprocessor
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _wait(reprocessor):
+    await asyncio.gather(*list(reprocessor._tasks))
+
+
+@pytest.fixture(autouse=True)
+def job_store(monkeypatch):
+    """Stand-in for the reprocess_jobs collection: id -> saved copies."""
+    saved = {}
+
+    async def fake_store(self, job):
+        saved.setdefault(job.id, []).append(job.model_copy(deep=True))
+
+    async def fake_load(self, job_id, user_id):
+        versions = saved.get(job_id)
+        if versions and versions[-1].user_id == user_id:
+            return versions[-1]
+        return None
+
+    monkeypatch.setattr(SpamReprocessor, "_store_job", fake_store)
+    monkeypatch.setattr(SpamReprocessor, "_load_job", fake_load)
+    return saved
+
+
+async def test_reprocessing_is_bounded_and_tracks_progress(monkeypatch):
+    """Jobs never run more emails at once than the concurrency limit."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_reprocess(email):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return SimpleNamespace(id=email.id), email.id % 2 == 0
+
+    async def fake_load(user_id, email_ids):
+        return {oid: SimpleNamespace(id=oid) for oid in email_ids if oid != 7}
+
+    monkeypatch.setattr(spam_reprocessing, "reprocess_email", fake_reprocess)
+    reprocessor = SpamReprocessor(concurrency=2)
+    monkeypatch.setattr(reprocessor, "_load_emails", fake_load)
+
+    job = await reprocessor.start("alice", list(range(8)))
+    assert job.status in ("queued", "running")
+    await _wait(reprocessor)
+
+    assert peak == 2
+    assert job.status == "completed"
+    assert job.processed == job.total == 8
+    assert (job.created, job.updated, job.failed) == (4, 3, 1)
+    assert job.errors[0].email_id == "7"
+    assert job.finished_at is not None
+
+
+async def test_jobs_are_scoped_to_user_and_bounded(monkeypatch):
+    async def fake_load(user_id, email_ids):
+        return {}
+
+    reprocessor = SpamReprocessor(concurrency=1, max_jobs=2)
+    monkeypatch.setattr(reprocessor, "_load_emails", fake_load)
+
+    first = await reprocessor.start("alice", [])
+    await reprocessor.start("alice", [])
+    await reprocessor.start("alice", [])
+    await _wait(reprocessor)
+
+    assert first.id not in reprocessor._jobs
+    # Dropped from memory, but still served from the store
+    assert (await reprocessor.get(first.id, "alice")).status == "completed"
+    assert await reprocessor.get(first.id, "bob") is None
+    latest = list(reprocessor._jobs)[-1]
+    assert await reprocessor.get(latest, "alice") is not None
+    assert await reprocessor.get(latest, "bob") is None
+
+
+async def test_progress_is_visible_to_other_workers(monkeypatch, job_store):
+    async def fake_reprocess(email):
+        return SimpleNamespace(id=email.id), True
+
+    async def fake_load(user_id, email_ids):
+        return {oid: SimpleNamespace(id=oid) for oid in email_ids}
+
+    monkeypatch.setattr(spam_reprocessing, "reprocess_email", fake_reprocess)
+    worker = SpamReprocessor(concurrency=1)
+    other_worker = SpamReprocessor()
+    monkeypatch.setattr(worker, "_load_emails", fake_load)
+
+    job = await worker.start("alice", [1, 2, 3])
+    # Saved before the id is returned
+    assert (await other_worker.get(job.id, "alice")).status == "queued"
+    await _wait(worker)
+
+    seen = await other_worker.get(job.id, "alice")
+    assert (seen.status, seen.processed, seen.created) == ("completed", 3, 3)
+    progress = [saved.processed for saved in job_store[job.id]]
+    assert progress == sorted(progress)
+    assert not worker._save_locks
+
+
+async def test_progress_saves_are_throttled_and_errors_capped(monkeypatch, job_store):
+    async def fake_load(user_id, email_ids):
+        return {}
+
+    reprocessor = SpamReprocessor(
+        concurrency=4, save_every=10, save_interval=3600, max_errors=3
+    )
+    monkeypatch.setattr(reprocessor, "_load_emails", fake_load)
+
+    job = await reprocessor.start("alice", list(range(30)))
+    await _wait(reprocessor)
+
+    assert (job.status, job.failed, len(job.errors)) == ("completed", 30, 3)
+    # queued, running, at most one per 10 emails, and the final state
+    assert len(job_store[job.id]) <= 6
+    assert job_store[job.id][-1].processed == 30
+
+
+async def test_shutdown_saves_jobs_as_interrupted(monkeypatch, job_store):
+    async def slow_reprocess(email):
+        await asyncio.sleep(10)
+
+    async def fake_load(user_id, email_ids):
+        return {oid: SimpleNamespace(id=oid) for oid in email_ids}
+
+    monkeypatch.setattr(spam_reprocessing, "reprocess_email", slow_reprocess)
+    reprocessor = SpamReprocessor(concurrency=1)
+    monkeypatch.setattr(reprocessor, "_load_emails", fake_load)
+
+    running = await reprocessor.start("alice", [1, 2])
+    await asyncio.sleep(0.01)
+    never_started = await reprocessor.start("alice", [3])
+    await reprocessor.shutdown()
+
+    for job in (running, never_started):
+        saved = job_store[job.id][-1]
+        assert (saved.status, saved.processed) == ("interrupted", 0)
+        assert saved.finished_at is not None
+    assert reprocessor.pending() == 0
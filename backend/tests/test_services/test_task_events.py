@@ -0,0 +1,152 @@
+# backend/tests/test_services/test_task_events.py
+
+import asyncio
+import json
+import pytest
+
+from app.services.task_events import TaskEventBroker
+
+pytestmark = pytest.mark.asyncio
+
+
+def _frames_to_events(frames):
+    """Parse SSE frames into (id, event, data) tuples, skipping heartbeats."""
+    events = []
+    for frame in frames:
+        if frame.startswith(":"):
+            continue
+        fields = dict(
+            line.split(": ", 1) for line in frame.strip().split("\n") if ": " in line
+        )
+        events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def _collect(stream, n):
+    frames = []
+    async for frame in stream:
+        frames.append(frame)
+        if len(frames) == n:
+            break
+    await stream.aclose()
+    return frames
+
+
+async def test_live_events_are_scoped_to_user():
+    """Subscribers only receive events for their own user_id."""
+    broker = TaskEventBroker(first_id=1)
+    stream = broker.stream("alice", heartbeat_seconds=5)
+    reader = asyncio.create_task(_collect(stream, 1))
+    await asyncio.sleep(0)
+
+    broker.publish("created", "bob", "t-bob", {"subject": "Not yours"})
+    broker.publish("created", "alice", "t-1", {"subject": "Hello"})
+
+    events = _frames_to_events(await reader)
+    assert events == [("2", "task.created", {"task_id": "t-1", "subject": "Hello"})]
+    assert broker.subscriber_count() == 0
+
+
+async def test_resume_from_last_event_id_replays_missed_events():
+    """Reconnecting with a Last-Event-ID replays only newer events."""
+    broker = TaskEventBroker()
+    first = broker.publish("created", "alice", "t-1", {})
+    broker.publish("updated", "alice", "t-1", {"status": "in_progress"})
+    broker.publish("archived", "alice", "t-1", {"status": "archived"})
+
+    frames = await _collect(broker.stream("alice", last_event_id=first.id), 2)
+    events = _frames_to_events(frames)
+
+    assert [e[1] for e in events] == ["task.updated", "task.archived"]
+
+
+async def test_resume_too_far_behind_sends_reset():
+    """A client older than the replay buffer is told to re-fetch the list."""
+    broker = TaskEventBroker(replay_size=2, first_id=1)
+    for i in range(5):
+        broker.publish("created", "alice", f"t-{i}", {})
+
+    stream = broker.stream("alice", last_event_id=1, heartbeat_seconds=5)
+    reader = asyncio.create_task(_collect(stream, 2))
+    await asyncio.sleep(0)
+    broker.publish("created", "alice", "t-new", {})
+
+    events = _frames_to_events(await reader)
+    assert events[0][1] == "task.reset"
+    assert events[1][2]["task_id"] == "t-new"
+
+
+async def test_resume_with_an_id_from_another_broker_sends_reset():
+    """Ids from before a restart or from another worker are not resumable."""
+    earlier = TaskEventBroker(first_id=1)
+    for i in range(500):
+        earlier.publish("created", "alice", f"t-{i}", {})
+    broker = TaskEventBroker()
+    assert broker.first_id > earlier.last_id
+
+    for last_event_id in (earlier.last_id, broker.first_id + 10_000):
+        stream = broker.stream("alice", last_event_id=last_event_id)
+        reader = asyncio.create_task(_collect(stream, 4))
+        await asyncio.sleep(0)
+        for i in range(3):
+            broker.publish("created", "alice", f"new-{i}", {})
+
+        events = _frames_to_events(await reader)
+        assert events[0][1] == "task.reset"
+        assert [e[2]["task_id"] for e in events[1:]] == ["new-0", "new-1", "new-2"]
+
+
+async def test_idle_stream_emits_heartbeat():
+    """Idle streams send SSE comment heartbeats to keep connections open."""
+    broker = TaskEventBroker()
+    frames = await _collect(broker.stream("alice", heartbeat_seconds=0.01), 1)
+    assert frames == [": heartbeat\n\n"]
+
+
+async def test_unknown_event_type_rejected():
+    broker = TaskEventBroker()
+    with pytest.raises(ValueError):
+        broker.publish("deleted", "alice", "t-1", {})
+
+
+async def test_bulk_publish_emits_one_event_per_task(monkeypatch):
+    """Bulk writes publish a partial event for every updated task."""
+    import app.services.task_events as task_events
+
+    broker = TaskEventBroker()
+    monkeypatch.setattr(task_events, "task_event_broker", broker)
+
+    events = task_events.publish_task_events(
+        "archived", "alice", ["t-1", "t-2"], {"status": "archived"}
+    )
+
+    assert [e.task_id for e in events] == ["t-1", "t-2"]
+    assert broker.replay_since("alice", events[0].id)[0].data == {
+        "id": "t-2",
+        "status": "archived",
+    }
+
+
+async def test_idle_users_are_forgotten_beyond_max_users():
+    """Replay state is bounded; users with live subscribers are kept."""
+    broker = TaskEventBroker(max_users=2)
+    queue = broker.subscribe("alice")
+    first = broker.publish("created", "alice", "t1", {})
+    broker.publish("created", "bob", "t2", {})
+    bob_last = broker.publish("updated", "bob", "t2", {})
+    broker.publish("created", "carol", "t3", {})
+
+    # alice is the least recent but still subscribed, so bob goes
+    assert set(broker._replay) == {"alice", "carol"}
+    assert "bob" not in broker._evicted
+    assert broker.replay_since("alice", first.id) == []
+    assert [e.id for e in broker._replay["alice"]] == [first.id]
+    # bob's resume point was forgotten: the client must re-fetch
+    assert broker.replay_since("bob", bob_last.id - 1) is None
+    assert broker.replay_since("bob", bob_last.id) == []
+
+    broker.unsubscribe("alice", queue)
+    later = broker.publish("created", "bob", "t4", {})
+    assert set(broker._replay) == {"carol", "bob"}
+    assert broker.replay_since("bob", bob_last.id - 1) is None
+    assert broker.replay_since("bob", bob_last.id) == [later]
@@ -0,0 +1,60 @@
+# backend/tests/test_services/test_user_settings_cache.py
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.user_settings_cache import UserSettingsCache
+
+pytestmark = pytest.mark.asyncio
+
+
+class CountingCache(UserSettingsCache):
+    """Cache whose loads are counted instead of hitting MongoDB."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.loads = 0
+
+    async def _load(self, user_id):
+        self.loads += 1
+        return SimpleNamespace(user_id=user_id, enable_spam_filtering=True)
+
+
+async def test_settings_are_loaded_once_until_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        "app.services.user_settings_cache.time.monotonic", lambda: now[0]
+    )
+    cache = CountingCache(ttl_seconds=60)
+
+    await cache.get("alice")
+    await cache.get("alice")
+    assert cache.loads == 1
+
+    now[0] += 61
+    await cache.get("alice")
+    assert cache.loads == 2
+
+
+async def test_write_through_and_invalidate():
+    cache = CountingCache(ttl_seconds=60)
+    await cache.get("alice")
+
+    cache.set(SimpleNamespace(user_id="alice", enable_spam_filtering=False))
+    assert (await cache.get("alice")).enable_spam_filtering is False
+    assert cache.loads == 1
+
+    cache.invalidate("alice")
+    assert (await cache.get("alice")).enable_spam_filtering is True
+    assert cache.loads == 2
+
+
+async def test_least_recently_used_entries_are_evicted():
+    cache = CountingCache(ttl_seconds=60, max_entries=2)
+    await cache.get("alice")
+    await cache.get("bob")
+    await cache.get("alice")
+    await cache.get("carol")
+
+    assert list(cache._entries) == ["alice", "carol"]
@@ -0,0 +1,86 @@
+# backend/tests/test_startup.py
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+
+from app.main import create_app
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Cold start budget for one worker importing the app; override on slow machines
+IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", 2000))
+RSS_BUDGET_MB = float(os.getenv("STARTUP_RSS_BUDGET_MB", 120))
+
+# Integrations that must only load when a request actually uses them
+LAZY_MODULES = ("openai", "mailslurp_client", "imapclient")
+
+# Peak RSS comes from VmHWM: ru_maxrss in a child started by subprocess
+# carries over the (pytest) parent's high-water mark across fork and exec
+PROBE = f"""
+import json, resource, sys, time
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # No /proc (macOS): fall back to ru_maxrss, which is in bytes there
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 / 1024
+
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "rss_mb": peak_rss_mb(),
+    "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _import_report(stderr: str, top: int = 15) -> str:
+    """The slowest imports (cumulative) from python -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            rows.append((int(cumulative), name.rstrip()))
+    rows.sort(reverse=True)
+    return "\n".join(f"{us / 1000:9.1f} ms {name}" for us, name in rows[:top])
+
+
+def test_cold_import_stays_within_budget():
+    env = {**os.environ, "OPENAI_API_KEY": "sk-test", "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    report = _import_report(result.stderr)
+
+    assert stats["loaded"] == [], f"eagerly imported: {stats['loaded']}"
+    assert stats["import_ms"] < IMPORT_BUDGET_MS, report
+    assert stats["rss_mb"] < RSS_BUDGET_MB, report
+
+
+def test_create_app_builds_independent_apps():
+    first, second = create_app(), create_app()
+    assert isinstance(first, FastAPI)
+    assert first is not second
+    paths = {route.path for route in first.routes}
+    assert {"/", "/metrics", "/api/v1/email/incoming"} <= paths
@@ -0,0 +1,102 @@
+# backend/tests/test_utils/test_body_normalizer.py
+
+from app.models.email_message import EmailMessageBase
+from app.services.duplicate_detection import is_fuzzy_duplicate, is_spam_email
+from app.utils.body_normalizer import normalize_body, normalized_text
+
+
+def test_strips_gmail_quote_and_signature():
+    body = """Sounds good, see you at 3.
+
+Thanks,
+Dana
+
+--
+Dana Example | Product
++1 555 0100
+
+On Mon, Jan 6, 2025 at 9:12 AM Bob <bob@example.com> wrote:
+> Can we meet at 3?
+> Bob
+"""
+    assert normalize_body(body) == "Sounds good, see you at 3.\n\nThanks,\nDana"
+
+
+def test_strips_wrapped_attribution_and_keeps_bottom_posted_reply():
+    body = """On Mon, Jan 6, 2025 at 9:12 AM Bob Example
+<bob@example.com> wrote:
+> Can we meet at 3?
+
+Yes, 3 works."""
+    assert normalize_body(body) == "Yes, 3 works."
+
+
+def test_strips_outlook_history_and_mobile_footer():
+    outlook = """Approved.
+
+________________________________
+From: Carol <carol@example.com>
+Sent: Monday, January 6, 2025 9:00 AM
+Subject: Budget
+
+Please approve the budget."""
+    assert normalize_body(outlook) == "Approved."
+
+    header_block = "Approved.\n\nFrom: Carol\nSent: Monday\n\nOld text"
+    assert normalize_body(header_block) == "Approved."
+    assert normalize_body("Will do.\n\nSent from my iPhone") == "Will do."
+    assert (
+        normalize_body("Noted.\n-----Original Message-----\nFrom: x\nOld") == "Noted."
+    )
+
+
+def test_collapses_blank_runs_and_keeps_plain_bodies():
+    assert normalize_body("One\n\n\n\nTwo\n") == "One\n\nTwo"
+    assert normalize_body("From: the start, this is plain text.") == (
+        "From: the start, this is plain text."
+    )
+    assert normalize_body("") == ""
+
+
+def test_quote_only_body_falls_back_to_raw_text():
+    body = "> just the quoted text\n> nothing else"
+    assert normalize_body(body) == body
+
+
+def test_spam_check_still_sees_stripped_text():
+    hidden = [
+        "Hello\n--\nClick here to claim your free money",
+        "Hello\n> Click here to claim your free money",
+        "Sure!\n\nOn Mon, Bob wrote:\n> Click here to claim your free money",
+    ]
+    for body in hidden:
+        email = EmailMessageBase(subject="Hi", sender="a@example.com", body=body)
+        assert normalize_body(body) in ("Hello", "Sure!")
+        assert is_spam_email(email)
+
+    html = EmailMessageBase(
+        subject="Hi", sender="a@example.com", body="<p>Click <b>here</b></p>"
+    )
+    assert is_spam_email(html)
+
+
+def test_stages_use_the_sender_text():
+    reply = EmailMessageBase(
+        subject="Notes",
+        sender="a@example.com",
+        body="Thanks, merged.\n\n" + "> a long quoted thread line\n" * 200,
+    )
+    other = EmailMessageBase(
+        subject="Notes", sender="a@example.com", body="Thanks, merged."
+    )
+    assert is_fuzzy_duplicate(reply, [other], threshold=0.95)
+
+
+def test_stored_normalized_body_is_preferred():
+    class Stored:
+        body = "raw text\n-- \nsig"
+        normalized_body = "stored"
+
+    assert normalized_text(Stored()) == "stored"
+    Stored.normalized_body = None
+    assert normalized_text(Stored()) == "raw text"
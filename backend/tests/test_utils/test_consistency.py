@@ -0,0 +1,39 @@
+# backend/tests/test_utils/test_consistency.py
+
+import pytest
+from pymongo.read_preferences import SecondaryPreferred
+
+from app.utils.consistency import (
+    ANALYTICS_READ,
+    CRITICAL_WRITE,
+    FIRE_AND_FORGET_WRITE,
+    INTERACTIVE_READ,
+    get_consistency_profile,
+)
+
+
+def test_read_profiles_allow_bounded_secondary_reads():
+    interactive = get_consistency_profile(INTERACTIVE_READ)
+    analytics = get_consistency_profile(ANALYTICS_READ)
+
+    assert isinstance(interactive.read_preference, SecondaryPreferred)
+    assert interactive.read_preference.max_staleness >= 90
+    assert (
+        analytics.read_preference.max_staleness
+        >= interactive.read_preference.max_staleness
+    )
+    assert interactive.write_concern is None
+
+
+def test_write_profiles():
+    critical = get_consistency_profile(CRITICAL_WRITE)
+    fire_and_forget = get_consistency_profile(FIRE_AND_FORGET_WRITE)
+
+    assert critical.write_concern.document == {"w": "majority", "j": True}
+    assert critical.read_preference.mongos_mode == "primary"
+    assert fire_and_forget.write_concern.acknowledged is False
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        get_consistency_profile("eventually-maybe")
@@ -0,0 +1,171 @@
+# backend/tests/test_utils/test_db_monitoring.py
+
+import asyncio
+from types import SimpleNamespace
+
+from app.utils.db_monitoring import (
+    PoolMetricsListener,
+    SlowQueryListener,
+    plan_stages,
+    pool_stats,
+)
+from app.utils.metrics import MetricsRegistry
+
+ADDRESS = ("db.internal", 27017)
+
+
+def test_histogram_summary_estimates_quantiles():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency", buckets=(0.01, 0.1, 1.0))
+    for value in [0.005] * 90 + [0.05] * 9 + [0.5]:
+        histogram.observe(value, stage="x")
+
+    summary = histogram.summary(stage="x")
+    assert summary["count"] == 100
+    assert summary["p50"] == 0.01
+    assert summary["p95"] == 0.1
+    assert summary["max"] == 0.5
+    assert histogram.summary(stage="other")["count"] == 0
+
+
+def test_pool_listener_tracks_checkout_waits_and_occupancy():
+    listener = PoolMetricsListener()
+    listener.connection_created(SimpleNamespace(address=ADDRESS))
+    listener.connection_check_out_started(SimpleNamespace(address=ADDRESS))
+    listener.connection_checked_out(SimpleNamespace(address=ADDRESS, duration=0.002))
+    listener.connection_check_out_started(SimpleNamespace(address=ADDRESS))
+    listener.connection_check_out_failed(
+        SimpleNamespace(address=ADDRESS, reason="timeout", duration=5.0)
+    )
+
+    server = pool_stats()["servers"]["db.internal:27017"]
+    assert server["checked_out"] == 1
+    assert server["waiting"] == 0
+    assert server["checkout_failures"]["timeout"] >= 1
+    assert server["checkout_wait_seconds"]["count"] >= 2
+
+    listener.connection_checked_in(SimpleNamespace(address=ADDRESS))
+    assert pool_stats()["servers"]["db.internal:27017"]["checked_out"] == 0
+
+
+def test_pool_occupancy_survives_clear_and_close():
+    listener = PoolMetricsListener()
+    address = ("db.cleared", 27017)
+    event = SimpleNamespace(address=address, duration=0.001)
+    for _ in range(2):
+        listener.connection_created(event)
+        listener.connection_check_out_started(event)
+        listener.connection_checked_out(event)
+
+    # In-use connections are checked in after a clear, one event each
+    listener.pool_cleared(event)
+    assert pool_stats()["servers"]["db.cleared:27017"]["checked_out"] == 2
+    listener.connection_checked_in(event)
+    assert pool_stats()["servers"]["db.cleared:27017"]["checked_out"] == 1
+
+    # After a close the gauges are reset; late check-ins must not go below 0
+    listener.pool_closed(event)
+    listener.connection_checked_in(event)
+    listener.connection_closed(event)
+    server = pool_stats()["servers"]["db.cleared:27017"]
+    assert (server["checked_out"], server["connections"]) == (0, 0)
+
+
+def _command_events(name, command, duration_ms, request_id=1):
+    started = SimpleNamespace(
+        command_name=name,
+        command=command,
+        database_name="email_assistant",
+        connection_id=ADDRESS,
+        request_id=request_id,
+    )
+    finished = SimpleNamespace(
+        command_name=name,
+        connection_id=ADDRESS,
+        request_id=request_id,
+        duration_micros=int(duration_ms * 1000),
+    )
+    return started, finished
+
+
+def test_slow_query_listener_records_redacted_slow_commands():
+    listener = SlowQueryListener(threshold_ms=50, max_entries=2)
+    find = {
+        "find": "email_messages",
+        "filter": {"user_id": "alice", "_id": {"$in": ["a", "b"]}},
+        "limit": 100,
+        "lsid": {"id": "session"},
+    }
+    for request_id, (name, command, ms) in enumerate(
+        [
+            ("find", find, 10),
+            ("find", find, 120),
+            ("ping", {"ping": 1}, 500),
+            ("update", {"update": "tasks", "updates": [{"q": {"x": 1}}]}, 60),
+            ("aggregate", {"aggregate": "tasks", "pipeline": [{"$match": {}}]}, 80),
+        ]
+    ):
+        started, finished = _command_events(name, command, ms, request_id)
+        listener.started(started)
+        listener.succeeded(finished)
+
+    entries = listener.entries()
+    # Bounded: the oldest slow find fell out; fast and ignored commands never entered
+    assert [e.command for e in entries] == ["aggregate", "update"]
+    assert entries[1].shape == {"filter": {"x": "?"}}
+    assert entries[1].collection == "tasks"
+
+    listener.configure(threshold_ms=50, max_entries=10, explain_rate=0)
+    started, finished = _command_events("find", find, 120, request_id=99)
+    listener.started(started)
+    listener.failed(finished)
+    slow_find = listener.entries()[0]
+    assert slow_find.failed
+    assert slow_find.shape == {
+        "filter": {"user_id": "?", "_id": {"$in": ["?"]}},
+        "limit": 100,
+    }
+    assert "alice" not in slow_find.model_dump_json()
+
+
+def test_plan_stages_finds_collscan():
+    explain = {
+        "queryPlanner": {
+            "winningPlan": {"stage": "LIMIT", "inputStage": {"stage": "COLLSCAN"}},
+            "rejectedPlans": [{"stage": "IXSCAN"}],
+        }
+    }
+    assert plan_stages(explain) == ["LIMIT", "COLLSCAN"]
+
+
+async def test_slow_query_listener_samples_explain():
+    explained = []
+
+    class FakeDatabase:
+        async def command(self, command):
+            explained.append(command)
+            return {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+
+    listener = SlowQueryListener(threshold_ms=1, explain_rate=1.0)
+    listener.attach({"email_assistant": FakeDatabase()})
+    command = {
+        "find": "email_messages",
+        "filter": {"body": "x"},
+        "lsid": {},
+        "$db": "d",
+    }
+    started, finished = _command_events("find", command, 5)
+    listener.started(started)
+    listener.succeeded(finished)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert explained == [
+        {
+            "explain": {"find": "email_messages", "filter": {"body": "x"}},
+            "verbosity": "queryPlanner",
+        }
+    ]
+    entry = listener.entries()[0]
+    assert entry.collscan is True
+    assert entry.plan_stages == ["COLLSCAN"]
@@ -0,0 +1,90 @@
+# backend/tests/test_utils/test_email_features.py
+
+import hashlib
+from dataclasses import replace
+
+from app.models.email_message import EmailMessageBase
+from app.services.duplicate_detection import is_spam_email
+from app.services.task_classifier import classify_context
+from app.utils.email_features import build_email_features, content_signature, token_hash
+from app.utils.forwarded import parse_forwarded_chain
+
+FORWARD = """FYI
+
+---------- Forwarded message ---------
+From: Bob <bob@example.com>
+Subject: Schedule a meeting
+To: Alice <alice@example.com>
+
+Can we book a time?
+
+--
+Bob"""
+
+
+def test_features_of_a_plain_email():
+    email = EmailMessageBase(
+        subject="  Budget  ",
+        sender=" ann@example.com ",
+        body="Numbers attached.\n\nOn Mon, Bob wrote:\n> old",
+    )
+    features = build_email_features(email)
+
+    assert (features.sender, features.subject) == ("ann@example.com", "Budget")
+    assert features.normalized_body == "Numbers attached."
+    assert features.text == "  budget   numbers attached."
+    assert features.body_length == len(email.body)
+    assert features.normalized_length == len("Numbers attached.")
+    assert not features.forwarded.is_forward
+    expected = hashlib.sha256(
+        (email.sender + email.subject + email.body).encode("utf-8")
+    ).hexdigest()
+    assert features.content_hash == expected
+
+
+def test_forwarded_values_win_and_a_parsed_chain_is_reused():
+    email = EmailMessageBase(subject="Fwd: hi", sender="ann@example.com", body=FORWARD)
+    chain = parse_forwarded_chain(FORWARD)
+    features = build_email_features(email, chain)
+
+    assert features.forwarded is chain
+    assert features.sender == "Bob <bob@example.com>"
+    assert features.subject == "Schedule a meeting"
+
+
+def test_content_hash_of_the_received_email_is_kept():
+    received = content_signature("ann@example.com", "Fwd: hi", FORWARD)
+    rewritten = EmailMessageBase(
+        subject="Schedule a meeting", sender="bob@example.com", body="Can we book?"
+    )
+    features = build_email_features(rewritten, content_hash=received)
+    assert features.content_hash == received
+
+
+def test_blank_sender_and_subject_are_missing():
+    email = EmailMessageBase(subject="  ", sender="", body="Hello")
+    features = build_email_features(email)
+    assert features.sender is None and features.subject is None
+
+
+def test_tokens_are_split_once_on_demand():
+    features = build_email_features(
+        EmailMessageBase(subject="Re: Q3", sender="a", body="Ship it, team!")
+    )
+    assert features.tokens == ["re", "q3", "ship", "it", "team"]
+    assert features.tokens is features.tokens
+    assert token_hash("team") in features.token_hashes
+    # Fixed value: the same in every worker and run
+    assert token_hash("team") == int.from_bytes(
+        hashlib.blake2b(b"team", digest_size=8).digest()
+    )
+
+
+def test_stages_scan_the_shared_text():
+    email = EmailMessageBase(subject="Notes", sender="a", body="Plain notes.")
+    # The stages read features.text instead of the email
+    features = replace(build_email_features(email), text="click here to book a meeting")
+    assert is_spam_email(email, features)
+    assert classify_context(email, features) == "scheduling"
+    assert not is_spam_email(email)
+    assert classify_context(email) == "other"
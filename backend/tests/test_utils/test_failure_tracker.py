@@ -0,0 +1,105 @@
+# backend/tests/test_utils/test_failure_tracker.py
+
+import threading
+
+import pytest
+
+from app.utils.failure_tracker import (
+    FailureTracker,
+    InMemoryFailureTracker,
+    SQLiteFailureTracker,
+    create_failure_tracker,
+)
+
+
+def test_failures_expire_after_window():
+    tracker = InMemoryFailureTracker(window_seconds=100, buckets=10)
+    for t in (0, 5, 55):
+        tracker.record("1.2.3.4", now=t)
+
+    assert tracker.count("1.2.3.4", now=60) == 3
+    # The buckets holding t=0 and t=5 have slid out of the window
+    assert tracker.count("1.2.3.4", now=105) == 1
+    assert tracker.record("1.2.3.4", now=200) == 1
+
+
+def test_memory_is_bounded_by_lru_eviction():
+    tracker = InMemoryFailureTracker(window_seconds=600, max_keys=100)
+    for i in range(1000):
+        tracker.record(f"10.0.{i // 256}.{i % 256}", now=1)
+
+    assert len(tracker) == 100
+    assert tracker.count("10.0.0.0", now=1) == 0
+    assert tracker.count("10.0.3.231", now=1) == 1
+
+
+def test_idle_keys_are_dropped():
+    tracker = InMemoryFailureTracker(window_seconds=10, buckets=10)
+    tracker.record("idle", now=0)
+    tracker.record("busy", now=50)
+    assert len(tracker) == 1
+
+
+def test_sqlite_backend_is_shared_between_trackers(tmp_path):
+    path = str(tmp_path / "failures.db")
+    first = SQLiteFailureTracker(path, window_seconds=100)
+    second = SQLiteFailureTracker(path, window_seconds=100)
+
+    first.record("1.2.3.4", now=10)
+    assert second.record("1.2.3.4", now=20) == 2
+    assert first.count("1.2.3.4", now=150) == 0
+
+
+async def test_sqlite_writes_run_off_the_event_loop(tmp_path):
+    tracker = SQLiteFailureTracker(str(tmp_path / "failures.db"), window_seconds=100)
+    threads = []
+    record = tracker._record
+
+    def spy(key, now=None):
+        threads.append(threading.current_thread())
+        return record(key, now)
+
+    tracker._record = spy
+    assert await tracker.record_async("1.2.3.4") == 1
+    assert await tracker.record_async("1.2.3.4") == 2
+    assert threading.main_thread() not in threads
+
+    indexes = tracker._conn.execute("PRAGMA index_list(failure_buckets)").fetchall()
+    assert "failure_buckets_bucket" in [row[1] for row in indexes]
+
+
+def test_sqlite_reads_and_resets_run_on_the_tracker_thread(tmp_path):
+    tracker = SQLiteFailureTracker(str(tmp_path / "failures.db"), window_seconds=100)
+    threads = []
+
+    for name in ("_record", "_count", "_reset"):
+        method = getattr(tracker, name)
+
+        def spy(*args, method=method):
+            threads.append(threading.current_thread())
+            return method(*args)
+
+        setattr(tracker, name, spy)
+
+    tracker.record("1.2.3.4", now=10)
+    assert tracker.count("1.2.3.4", now=20) == 1
+    tracker.reset("1.2.3.4")
+    assert tracker.count("1.2.3.4", now=20) == 0
+    assert len(threads) == 4
+    assert all(thread.name.startswith("failure-tracker") for thread in threads)
+
+
+async def test_memory_tracker_records_in_place():
+    tracker = InMemoryFailureTracker(window_seconds=100)
+    assert await tracker.record_async("1.2.3.4") == 1
+    assert tracker.count("1.2.3.4") == 1
+
+
+def test_tracker_interface_is_abstract():
+    with pytest.raises(TypeError):
+        FailureTracker(window_seconds=10)
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        create_failure_tracker("redis", 600)
@@ -0,0 +1,119 @@
+# backend/tests/test_utils/test_forwarded.py
+
+import time
+
+from app.utils.email_utils import parse_forwarded_body, parse_forwarded_metadata
+from app.utils.forwarded import parse_forwarded_chain
+
+NESTED = """FYI, see below.
+
+---------- Forwarded message ---------
+From: Bob <bob@example.com>
+Date: Tue, 7 Jan 2025 at 10:00
+Subject: Fwd: Budget
+To: Alice <alice@example.com>
+
+Looping you in.
+
+> -----Original Message-----
+> From: Carol <carol@example.com>
+> Sent: Monday, January 6, 2025 9:00 AM
+> Subject: Budget
+>
+> Numbers attached.
+"""
+
+
+def test_nested_forwards_become_a_chain():
+    chain = parse_forwarded_chain(NESTED)
+
+    assert chain.preamble == "FYI, see below."
+    bob, carol = chain.messages
+    assert (bob.sender, bob.subject, bob.date) == (
+        "Bob <bob@example.com>",
+        "Fwd: Budget",
+        "Tue, 7 Jan 2025 at 10:00",
+    )
+    assert bob.to == "Alice <alice@example.com>"
+    assert bob.body == "Looping you in."
+    assert (carol.sender, carol.subject) == ("Carol <carol@example.com>", "Budget")
+    assert carol.date == "Monday, January 6, 2025 9:00 AM"
+    assert carol.body == "> Numbers attached."
+    # The forwarded message keeps its own nested forward
+    assert chain.content.startswith("Looping you in.")
+    assert chain.content.endswith("> Numbers attached.")
+
+
+def test_headers_without_separator():
+    chain = parse_forwarded_chain(
+        "Some intro text\nFrom: Jane <jane@example.com>\nSubject: Hello\nBody text"
+    )
+    assert chain.preamble == "Some intro text"
+    assert (chain.sender, chain.subject) == ("Jane <jane@example.com>", "Hello")
+    assert chain.messages[0].body == "Body text"
+
+
+def test_quoted_from_in_a_reply_is_not_a_forward():
+    body = (
+        "Agreed, let's chase them.\n\n"
+        "On Mon, Dana wrote:\n"
+        "> Any news on the shipment?\n"
+        "> From: what I heard, they are late.\n"
+    )
+    chain = parse_forwarded_chain(body)
+    assert not chain.is_forward
+    assert chain.content == ""
+    assert parse_forwarded_metadata(body) == (None, None)
+
+    # With a header block it is a quoted forward
+    chain = parse_forwarded_chain(body + "> Subject: Shipment\n>\n> Late again.\n")
+    assert chain.sender == "what I heard, they are late."
+    assert chain.subject == "Shipment"
+
+
+def test_repeated_from_starts_a_new_hop():
+    chain = parse_forwarded_chain(
+        "From: First <first@example.com>\nSubject: First\n"
+        "From: Second <second@example.com>\nSubject: Second\n"
+    )
+    assert [m.sender for m in chain.messages] == [
+        "First <first@example.com>",
+        "Second <second@example.com>",
+    ]
+    assert chain.subject == "First"
+
+
+def test_malformed_and_plain_bodies():
+    assert parse_forwarded_metadata("From: \nSubject:  ") == (None, None)
+    assert parse_forwarded_metadata("No forwarded headers here.") == (None, None)
+    assert parse_forwarded_metadata("") == (None, None)
+
+    chain = parse_forwarded_chain(
+        "---------- Forwarded message ---------\n\nText without metadata\n"
+    )
+    assert chain.is_forward
+    assert chain.sender is None
+    assert chain.content == "Text without metadata"
+
+
+def test_forwarded_body_keeps_text_when_body_starts_with_headers():
+    body = "From: Jane <jane@example.com>\nSubject: Hi\n\nPlease review.\n\nThanks"
+    assert parse_forwarded_body(body) == "Please review.\n\nThanks"
+    assert parse_forwarded_body("  Just text\n") == "Just text"
+
+
+def test_parse_time_is_linear_in_body_size():
+    hop = "From: x@example.com\n-----\n" + "> quoted text line\n" * 20
+
+    def parse_seconds(hops: int) -> float:
+        body = hop * hops
+        start = time.perf_counter()
+        chain = parse_forwarded_chain(body)
+        elapsed = time.perf_counter() - start
+        assert len(chain.messages) == hops
+        return elapsed
+
+    small = min(parse_seconds(1_000) for _ in range(3))
+    large = min(parse_seconds(8_000) for _ in range(3))
+    # 8x the input; quadratic behaviour would be ~64x
+    assert large < small * 20
@@ -0,0 +1,66 @@
+# backend/tests/test_utils/test_html_text.py
+
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from app.utils.body_normalizer import normalize_body
+from app.utils.html_text import html_to_text, looks_like_html, message_text
+
+NEWSLETTER = """<!DOCTYPE html><html><head><title>Deals</title>
+<style>.a { color: red }</style></head><body>
+<table><tr><td><p>Hello&nbsp;<b>World</b>!</p></td></tr>
+<tr><td>Line   two<br>three</td></tr></table>
+<script>var x = "<p>hidden</p>";</script>
+<ul><li>one</li><li>two</li></ul><p>Terms &amp; conditions</p>
+<img src="https://example.com/pixel.gif" width="1" height="1">
+</body></html>"""
+
+
+def test_converts_markup_to_text():
+    assert html_to_text(NEWSLETTER) == (
+        "Hello World!\n\nLine two\nthree\n\none\ntwo\n\nTerms & conditions"
+    )
+    assert html_to_text("") == ""
+    assert html_to_text("plain <b>bold</b> text") == "plain bold text"
+
+
+def test_output_is_capped_and_parsing_stops():
+    html = "<p>" + "word " * 100_000 + "</p><script>never reached"
+    text = html_to_text(html, max_chars=1_000)
+    # The cut may fall on a space, which is stripped
+    assert 990 < len(text) <= 1_000
+    assert text.startswith("word word")
+
+
+def test_looks_like_html():
+    assert looks_like_html(NEWSLETTER)
+    assert looks_like_html("  <div>Hi</div>")
+    assert not looks_like_html("Use <b> for bold")
+    assert not looks_like_html("Plain text")
+    assert not looks_like_html(None)
+
+
+def test_message_text_prefers_plain_part():
+    msg = MIMEMultipart("alternative")
+    msg.attach(MIMEText("Plain version", "plain"))
+    msg.attach(MIMEText("<p>HTML version</p>", "html"))
+    assert message_text(msg) == "Plain version"
+
+
+def test_message_text_converts_html_only_message():
+    msg = MIMEMultipart("mixed")
+    msg.attach(MIMEText(NEWSLETTER, "html"))
+    attachment = MIMEText("attached notes", "plain")
+    attachment.add_header("Content-Disposition", "attachment", filename="a.txt")
+    msg.attach(attachment)
+    assert message_text(msg).startswith("Hello World!")
+
+    assert message_text(MIMEMultipart("mixed")) == ""
+
+
+def test_normalize_body_converts_html_first():
+    body = (
+        "<html><body><p>Approved.</p><p>-- </p><p>Dana</p>"
+        "<blockquote>On Mon, Bob wrote: old text</blockquote></body></html>"
+    )
+    assert normalize_body(body) == "Approved."
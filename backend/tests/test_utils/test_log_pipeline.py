@@ -0,0 +1,83 @@
+# backend/tests/test_utils/test_log_pipeline.py
+
+import json
+import logging
+import queue
+
+from app.utils.log_pipeline import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    log_records_dropped,
+    log_records_sampled_out,
+    parse_sample_rates,
+)
+
+
+def _record(msg="hello %s", args=("world",), level=logging.INFO, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    line = JsonFormatter().format(_record(event="webhook_access", ip="1.2.3.4"))
+    entry = json.loads(line)
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["event"] == "webhook_access"
+    assert entry["ip"] == "1.2.3.4"
+
+
+def test_sampling_keeps_failures_and_unlisted_events():
+    sampler = SamplingFilter({"webhook_access": 0.0})
+    before = log_records_sampled_out.value(event="webhook_access")
+
+    assert not sampler.filter(_record(event="webhook_access", status="success"))
+    assert sampler.filter(_record(event="webhook_access", status="failure"))
+    assert sampler.filter(_record(event="api_key_validation", status="success"))
+    assert sampler.filter(_record())
+    assert log_records_sampled_out.value(event="webhook_access") == before + 1
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    before = log_records_dropped.value()
+
+    handler.handle(_record())
+    handler.handle(_record())
+
+    assert handler.queue.qsize() == 1
+    assert log_records_dropped.value() == before + 1
+
+
+def test_messages_capture_args_when_logged():
+    state = {"status": "queued"}
+    handler = NonBlockingQueueHandler(queue.Queue())
+    handler.handle(_record(msg="job %s", args=(state,)))
+    state["status"] = "done"
+
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage() == "job {'status': 'queued'}"
+    assert queued.args is None
+
+
+def test_sampled_out_records_are_never_formatted():
+    class Expensive:
+        calls = 0
+
+        def __str__(self):
+            Expensive.calls += 1
+            return "expensive"
+
+    handler = NonBlockingQueueHandler(queue.Queue())
+    handler.addFilter(SamplingFilter({"webhook_access": 0.0}))
+    handler.handle(_record(args=(Expensive(),), event="webhook_access"))
+
+    assert Expensive.calls == 0
+    assert handler.queue.empty()
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("a=0.5, b=0.01,") == {"a": 0.5, "b": 0.01}
+    assert parse_sample_rates("") == {}
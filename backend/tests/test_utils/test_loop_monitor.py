@@ -0,0 +1,60 @@
+# backend/tests/test_utils/test_loop_monitor.py
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.loop_monitor import LoopLagMonitor, LoopStall, loop_lag, loop_monitor
+
+
+def blocking_call(seconds: float):
+    time.sleep(seconds)
+
+
+async def test_blocking_call_is_captured_with_its_stack():
+    monitor = LoopLagMonitor(interval_ms=10, threshold_ms=30)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        blocking_call(0.2)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    (stall,) = monitor.stalls()
+    assert any("in blocking_call" in frame for frame in stall.stack)
+    assert "test_blocking_call_is_captured" in stall.stack[-2]
+    # Updated to the full lag once the loop got to run again
+    assert stall.lag_ms >= 150
+
+
+async def test_idle_loop_records_lag_without_stalls():
+    before = loop_lag.summary()["count"]
+    monitor = LoopLagMonitor(interval_ms=5, threshold_ms=200)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert monitor.stalls() == []
+    assert loop_lag.summary()["count"] > before
+
+
+def test_stall_log_is_bounded():
+    monitor = LoopLagMonitor(max_stalls=2)
+    for lag in (1, 2, 3):
+        monitor._stalls.append(LoopStall(lag_ms=lag))
+    assert [s.lag_ms for s in monitor.stalls()] == [3, 2]
+
+
+def test_admin_loop_stalls_endpoint(monkeypatch):
+    monkeypatch.setattr("app.api.routers.admin.PROFILER_TOKEN", "admin-secret")
+    loop_monitor._stalls.append(LoopStall(lag_ms=120, stack=["app.py:1 in f"]))
+    client = TestClient(app)
+    assert client.get("/api/v1/admin/loop/stalls").status_code == 403
+    response = client.get(
+        "/api/v1/admin/loop/stalls", headers={"X-Admin-Token": "admin-secret"}
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["stack"] == ["app.py:1 in f"]
@@ -0,0 +1,103 @@
+# backend/tests/test_utils/test_memory_diagnostics.py
+
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.email_message import EmailMessageBase
+from app.utils.memory_diagnostics import MemoryDiagnostics, memory_diagnostics
+
+_retained = []
+
+
+def leak(n: int):
+    _retained.append([bytearray(1024) for _ in range(n)])
+
+
+@pytest.fixture(autouse=True)
+def stop_tracing():
+    yield
+    memory_diagnostics.stop()
+    _retained.clear()
+
+
+def test_diff_points_at_the_allocating_line():
+    diagnostics = MemoryDiagnostics()
+    with pytest.raises(RuntimeError):
+        diagnostics.take_snapshot()
+
+    diagnostics.start()
+    before = diagnostics.take_snapshot()
+    leak(500)
+    after = diagnostics.take_snapshot()
+    diff = diagnostics.diff(before.id, after.id, limit=5)
+    diagnostics.stop()
+
+    top = diff[0]
+    assert top.location.endswith("test_memory_diagnostics.py:16")
+    assert top.size_diff_bytes >= 500 * 1024
+    assert top.count_diff >= 500
+    assert diagnostics.diff(before.id, "missing") is None
+    assert not tracemalloc.is_tracing()
+    assert diagnostics.snapshots() == []
+
+
+def test_snapshots_are_bounded():
+    diagnostics = MemoryDiagnostics(max_snapshots=2)
+    diagnostics.start()
+    ids = [diagnostics.take_snapshot().id for _ in range(3)]
+    diagnostics.stop()
+    assert ids[0] not in {s.id for s in diagnostics.snapshots()}
+
+
+def test_object_counts_cover_app_models():
+    emails = [
+        EmailMessageBase(subject=f"s{i}", sender="a@example.com", body="b")
+        for i in range(25)
+    ]
+    counts = {c.type: c.count for c in MemoryDiagnostics().object_counts()}
+    assert counts["app.models.email_message.EmailMessageBase"] >= len(emails)
+
+
+def test_memory_endpoints_require_the_admin_token(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr("app.api.routers.admin.PROFILER_TOKEN", "")
+    assert client.get("/api/v1/admin/memory/tracemalloc").status_code == 403
+
+    monkeypatch.setattr("app.api.routers.admin.PROFILER_TOKEN", "admin-secret")
+    assert client.get("/api/v1/admin/memory/tracemalloc").status_code == 403
+    wrong = client.get(
+        "/api/v1/admin/memory/tracemalloc", headers={"X-Admin-Token": "nope"}
+    )
+    assert wrong.status_code == 403
+
+
+def test_admin_memory_endpoints(monkeypatch):
+    monkeypatch.setattr("app.api.routers.admin.PROFILER_TOKEN", "admin-secret")
+    client = TestClient(app, headers={"X-Admin-Token": "admin-secret"})
+    assert client.post("/api/v1/admin/memory/snapshots").status_code == 409
+
+    assert client.post("/api/v1/admin/memory/tracemalloc/start").json()["tracing"]
+    first = client.post("/api/v1/admin/memory/snapshots").json()["id"]
+    leak(200)
+    second = client.post("/api/v1/admin/memory/snapshots").json()["id"]
+    assert len(client.get("/api/v1/admin/memory/snapshots").json()) == 2
+
+    response = client.get(
+        "/api/v1/admin/memory/diff",
+        params={"from_id": first, "to_id": second, "group_by": "filename"},
+    )
+    assert response.status_code == 200
+    assert any(
+        d["location"].endswith("test_memory_diagnostics.py") for d in response.json()
+    )
+    missing = client.get(
+        "/api/v1/admin/memory/diff", params={"from_id": first, "to_id": "nope"}
+    )
+    assert missing.status_code == 404
+
+    stopped = client.post("/api/v1/admin/memory/tracemalloc/stop").json()
+    assert not stopped["tracing"]
+    assert client.get("/api/v1/admin/memory/objects").status_code == 200
@@ -0,0 +1,36 @@
+# backend/tests/test_utils/test_metrics.py
+
+from app.utils.metrics import MetricsRegistry, render_prometheus
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    stage = registry.histogram("stage_seconds", "Stage time", buckets=(0.1, 1.0))
+    stage.observe(0.05, stage="spam_check")
+    stage.observe(0.5, stage="spam_check")
+    stage.observe(3.0, stage="spam_check")
+
+    lines = render_prometheus(registry).splitlines()
+
+    assert "# TYPE stage_seconds histogram" in lines
+    assert 'stage_seconds_bucket{stage="spam_check",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="spam_check",le="1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="spam_check",le="+Inf"} 3' in lines
+    assert 'stage_seconds_count{stage="spam_check"} 3' in lines
+    assert 'stage_seconds_sum{stage="spam_check"} 3.55' in lines
+
+
+def test_counter_labels_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("fallbacks_total", "Fallbacks").inc(component='say "hi"')
+
+    assert 'fallbacks_total{component="say \\"hi\\""} 1' in render_prometheus(registry)
+
+
+def test_timer_observes_duration():
+    registry = MetricsRegistry()
+    stage = registry.histogram("t_seconds")
+    with stage.time(stage="insert"):
+        pass
+
+    assert stage.summary(stage="insert")["count"] == 1
@@ -0,0 +1,114 @@
+# backend/tests/test_utils/test_profiler.py
+
+import time
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import app as main_app
+from app.middleware import ProfilerMiddleware
+from app.utils.profiler import Profile, ProfileStore, SamplingProfiler, profile_store
+
+
+def _busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _profile(request_id: str) -> Profile:
+    return Profile(
+        request_id=request_id,
+        method="GET",
+        path="/",
+        trigger="header",
+        status_code=200,
+        started_at=datetime.now(timezone.utc),
+        duration_seconds=0.1,
+        samples=1,
+        interval_seconds=0.005,
+        collapsed="main (app/main.py:1) 1",
+    )
+
+
+def _app(**options):
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow():
+        _busy_wait(0.05)
+        return {"ok": True}
+
+    store = ProfileStore(max_profiles=10)
+    app.add_middleware(ProfilerMiddleware, store=store, **options)
+    return app, store
+
+
+def test_sampling_profiler_collects_collapsed_stacks():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    _busy_wait(0.05)
+    profiler.stop()
+
+    assert profiler.samples > 0
+    assert "_busy_wait (test_utils/test_profiler.py:" in profiler.collapsed()
+    # Stacks are root first, leaf last
+    first_line = profiler.collapsed().splitlines()[0]
+    assert first_line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_profile_store_is_bounded():
+    store = ProfileStore(max_profiles=2)
+    for request_id in ("a", "b", "c"):
+        store.add(_profile(request_id))
+    assert store.get("a") is None
+    assert [p.request_id for p in store.list()] == ["c", "b"]
+
+
+def test_middleware_profiles_only_authorized_requests():
+    app, store = _app(token="secret", sample_rate=0, interval_ms=1)
+    client = TestClient(app)
+
+    assert "x-profile-id" not in client.get("/slow").headers
+    assert (
+        "x-profile-id"
+        not in client.get("/slow", headers={"X-Profile": "wrong"}).headers
+    )
+    assert store.list() == []
+
+    response = client.get(
+        "/slow", headers={"X-Profile": "secret", "X-Request-ID": "req-1"}
+    )
+    assert response.status_code == 200
+    assert response.headers["x-profile-id"] == "req-1"
+    profile = store.get("req-1")
+    assert profile.trigger == "header"
+    assert profile.status_code == 200
+    assert profile.path == "/slow"
+    assert profile.samples > 0
+    assert "slow (test_utils/test_profiler.py:" in profile.collapsed
+
+
+def test_middleware_samples_requests():
+    app, store = _app(token="", sample_rate=1.0, interval_ms=1)
+    response = TestClient(app).get("/slow")
+    profile = store.get(response.headers["x-profile-id"])
+    assert profile.trigger == "sampled"
+
+
+def test_admin_profile_endpoints(monkeypatch):
+    monkeypatch.setattr("app.api.routers.admin.PROFILER_TOKEN", "admin-secret")
+    profile_store.add(_profile("admin-req"))
+    assert TestClient(main_app).get("/api/v1/admin/profiles").status_code == 403
+    client = TestClient(main_app, headers={"X-Admin-Token": "admin-secret"})
+
+    listing = client.get("/api/v1/admin/profiles")
+    assert listing.status_code == 200
+    assert listing.json()[0]["request_id"] == "admin-req"
+    assert "collapsed" not in listing.json()[0]
+
+    response = client.get("/api/v1/admin/profiles/admin-req")
+    assert response.status_code == 200
+    assert response.text == "main (app/main.py:1) 1"
+    assert client.get("/api/v1/admin/profiles/missing").status_code == 404
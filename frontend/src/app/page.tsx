@@ -159,9 +159,9 @@ function TaskList({ onLoadTasks }: { onLoadTasks: (loadTasksFn: () => Promise<vo
             contextCategory={contextCategory}
             categoryIcon={getCategoryIcon(contextCategory)}
             suggestedActions={ task.actions || []}
-            subject={task.email?.subject}
-            sender={task.email?.sender}
-            body={task.email?.body}
+            subject={task.subject ?? task.email?.subject}
+            sender={task.sender ?? task.email?.sender}
+            body={task.preview ?? task.email?.body}
             onAction={(action) => handleTaskAction(task.id, action)}
             readOnly={readOnly}
           />
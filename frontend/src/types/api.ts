@@ -22,6 +22,8 @@ export interface AssistantTask {
   actions: string[];
   status: string;
   action_taken: string | null;
+  email_id?: string;
+  preview?: string;
   email?: EmailMessage;
 }
 
@@ -38,6 +40,8 @@ export interface RawMongoTask {
   actions?: string[];
   status?: string;
   action_taken?: string | null;
+  email_id?: string;
+  preview?: string;
   email?: RawMongoEmail;
 }
 